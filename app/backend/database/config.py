@@ -41,3 +41,15 @@ BACKUP_CONFIG = {
     'backup_dir': 'data/backups',
     'compress_backups': True
 }
+
+# Colonnes ajoutées après la création initiale du schéma (ALTER TABLE sur les bases existantes)
+SCHEMA_UPGRADES = {
+    'planning': {
+        'schedule': 'TEXT',
+    },
+}
+
+# Contraintes obsolètes : la table est reconstruite si sa définition contient encore la clause
+SCHEMA_REBUILDS = {
+    'planning': 'UNIQUE(date, position_id, shift)',
+}
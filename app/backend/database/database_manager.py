@@ -7,13 +7,14 @@ import json
 import gzip
 import shutil
 import time
+import re
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Union, Tuple
 from contextlib import contextmanager
 import logging
 
 # Import de la configuration locale
-from .config import DATABASE_CONFIG, SQLITE_OPTIMIZATIONS, DB_TIMEOUTS, BACKUP_CONFIG
+from .config import DATABASE_CONFIG, SQLITE_OPTIMIZATIONS, DB_TIMEOUTS, BACKUP_CONFIG, SCHEMA_UPGRADES, SCHEMA_REBUILDS
 
 logger = logging.getLogger(__name__)
 
@@ -96,6 +97,8 @@ class DatabaseManager:
                 
                 # Exécuter le schéma
                 conn.executescript(schema_sql)
+                self._upgrade_schema(conn)
+                self._rebuild_tables(conn, schema_sql)
                 conn.commit()
                 logger.info("✅ Schéma de la base de données créé avec succès")
             else:
@@ -105,6 +108,58 @@ class DatabaseManager:
             logger.error(f"❌ Erreur lors de la création du schéma: {e}")
             raise
     
+    def _upgrade_schema(self, conn):
+        """Ajouter les colonnes manquantes aux tables créées par une version antérieure"""
+        for table_name, columns in SCHEMA_UPGRADES.items():
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")}
+            for column, definition in columns.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {column} {definition}")
+                    logger.info(f"✅ Colonne {table_name}.{column} ajoutée")
+
+    def _rebuild_tables(self, conn, schema_sql: str):
+        """Reconstruire les tables dont une contrainte a changé en conservant leurs données
+
+        La nouvelle table est créée, remplie puis substituée à l'ancienne dans une
+        seule transaction : un échec laisse la table d'origine intacte. Les lignes
+        contraires aux nouvelles contraintes sont écartées et comptées.
+        """
+        for table_name, outdated_clause in SCHEMA_REBUILDS.items():
+            row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                               (table_name,)).fetchone()
+            if not row or outdated_clause not in row[0]:
+                continue
+
+            definition = re.search(rf"CREATE TABLE IF NOT EXISTS {table_name} \((.*?)\n\);", schema_sql, re.DOTALL)
+            if not definition:
+                logger.error(f"❌ Définition de la table {table_name} introuvable dans schema.sql")
+                continue
+            new_table = f"{table_name}_new"
+            columns = ", ".join(r[1] for r in conn.execute(f"PRAGMA table_info({table_name})"))
+            conn.commit()
+            # Les vues gardent leur référence par nom pendant le renommage
+            conn.execute("PRAGMA legacy_alter_table = ON")
+            try:
+                conn.execute("BEGIN")
+                conn.execute(f"DROP TABLE IF EXISTS {new_table}")
+                conn.execute(f"CREATE TABLE {new_table} ({definition.group(1)}\n)")
+                conn.execute(f"INSERT OR IGNORE INTO {new_table} ({columns}) SELECT {columns} FROM {table_name}")
+                kept = conn.execute(f"SELECT COUNT(*) FROM {new_table}").fetchone()[0]
+                total = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+                conn.execute(f"DROP TABLE {table_name}")
+                conn.execute(f"ALTER TABLE {new_table} RENAME TO {table_name}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.execute("PRAGMA legacy_alter_table = OFF")
+            conn.executescript(schema_sql)  # recrée les index et déclencheurs supprimés avec l'ancienne table
+            if total > kept:
+                logger.warning(f"⚠️ Table {table_name} : {total - kept} ligne(s) écartée(s), "
+                               f"contraires aux nouvelles contraintes")
+            logger.info(f"✅ Table {table_name} reconstruite ({outdated_clause} retirée, {kept} lignes conservées)")
+    
     def _create_initial_data(self, conn):
         """Créer les données initiales de la base de données"""
         try:
@@ -92,11 +92,12 @@ CREATE TABLE IF NOT EXISTS planning (
     position_id TEXT REFERENCES positions(id) ON DELETE CASCADE,
     user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
     shift TEXT NOT NULL CHECK (shift IN ('morning', 'afternoon', 'evening')),
+    schedule TEXT, -- Horaire de l'agent ce jour-là (ex: '8h00-16h00')
     status TEXT DEFAULT 'planned' CHECK (status IN ('planned', 'confirmed', 'completed', 'cancelled')),
     notes TEXT,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE(date, position_id, shift)
+    UNIQUE(date, user_id, shift) -- Un poste peut accueillir plusieurs agents (max_agents)
 );
 
 -- =====================================================
@@ -190,6 +191,58 @@ CREATE TABLE IF NOT EXISTS schema_migrations (
     execution_time_ms INTEGER
 );
 
+-- =====================================================
+-- TABLE: planning_solution_cache - Solutions hebdomadaires mémorisées du moteur de planification
+-- =====================================================
+CREATE TABLE IF NOT EXISTS planning_solution_cache (
+    key TEXT PRIMARY KEY, -- méthode, version et empreinte canonique des données de la semaine
+    shape TEXT NOT NULL, -- dimensions de la grille des postes (agents,jours,créneaux)
+    grid BLOB NOT NULL, -- grille des postes de la semaine (int16)
+    optimal BOOLEAN DEFAULT 0,
+    last_used REAL NOT NULL, -- horodatage de dernière utilisation (éviction LRU)
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- =====================================================
+-- TABLE: skills - Catalogue des compétences et certifications
+-- =====================================================
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL, -- "Molecular biology", "Front-end processing", etc.
+    description TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- =====================================================
+-- TABLE: user_skills - Compétences détenues par les utilisateurs
+-- =====================================================
+CREATE TABLE IF NOT EXISTS user_skills (
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    skill_id INTEGER REFERENCES skills(id) ON DELETE CASCADE,
+    certified_at DATE,
+    PRIMARY KEY (user_id, skill_id)
+);
+
+-- =====================================================
+-- TABLE: position_skills - Compétences requises par les postes (une seule suffit)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS position_skills (
+    position_id TEXT REFERENCES positions(id) ON DELETE CASCADE,
+    skill_id INTEGER REFERENCES skills(id) ON DELETE CASCADE,
+    PRIMARY KEY (position_id, skill_id)
+);
+
+-- =====================================================
+-- TABLE: fairness_ledger - Journées cumulées par agent et par poste, horaire et jour de la semaine
+-- =====================================================
+CREATE TABLE IF NOT EXISTS fairness_ledger (
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL CHECK (kind IN ('position', 'schedule', 'weekday')),
+    item TEXT NOT NULL, -- code du poste, libellé de l'horaire ou jour de la semaine (0 = lundi)
+    days INTEGER NOT NULL DEFAULT 0, -- journées non annulées de la table planning
+    PRIMARY KEY (user_id, kind, item)
+);
+
 -- =====================================================
 -- INDEXES pour les performances
 -- =====================================================
@@ -208,6 +261,13 @@ CREATE INDEX IF NOT EXISTS idx_absences_user ON absences(user_id);
 CREATE INDEX IF NOT EXISTS idx_planning_position ON planning(position_id);
 CREATE INDEX IF NOT EXISTS idx_positions_secteur ON positions(secteur);
 
+-- Index sur les compétences (recherche des détenteurs d'une compétence)
+CREATE INDEX IF NOT EXISTS idx_user_skills_skill ON user_skills(skill_id);
+CREATE INDEX IF NOT EXISTS idx_position_skills_skill ON position_skills(skill_id);
+
+-- Index sur le cache des solutions (éviction des moins récemment utilisées)
+CREATE INDEX IF NOT EXISTS idx_solution_cache_last_used ON planning_solution_cache(last_used);
+
 -- Index sur les audits
 CREATE INDEX IF NOT EXISTS idx_audit_logs_timestamp ON audit_logs(timestamp);
 CREATE INDEX IF NOT EXISTS idx_audit_logs_user ON audit_logs(user_id);
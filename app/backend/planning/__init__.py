@@ -0,0 +1,84 @@
+# app/backend/planning/__init__.py
+# Moteur de planification automatique, utilisable hors Streamlit
+
+from .availability import AbsenceIndex, attach_hours, match_agent
+from .cache import CachedSolver, SolutionCache
+from .demand import DemandCalendar
+from .engine import PlanningEngine
+from .evaluation import PlanEvaluator
+from .feasibility import CoverageReport, check_coverage
+from .halfday import HalfDaySolver
+from .holidays import holiday_mask, is_holiday
+from .hours import assign_schedules, schedule_minutes
+from .ledger import FairnessLedger
+from .local_search import LocalSearch
+from .oncall import oncall_days, oncall_rotation
+from .partition import WeekPartitionSolver, reconcile_fairness
+from .portfolio import PortfolioSolver
+from .preferences import PreferenceTensor
+from .problem import PlanningProblem, shift_objective
+from .repair import repair_plan
+from .roster import RosterPattern
+from .sectors import SectorCache, SectorSolver, sector_components
+from .skills import SkillCatalog, agent_skills
+from .solvers import SOLVERS, PlanningSolver, SolverResult
+from .store import AssignmentStore, date_range, position_code
+from .templates import ShiftCatalog
+from .warm_start import WarmStartSolver, initial_plan, project_reference
+from .repository import (attach_sectors, attach_skills, load_oncall, load_reference, load_schedule_counts,
+                         load_store, resolve_user_ids, save_oncall, save_result, save_skills)
+
+__all__ = [
+    'PlanningEngine',
+    'PlanEvaluator',
+    'DemandCalendar',
+    'AbsenceIndex',
+    'match_agent',
+    'attach_hours',
+    'assign_schedules',
+    'schedule_minutes',
+    'PreferenceTensor',
+    'FairnessLedger',
+    'RosterPattern',
+    'ShiftCatalog',
+    'oncall_days',
+    'oncall_rotation',
+    'holiday_mask',
+    'is_holiday',
+    'CoverageReport',
+    'check_coverage',
+    'LocalSearch',
+    'PortfolioSolver',
+    'WeekPartitionSolver',
+    'SectorSolver',
+    'HalfDaySolver',
+    'shift_objective',
+    'SectorCache',
+    'sector_components',
+    'SkillCatalog',
+    'agent_skills',
+    'reconcile_fairness',
+    'repair_plan',
+    'WarmStartSolver',
+    'initial_plan',
+    'project_reference',
+    'PlanningProblem',
+    'PlanningSolver',
+    'SolverResult',
+    'SOLVERS',
+    'SolutionCache',
+    'CachedSolver',
+    'AssignmentStore',
+    'date_range',
+    'position_code',
+    'attach_sectors',
+    'attach_skills',
+    'load_oncall',
+    'load_reference',
+    'load_schedule_counts',
+    'load_store',
+    'resolve_user_ids',
+    'save_oncall',
+    'save_result',
+    'save_skills'
+]
@@ -0,0 +1,270 @@
+# app/backend/planning/__main__.py
+# Ligne de commande : python -m app.backend.planning generate --from 2025-01-01 --to 2025-03-31
+
+import argparse
+import logging
+import multiprocessing
+import sys
+import time
+from datetime import date, timedelta
+
+from .availability import AbsenceIndex, attach_hours
+from .cache import SolutionCache
+from .config import ASSIGNMENT_METHODS, DEFAULT_TIME_BUDGET, ONCALL_SCHEDULE
+from .demand import DemandCalendar
+from .engine import PlanningEngine
+from .ledger import FairnessLedger
+from .preferences import PreferenceTensor
+from .roster import RosterPattern
+from .store import position_code
+
+
+def _parse_date(value: str) -> date:
+    """Lire une date au format AAAA-MM-JJ"""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Date invalide : {value} (format attendu AAAA-MM-JJ)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construire l'analyseur d'arguments"""
+    parser = argparse.ArgumentParser(prog="python -m app.backend.planning",
+                                     description="Génération du planning micPlan sans interface")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate = subparsers.add_parser("generate", help="Générer et enregistrer le planning d'une période")
+    generate.add_argument("--from", dest="start_date", type=_parse_date, required=True,
+                          help="Date de début (AAAA-MM-JJ)")
+    generate.add_argument("--to", dest="end_date", type=_parse_date, required=True,
+                          help="Date de fin incluse (AAAA-MM-JJ)")
+    generate.add_argument("--technicians", nargs="+", default=None,
+                          help="Techniciens à planifier (par défaut : toute l'équipe)")
+    generate.add_argument("--method", choices=ASSIGNMENT_METHODS, default=ASSIGNMENT_METHODS[0],
+                          help="Méthode d'affectation (défaut : hungarian ; exact = optimum de la période)")
+    generate.add_argument("--time-budget", type=float, default=DEFAULT_TIME_BUDGET,
+                          help=f"Temps maximal du solveur en secondes (défaut : {DEFAULT_TIME_BUDGET:g})")
+    generate.add_argument("--improve", dest="improve_budget", type=float, default=None,
+                          help="Durée de la recherche locale après la méthode choisie (secondes)")
+    generate.add_argument("--iterations", dest="improve_iterations", type=int, default=None,
+                          help="Nombre d'itérations de la recherche locale (reproductible avec --seed)")
+    generate.add_argument("--seed", type=int, default=0,
+                          help="Graine de la recherche locale (défaut : 0)")
+    generate.add_argument("--cache", action="store_true",
+                          help="Reprendre les semaines déjà résolues (table planning_solution_cache)")
+    generate.add_argument("--stable", action="store_true",
+                          help="Partir de la semaine précédente (table planning) et limiter les changements")
+    generate.add_argument("--sectors", action="store_true",
+                          help="Limiter chaque agent aux postes de son secteur (tables users et positions)")
+    generate.add_argument("--skills", action="store_true",
+                          help="Compléter les compétences par les tables user_skills et position_skills")
+    generate.add_argument("--calendar", action="store_true",
+                          help="Ouvrir les postes selon leurs fréquences (table position_frequency_config)")
+    generate.add_argument("--absences", action="store_true",
+                          help="Exclure les congés et absences approuvés (data/user_availability.json)")
+    generate.add_argument("--preferences", action="store_true",
+                          help="Favoriser les jours et créneaux préférés (availability_preferences, Mes disponibilités)")
+    generate.add_argument("--hours", action="store_true",
+                          help="Appliquer les limites d'heures des utilisateurs (data/users_database.json)")
+    generate.add_argument("--fairness", action="store_true",
+                          help="Faire tourner les postes selon le registre d'équité (table fairness_ledger)")
+    generate.add_argument("--holidays", action="store_true",
+                          help="Fermer les postes les jours fériés")
+    generate.add_argument("--pattern-from", type=_parse_date, default=None,
+                          help="Dérouler le roulement des semaines commençant à cette date (table planning)")
+    generate.add_argument("--pattern-weeks", type=int, default=1,
+                          help="Longueur du roulement en semaines (défaut : 1)")
+    generate.add_argument("--dry-run", action="store_true",
+                          help="Afficher le résultat sans écrire dans la table planning")
+
+    check = subparsers.add_parser("check", help="Lister les places obligatoires impossibles à couvrir")
+    check.add_argument("--from", dest="start_date", type=_parse_date, required=True,
+                       help="Date de début (AAAA-MM-JJ)")
+    check.add_argument("--to", dest="end_date", type=_parse_date, required=True,
+                       help="Date de fin incluse (AAAA-MM-JJ)")
+    check.add_argument("--technicians", nargs="+", default=None,
+                       help="Techniciens à planifier (par défaut : toute l'équipe)")
+    check.add_argument("--calendar", action="store_true",
+                       help="Ouvrir les postes selon leurs fréquences (table position_frequency_config)")
+    check.add_argument("--absences", action="store_true",
+                       help="Exclure les congés et absences approuvés (data/user_availability.json)")
+    check.add_argument("--holidays", action="store_true",
+                       help="Fermer les postes les jours fériés")
+
+    oncall = subparsers.add_parser("oncall", help="Générer et enregistrer les astreintes de week-end et jours fériés")
+    oncall.add_argument("--from", dest="start_date", type=_parse_date, required=True,
+                        help="Date de début (AAAA-MM-JJ)")
+    oncall.add_argument("--to", dest="end_date", type=_parse_date, required=True,
+                        help="Date de fin incluse (AAAA-MM-JJ)")
+    oncall.add_argument("--technicians", nargs="+", default=None,
+                        help="Techniciens de la rotation (par défaut : toute l'équipe)")
+    oncall.add_argument("--absences", action="store_true",
+                        help="Exclure les congés et absences approuvés (data/user_availability.json)")
+    oncall.add_argument("--holidays", action="store_true",
+                        help="Couvrir aussi les jours fériés")
+    oncall.add_argument("--dry-run", action="store_true",
+                        help="Afficher les astreintes sans écrire dans la table planning")
+
+    ledger = subparsers.add_parser("ledger", help="Afficher le registre d'équité (journées par agent et par poste)")
+    ledger.add_argument("--rebuild", action="store_true",
+                        help="Recalculer le registre depuis toute la table planning avant affichage")
+    ledger.add_argument("--technicians", nargs="+", default=None,
+                        help="Techniciens à afficher (par défaut : toute l'équipe)")
+    return parser
+
+
+def cmd_check(args) -> int:
+    """Afficher les places obligatoires non couvrables (code 1 si la période est infaisable)"""
+    if args.start_date > args.end_date:
+        print("❌ La date de début doit être antérieure à la date de fin")
+        return 2
+
+    engine = PlanningEngine(demand_calendar=DemandCalendar() if args.calendar else None,
+                            absences=AbsenceIndex.load() if args.absences else None,
+                            holidays=args.holidays)
+    report = engine.check_coverage(args.start_date, args.end_date, args.technicians)
+    if report.feasible:
+        print("✅ Toutes les places obligatoires peuvent être couvertes")
+        return 0
+    for day, position, missing, reason in report.shortfalls():
+        print(f"{day.isoformat()}  {position:<28} {missing} place(s) : {reason}")
+    print(f"⚠️ {int(report.missing.sum())} place(s) obligatoire(s) non couvrable(s)")
+    return 1
+
+
+def cmd_generate(args) -> int:
+    """Générer le planning et l'écrire dans la table planning"""
+    if args.start_date > args.end_date:
+        print("❌ La date de début doit être antérieure à la date de fin")
+        return 2
+
+    calendar = DemandCalendar() if args.calendar else None
+    absences = AbsenceIndex.load() if args.absences else None
+    preferences = PreferenceTensor() if args.preferences else None
+    ledger = FairnessLedger() if args.fairness else None
+    engine = PlanningEngine(demand_calendar=calendar, absences=absences, preferences=preferences, ledger=ledger,
+                            holidays=args.holidays)
+    if args.sectors or args.skills or args.hours:
+        from .repository import attach_sectors, attach_skills
+        agents, position_rules = engine.agents, engine.position_rules
+        if args.hours:
+            agents = attach_hours(agents)
+        if args.sectors:
+            agents, position_rules = attach_sectors(agents, position_rules)
+        if args.skills:
+            agents, position_rules = attach_skills(agents, position_rules)
+        engine = PlanningEngine(agents, position_rules, engine.positions, engine.schedules, calendar, absences,
+                                preferences, ledger, args.holidays)
+    reference = None
+    if args.stable:
+        from .repository import load_reference
+        reference = load_reference(engine.resolve_technicians(args.technicians), args.start_date,
+                                   positions=engine.positions, schedules=engine.schedules)
+    started = time.perf_counter()
+    if args.pattern_from:
+        from .repository import load_store
+        monday = args.pattern_from - timedelta(days=args.pattern_from.weekday())
+        cycle = load_store(engine.resolve_technicians(args.technicians), monday,
+                           monday + timedelta(days=7 * args.pattern_weeks - 1),
+                           positions=engine.positions, schedules=engine.schedules)
+        pattern = RosterPattern.from_store(cycle, args.pattern_from, args.pattern_weeks)
+        solution = engine.expand_roster(pattern, args.start_date, args.end_date, args.technicians)
+    else:
+        solution = engine.solve(args.start_date, args.end_date, args.technicians, args.method, args.time_budget,
+                                improve_budget=args.improve_budget, improve_iterations=args.improve_iterations,
+                                seed=args.seed, cache=SolutionCache() if args.cache else None,
+                                reference=reference)
+    elapsed = time.perf_counter() - started
+    result = solution.store
+    print(f"✅ {len(result)} affectations générées en {elapsed:.3f}s")
+    print(f"📊 {solution.summary()}")
+    metrics = engine.evaluate(result)
+    print(f"📏 {metrics['uncovered']} place(s) manquante(s), {metrics['cap_violations']} dépassement(s) "
+          f"hebdomadaire(s), {metrics['preference_rate']:.0%} de journées sur un poste préféré, "
+          f"variance de charge {metrics['load_variance']:.2f}")
+
+    if args.dry_run:
+        for agent, day, position in result.items():
+            print(f"{day.isoformat()}  {agent:<12} {position}")
+        return 0
+
+    from .repository import save_result
+    try:
+        rows, skipped = save_result(result)
+    except Exception as e:
+        print(f"❌ Erreur lors de l'enregistrement du planning: {e}")
+        return 1
+    print(f"💾 {rows} lignes écrites dans la table planning")
+    if skipped:
+        print(f"⚠️ {skipped} affectation(s) non écrite(s) : créneau déjà confirmé ou d'astreinte")
+    return 0
+
+
+def cmd_oncall(args) -> int:
+    """Générer les astreintes et les écrire dans la table planning"""
+    if args.start_date > args.end_date:
+        print("❌ La date de début doit être antérieure à la date de fin")
+        return 2
+
+    engine = PlanningEngine(absences=AbsenceIndex.load() if args.absences else None, holidays=args.holidays)
+    technicians = engine.resolve_technicians(args.technicians)
+    history = None
+    if not args.dry_run:
+        from .repository import load_schedule_counts
+        history = load_schedule_counts(technicians, [ONCALL_SCHEDULE], args.start_date)[:, 0]
+    started = time.perf_counter()
+    assignments = engine.rotate_oncall(args.start_date, args.end_date, technicians, history)
+    print(f"✅ {len(assignments)} journées d'astreinte générées en {time.perf_counter() - started:.3f}s")
+    for technician in technicians:
+        days = sum(agent == technician for agent in assignments.values())
+        print(f"📟 {technician:<12} {days} journée(s)")
+
+    if args.dry_run:
+        for day, technician in assignments.items():
+            print(f"{day.isoformat()}  {technician}")
+        return 0
+
+    from .repository import save_oncall
+    try:
+        rows = save_oncall(assignments, args.start_date, args.end_date)
+    except Exception as e:
+        print(f"❌ Erreur lors de l'enregistrement des astreintes: {e}")
+        return 1
+    print(f"💾 {rows} lignes écrites dans la table planning")
+    return 0
+
+
+def cmd_ledger(args) -> int:
+    """Afficher les journées cumulées par agent et par poste"""
+    ledger = FairnessLedger()
+    if args.rebuild:
+        ledger.rebuild()
+    engine = PlanningEngine()
+    technicians = engine.resolve_technicians(args.technicians)
+    counts = ledger.positions(technicians, engine.positions)
+    codes = [position_code(position) for position in engine.positions]
+    print(f"{'':<12}" + "".join(f"{code:>5}" for code in codes))
+    for technician, row in zip(technicians, counts):
+        print(f"{technician:<12}" + "".join(f"{int(days):>5}" for days in row))
+    return 0
+
+
+def main(argv=None) -> int:
+    """Point d'entrée de la ligne de commande"""
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    args = build_parser().parse_args(argv)
+    if args.command == "generate":
+        return cmd_generate(args)
+    if args.command == "check":
+        return cmd_check(args)
+    if args.command == "oncall":
+        return cmd_oncall(args)
+    if args.command == "ledger":
+        return cmd_ledger(args)
+    return 1
+
+
+if __name__ == "__main__":
+    # Exécutable figé : les processus des pools parallèles démarrent par ce point d'entrée
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,153 @@
+# app/backend/planning/availability.py
+# Index d'intervalles des congés et absences approuvés, converti en masque d'indisponibilité
+
+import json
+import logging
+import os
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .config import ABSENCE_PERIODS, APPROVED_STATUS, AVAILABILITY_FILE, SHIFTS, USERS_FILE
+
+logger = logging.getLogger(__name__)
+
+# Règles horaires de la configuration des disponibilités reprises comme règles d'agent
+_HOUR_RULES = ("work_hours", "break_time", "max_hours_per_day", "max_hours_per_week")
+
+
+def _load_json(path: str) -> Dict:
+    """Lire un fichier JSON de données ({} s'il n'existe pas ou est illisible)"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ Lecture impossible de {path} : {e}")
+        return {}
+
+
+def user_names(username: str, users: Dict[str, Dict]) -> List[str]:
+    """Noms sous lesquels un utilisateur peut figurer dans le planning (identifiant, prénom)"""
+    names = [username.casefold()]
+    full_name = users.get(username, {}).get("full_name")
+    if full_name:
+        names.append(full_name.split()[0].casefold())
+    return names
+
+
+def match_agent(username: str, agents: Iterable[str], users: Dict[str, Dict]) -> Optional[str]:
+    """Agent du planning correspondant à un utilisateur (None si aucun)"""
+    names = user_names(username, users)
+    return next((agent for agent in agents if agent.casefold() in names), None)
+
+
+def attach_hours(agents: Dict[str, Dict], users_path: str = USERS_FILE) -> Dict[str, Dict]:
+    """Compléter les agents avec les limites d'heures configurées pour leur utilisateur
+
+    Retourne une copie ; une règle déjà renseignée pour l'agent est conservée.
+    """
+    users = _load_json(users_path)
+    agents = {agent: dict(info) for agent, info in agents.items()}
+    for username, user in users.items():
+        config = user.get("availability")
+        agent = match_agent(username, agents, users) if config else None
+        if agent is not None:
+            for rule in _HOUR_RULES:
+                if rule in config:
+                    agents[agent].setdefault(rule, config[rule])
+    return agents
+
+
+class AbsenceIndex:
+    """Congés et absences approuvés, indexés par intervalle de dates
+
+    Chaque intervalle (utilisateur, premier jour, dernier jour, créneaux) est trié
+    par date de début ; le maximum cumulé des dates de fin permet de trouver par
+    recherche dichotomique les seuls intervalles qui chevauchent une période. Le
+    masque agents × jours × créneaux s'obtient ensuite en un passage vectorisé
+    (différences cumulées).
+    """
+
+    def __init__(self, interval_users: List[str], starts: np.ndarray, ends: np.ndarray, shifts: np.ndarray,
+                 user_aliases: Optional[Dict[str, List[str]]] = None):
+        order = np.argsort(starts, kind="stable")
+        self.users = list(dict.fromkeys(interval_users))
+        codes = {user: u for u, user in enumerate(self.users)}
+        self.user_codes = np.array([codes[user] for user in interval_users], dtype=np.intp)[order]
+        self.starts = np.asarray(starts, dtype=np.int64)[order]
+        self.ends = np.asarray(ends, dtype=np.int64)[order]
+        self.shifts = np.asarray(shifts, dtype=bool).reshape(-1, len(SHIFTS))[order]
+        self._max_ends = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+        self.user_aliases = user_aliases or {}
+
+    @classmethod
+    def from_requests(cls, availability: Dict[str, Dict], users: Optional[Dict[str, Dict]] = None) -> "AbsenceIndex":
+        """Construire l'index depuis les données de user_availability.json (demandes approuvées)"""
+        users = users or {}
+        names, starts, ends, shifts = [], [], [], []
+        for username, data in availability.items():
+            for request in data.get("leave_requests", []):
+                if request.get("status") == APPROVED_STATUS:
+                    names.append(username)
+                    starts.append(date.fromisoformat(request["start_date"]).toordinal())
+                    ends.append(date.fromisoformat(request["end_date"]).toordinal())
+                    shifts.append([True] * len(SHIFTS))
+            for absence in data.get("absences", []):
+                if absence.get("status") == APPROVED_STATUS:
+                    periods = ABSENCE_PERIODS.get(absence.get("duration_period"), SHIFTS)
+                    day = date.fromisoformat(absence["date"]).toordinal()
+                    names.append(username)
+                    starts.append(day)
+                    ends.append(day)
+                    shifts.append([shift in periods for shift in SHIFTS])
+        aliases = {username: user_names(username, users) for username in availability}
+        return cls(names, np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64),
+                   np.array(shifts, dtype=bool), aliases)
+
+    @classmethod
+    def load(cls, path: str = AVAILABILITY_FILE, users_path: str = USERS_FILE) -> "AbsenceIndex":
+        """Lire les demandes approuvées du fichier des disponibilités"""
+        index = cls.from_requests(_load_json(path), _load_json(users_path))
+        logger.info(f"🏖️ {len(index)} congé(s) ou absence(s) approuvé(s) indexé(s)")
+        return index
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _agent_rows(self, agents: List[str]) -> np.ndarray:
+        """Ligne de chaque utilisateur indexé dans la liste d'agents (-1 = absent du planning)"""
+        rows = {agent.casefold(): a for a, agent in enumerate(agents)}
+        lookup = np.full(len(self.users), -1, dtype=np.intp)
+        for u, user in enumerate(self.users):
+            names = self.user_aliases.get(user, [user.casefold()])
+            lookup[u] = next((rows[name] for name in names if name in rows), -1)
+        return lookup
+
+    def mask(self, agents: List[str], start_date: date, end_date: date) -> np.ndarray:
+        """Créneaux d'absence approuvée (agents × jours × créneaux, booléens) sur une période"""
+        first, last = start_date.toordinal(), end_date.toordinal()
+        n_days = last - first + 1
+        mask = np.zeros((len(agents), n_days, len(SHIFTS)), dtype=bool)
+        if not len(self):
+            return mask
+
+        # Intervalles candidats : début <= dernier jour et fin cumulée >= premier jour
+        lo = int(np.searchsorted(self._max_ends, first, side="left"))
+        hi = int(np.searchsorted(self.starts, last, side="right"))
+        candidates = lo + np.flatnonzero(self.ends[lo:hi] >= first)
+        rows = self._agent_rows(agents)[self.user_codes[candidates]]
+        candidates, rows = candidates[rows >= 0], rows[rows >= 0]
+        if not len(candidates):
+            return mask
+
+        # Différences cumulées : +1 au premier jour couvert, -1 au lendemain du dernier
+        interval, shift = np.nonzero(self.shifts[candidates])
+        begin = np.maximum(self.starts[candidates], first) - first
+        stop = np.minimum(self.ends[candidates], last) - first + 1
+        steps = np.zeros((len(agents), n_days + 1, len(SHIFTS)), dtype=np.int32)
+        np.add.at(steps, (rows[interval], begin[interval], shift), 1)
+        np.add.at(steps, (rows[interval], stop[interval], shift), -1)
+        return np.cumsum(steps, axis=1)[:, :n_days] > 0
@@ -0,0 +1,130 @@
+# app/backend/planning/cache.py
+# Cache SQLite des solutions hebdomadaires, indexé par l'empreinte canonique de chaque semaine
+
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .config import SOLUTION_CACHE_SIZE, SOLUTION_CACHE_VERSION
+from .problem import PlanningProblem
+from .repository import _get_db
+from .solvers import PlanningSolver, SolverResult, relaxed_bound
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal de clés par requête (limite des paramètres SQLite)
+_QUERY_CHUNK = 500
+
+
+class SolutionCache:
+    """Solutions hebdomadaires dans la table planning_solution_cache, éviction LRU
+
+    La clé d'une semaine combine la méthode, ``SOLUTION_CACHE_VERSION`` et
+    l'empreinte des données de la semaine (agents, scores, disponibilités,
+    limites, demande, bonus, jours de la semaine) : une semaine identique,
+    même décalée dans le calendrier, retrouve la même solution.
+    """
+
+    def __init__(self, db=None, max_entries: int = SOLUTION_CACHE_SIZE):
+        self.db = db
+        self.max_entries = max_entries
+
+    @staticmethod
+    def key(problem: PlanningProblem, days: np.ndarray, method: str) -> str:
+        """Clé canonique d'une semaine pour une méthode"""
+        return f"{method}:v{SOLUTION_CACHE_VERSION}:{problem.fingerprint(days)}"
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[np.ndarray, bool]]:
+        """Solutions connues parmi les clés : {clé: (grille des postes, optimal)}"""
+        db = _get_db(self.db)
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        for i in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[i:i + _QUERY_CHUNK]
+            rows = db.execute_query(
+                f"SELECT key, shape, grid, optimal FROM planning_solution_cache "
+                f"WHERE key IN ({', '.join('?' * len(chunk))})", tuple(chunk))
+            for row in rows:
+                shape = tuple(int(n) for n in row["shape"].split(","))
+                found[row["key"]] = (np.frombuffer(row["grid"], dtype=np.int16).reshape(shape), bool(row["optimal"]))
+        if found:
+            now = time.time()
+            db.execute_transaction([("UPDATE planning_solution_cache SET last_used = ? WHERE key = ?", (now, key))
+                                    for key in found])
+        return found
+
+    def put_many(self, entries: Dict[str, Tuple[np.ndarray, bool]]):
+        """Enregistrer des solutions puis évincer les moins récemment utilisées"""
+        if not entries:
+            return
+        now = time.time()
+        queries = [(
+            "INSERT OR REPLACE INTO planning_solution_cache (key, shape, grid, optimal, last_used) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, ",".join(str(n) for n in grid.shape), grid.astype(np.int16).tobytes(), int(optimal), now)
+        ) for key, (grid, optimal) in entries.items()]
+        queries.append((
+            "DELETE FROM planning_solution_cache WHERE key NOT IN "
+            "(SELECT key FROM planning_solution_cache ORDER BY last_used DESC LIMIT ?)",
+            (self.max_entries,)
+        ))
+        if not _get_db(self.db).execute_transaction(queries):
+            logger.warning("⚠️ Échec de l'écriture du cache des solutions")
+
+    def clear(self):
+        """Vider le cache"""
+        _get_db(self.db).execute_query("DELETE FROM planning_solution_cache", fetch=False)
+
+
+class CachedSolver(PlanningSolver):
+    """Solveur enveloppé par le cache des solutions hebdomadaires
+
+    Les semaines sont indépendantes pour l'objectif : les semaines en cache sont
+    reprises telles quelles, seule la plage allant de la première à la dernière
+    semaine manquante est résolue, puis ses semaines sont mises en cache. Une même
+    entrée donne toujours le même planning.
+    """
+
+    def __init__(self, solver: PlanningSolver, cache: SolutionCache, method: Optional[str] = None):
+        self.solver = solver
+        self.cache = cache
+        self.name = method or solver.name
+
+    def solve(self, problem: PlanningProblem, time_budget: Optional[float] = None) -> SolverResult:
+        started = time.perf_counter()
+        weeks = problem.weeks()
+        keys = [self.cache.key(problem, days, self.name) for days in weeks]
+        cached = self.cache.get_many(keys)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+
+        store = problem.new_store()
+        solver_name = f"cache:{self.name}"
+        optimal_weeks: List[bool] = []
+        if missing:
+            start, stop = int(weeks[missing[0]][0]), int(weeks[missing[-1]][-1]) + 1
+            solved = self.solver.solve(problem.window(start, stop), time_budget)
+            store.position_grid[:, start:stop] = solved.store.position_grid
+            solver_name = solved.solver
+            self.cache.put_many({keys[i]: (store.position_grid[:, weeks[i]], solved.optimal) for i in missing})
+        for i, days in enumerate(weeks):
+            if keys[i] in cached:
+                grid, optimal = cached[keys[i]]
+                store.position_grid[:, days] = grid
+            else:
+                optimal = solved.optimal
+            optimal_weeks.append(optimal)
+
+        # Borne : valeur des semaines optimales, borne relâchée des autres (objectif séparable par semaine)
+        objective = problem.objective(store)
+        open_weeks = [days for days, optimal in zip(weeks, optimal_weeks) if not optimal]
+        bound = objective
+        if open_weeks:
+            open_days = np.concatenate(open_weeks)
+            partial = problem.new_store()
+            partial.position_grid[:, open_days] = store.position_grid[:, open_days]
+            bound += relaxed_bound(problem, open_days) - problem.objective(partial)
+        logger.info(f"🗄️ {len(weeks) - len(missing)}/{len(weeks)} semaine(s) reprise(s) du cache")
+        return SolverResult(store, solver_name, objective, bound, all(optimal_weeks),
+                            time.perf_counter() - started)
@@ -0,0 +1,272 @@
+# app/backend/planning/config.py
+# Configuration par défaut du moteur de planification
+
+from datetime import date
+
+# Techniciens de l'équipe
+DEFAULT_TECHNICIANS = [
+    "Melissa",
+    "Laetitia",
+    "Michaël",
+    "Olivier",
+    "Patrick",
+    "Caroline",
+    "Fabrice",
+    "Giuseppina"
+]
+
+# Les 9 postes possibles
+DEFAULT_POSITIONS = [
+    "P1 : Tri & urgences",
+    "P2 : Extraction",
+    "P3 : PCR & détection",
+    "P4 : Génotypage HCV",
+    "P5 : NGS HIV",
+    "P6 : Alinity",
+    "P7 : C6800",
+    "P8 : QC & maintenances",
+    "P9 : Mycoses"
+]
+
+# Les 5 horaires possibles
+DEFAULT_SCHEDULES = [
+    "8h00-16h00",
+    "8h30-16h30",
+    "9h00-17h00",
+    "9h30-17h30",
+    "10h00-18h00"
+]
+
+# Règles et contraintes des agents
+DEFAULT_AGENT_DATABASE = {
+    "Melissa": {
+        "unavailable_days": ["Monday"],  # Jamais disponible le lundi
+        "preferred_positions": ["P1", "P2", "P3"],  # Préfère les postes de pré-analytique
+        "max_weekdays_per_week": 4,  # Maximum 4 jours par semaine
+        "specialization": "Front-end processing"
+    },
+    "Laetitia": {
+        "unavailable_days": [],
+        "preferred_positions": ["P4", "P5", "P6"],  # Préfère la biologie moléculaire
+        "max_weekdays_per_week": 5,
+        "specialization": "Molecular biology"
+    },
+    "Michaël": {
+        "unavailable_days": [],
+        "preferred_positions": ["P7", "P8"],  # Préfère les automates et le QC
+        "max_weekdays_per_week": 5,
+        "specialization": "Equipment and QC"
+    },
+    "Olivier": {
+        "unavailable_days": [],
+        "preferred_positions": ["P1", "P2", "P8"],  # Polyvalent
+        "max_weekdays_per_week": 5,
+        "specialization": "Generalist"
+    },
+    "Patrick": {
+        "unavailable_days": [],
+        "preferred_positions": ["P3", "P4", "P5"],  # Préfère la biologie moléculaire
+        "max_weekdays_per_week": 5,
+        "specialization": "Molecular biology"
+    },
+    "Caroline": {
+        "unavailable_days": [],
+        "preferred_positions": ["P9"],  # UNIQUEMENT le poste 9 (Mycoses)
+        "max_weekdays_per_week": 5,
+        "specialization": "Mycoses specialist"
+    },
+    "Fabrice": {
+        "unavailable_days": ["Friday"],  # Jamais disponible le vendredi
+        "preferred_positions": ["P6", "P7"],  # Préfère les automates
+        "max_weekdays_per_week": 4,
+        "specialization": "Equipment specialist"
+    },
+    "Giuseppina": {
+        "unavailable_days": [],
+        "preferred_positions": ["P1", "P2", "P3"],  # Préfère la pré-analytique
+        "max_weekdays_per_week": 5,
+        "specialization": "Front-end processing"
+    }
+}
+
+# Règles et contraintes des postes
+DEFAULT_POSITION_RULES = {
+    "P1 : Tri & urgences": {
+        "min_agents_per_day": 1,
+        "max_agents_per_day": 1,
+        "priority": "High",  # Poste critique
+        "required_skills": ["Front-end processing"]
+    },
+    "P2 : Extraction": {
+        "min_agents_per_day": 1,
+        "max_agents_per_day": 2,
+        "priority": "High",
+        "required_skills": ["Front-end processing"]
+    },
+    "P3 : PCR & détection": {
+        "min_agents_per_day": 1,
+        "max_agents_per_day": 1,
+        "priority": "High",
+        "required_skills": ["Molecular biology"]
+    },
+    "P4 : Génotypage HCV": {
+        "min_agents_per_day": 1,
+        "max_agents_per_day": 1,
+        "priority": "Medium",
+        "required_skills": ["Molecular biology"]
+    },
+    "P5 : NGS HIV": {
+        "min_agents_per_day": 1,
+        "max_agents_per_day": 1,
+        "priority": "Medium",
+        "required_skills": ["Molecular biology"]
+    },
+    "P6 : Alinity": {
+        "min_agents_per_day": 1,
+        "max_agents_per_day": 1,
+        "priority": "Medium",
+        "required_skills": ["Equipment specialist"]
+    },
+    "P7 : C6800": {
+        "min_agents_per_day": 1,
+        "max_agents_per_day": 1,
+        "priority": "Medium",
+        "required_skills": ["Equipment specialist"]
+    },
+    "P8 : QC & maintenances": {
+        "min_agents_per_day": 1,
+        "max_agents_per_day": 1,
+        "priority": "Low",
+        "required_skills": ["Equipment and QC", "Generalist"]
+    },
+    "P9 : Mycoses": {
+        "min_agents_per_day": 1,
+        "max_agents_per_day": 1,
+        "priority": "Low",
+        "required_skills": ["Mycoses specialist"],  # Uniquement Caroline
+        "exclusive_agent": "Caroline"  # Poste exclusif à Caroline
+    }
+}
+
+# Noms des jours utilisés dans unavailable_days (lundi = 0)
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Ordre de traitement des priorités
+PRIORITY_ORDER = ["High", "Medium", "Low"]
+
+# Poids des priorités pour la couverture des places obligatoires (min_agents_per_day)
+PRIORITY_WEIGHTS = {"High": 3, "Medium": 2, "Low": 1}
+
+# Bonus par place obligatoire couverte, multiplié par le poids de priorité :
+# couvrir un poste prime toujours sur les termes de compétence/préférence/charge
+COVERAGE_BONUS = 100
+
+# Méthodes d'affectation disponibles (voir solvers.SOLVERS)
+ASSIGNMENT_METHODS = ["hungarian", "greedy", "exact", "portfolio", "partitioned", "sectors", "halfday"]
+
+# Budget de temps par défaut du solveur exact en ligne de commande (secondes)
+DEFAULT_TIME_BUDGET = 10.0
+
+# Échéance du portefeuille de stratégies parallèles (bouton « Affectation automatique »)
+PORTFOLIO_TIME_BUDGET = 3.0
+
+# Au-delà de ce nombre de semaines, la période est découpée en blocs résolus en parallèle
+PARTITION_MIN_WEEKS = 8
+
+# Échéance par défaut de la résolution par blocs de semaines (secondes)
+PARTITION_TIME_BUDGET = 10.0
+
+# Démarrage des processus des pools parallèles : jamais « fork », dangereux dans le serveur
+# Streamlit multi-thread ; « forkserver » si disponible (Linux, macOS), sinon « spawn » (Windows)
+POOL_START_METHODS = ["forkserver", "spawn"]
+
+# Créneaux de la table planning (colonne shift)
+SHIFTS = ["morning", "afternoon", "evening"]
+
+# Créneaux remplis par une affectation journalière
+DAY_SHIFTS = ["morning", "afternoon"]
+
+# Créneaux travaillés par jour au plus, par défaut (règle d'agent max_shifts_per_day)
+DEFAULT_MAX_SHIFTS_PER_DAY = 2
+
+# Limites horaires par défaut des agents (configuration des disponibilités des utilisateurs)
+DEFAULT_MAX_HOURS_PER_DAY = 8
+DEFAULT_MAX_HOURS_PER_WEEK = 40
+
+# Pause déduite de la durée d'un horaire qui la contient, par défaut
+DEFAULT_BREAK_TIME = "12:00-13:00"
+
+# Secteur des utilisateurs ayant accès à tous les secteurs (users.secteur côté interface)
+ALL_SECTORS = "Service"
+
+# Nombre de sous-plannings par secteur conservés en mémoire entre deux résolutions
+SECTOR_CACHE_SIZE = 64
+
+# Nombre de solutions hebdomadaires conservées dans la table planning_solution_cache
+SOLUTION_CACHE_SIZE = 5000
+
+# Version des règles de l'objectif et des solveurs : l'incrémenter invalide les solutions en cache
+SOLUTION_CACHE_VERSION = 2
+
+# Gain par journée qui conserve le poste du planning de référence (stabilité d'une semaine à l'autre)
+STABILITY_WEIGHT = 3
+
+# Gain d'un poste qu'un agent a tenu moins souvent que la moyenne des agents éligibles
+# (registre d'équité) : les postes peu demandés tournent sur l'année
+FAIRNESS_WEIGHT = 2
+
+# Horaire des journées d'astreinte (week-ends et jours fériés) dans la colonne schedule de la table planning
+ONCALL_SCHEDULE = "Astreinte"
+
+# Fréquences de position_frequency_config : une semaine ouverte toutes les N semaines
+WEEK_FREQUENCIES = {
+    "Toutes les semaines": 1,
+    "Une semaine sur deux": 2,
+    "Une semaine sur trois": 3,
+    "Une semaine sur quatre": 4,
+}
+
+# Lundi de référence des fréquences "une semaine sur N" : semaine ouverte tous les N lundis depuis
+# cette date, sans remise à zéro en janvier (lundi de la semaine ISO 1 de 2025)
+WEEK_FREQUENCY_EPOCH = date(2024, 12, 30)
+
+# Jours de la semaine tels qu'enregistrés dans position_frequency_config.weekdays
+FRENCH_WEEKDAY_NAMES = ["lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi", "dimanche"]
+
+# Nombre de calendriers compilés (postes × période) conservés en mémoire
+DEMAND_CALENDAR_CACHE_SIZE = 32
+
+# Demandes de congé et signalements d'absence (page « Mes disponibilités ») et comptes utilisateurs
+AVAILABILITY_FILE = "data/user_availability.json"
+USERS_FILE = "data/users_database.json"
+
+# Statut d'une demande approuvée dans le centre de notifications
+APPROVED_STATUS = "Approuvé"
+
+# Créneaux couverts par chaque période de signalement d'absence
+ABSENCE_PERIODS = {
+    "Toute la journée": ["morning", "afternoon", "evening"],
+    "La matinée uniquement": ["morning"],
+    "L'après-midi uniquement": ["afternoon"],
+    "La soirée uniquement": ["evening"],
+}
+
+# Jours fériés belges : dates fixes (mois, jour) et décalages depuis le dimanche de Pâques
+# (lundi de Pâques, Ascension, lundi de Pentecôte)
+FIXED_HOLIDAYS = [(1, 1), (5, 1), (7, 21), (8, 15), (11, 1), (11, 11), (12, 25)]
+EASTER_HOLIDAY_OFFSETS = [1, 39, 50]
+
+# Plages horaires des créneaux (préférences horaires de la page « Mes disponibilités »)
+SHIFT_HOURS = {
+    "morning": ("08:00", "12:00"),
+    "afternoon": ("12:00", "17:00"),
+    "evening": ("17:00", "21:00"),
+}
+
+# Gain par créneau préféré selon la flexibilité déclarée (moins flexible = préférence plus forte)
+FLEXIBILITY_WEIGHTS = {
+    "Très flexible": 1,
+    "Flexible": 2,
+    "Peu flexible": 3,
+    "Pas flexible": 4,
+}
@@ -0,0 +1,94 @@
+# app/backend/planning/counters.py
+# Compteurs de charge incrémentaux (agent × semaine, agent × poste)
+
+import numpy as np
+
+from .store import AssignmentStore
+
+
+class LoadCounters:
+    """Compteurs tenus à jour à chaque affectation pour des lectures en O(1)
+
+    ``weekly`` compte les journées travaillées par agent et par semaine, week-end
+    compris comme dans l'objectif et l'évaluation (semaines du lundi au dimanche,
+    indexées depuis la première semaine de la période) ; ``by_position`` compte les journées par agent et par code de poste.
+    """
+
+    def __init__(self, store: AssignmentStore):
+        first_monday_offset = store.start_date.weekday()
+        days = np.arange(store.n_days)
+        self.week_index = (days + first_monday_offset) // 7
+        n_weeks = int(self.week_index[-1]) + 1
+
+        self.weekly = np.zeros((len(store.agents), n_weeks), dtype=np.int32)
+        self.by_position = np.zeros((len(store.agents), len(store.positions) + 1), dtype=np.int32)
+        self._count_existing(store)
+
+    def _count_existing(self, store: AssignmentStore):
+        """Initialiser les compteurs à partir des affectations déjà présentes"""
+        day_codes = store.position_grid.max(axis=2)
+        agents, days = np.nonzero(day_codes)
+        np.add.at(self.weekly, (agents, self.week_index[days]), 1)
+        np.add.at(self.by_position, (agents, day_codes[agents, days]), 1)
+
+    def weekly_load(self, agent: int, day: int) -> int:
+        """Jours déjà travaillés par l'agent dans la semaine du jour donné"""
+        return int(self.weekly[agent, self.week_index[day]])
+
+    def capacity(self, max_weekdays: np.ndarray, day: int) -> np.ndarray:
+        """Journées encore permises par agent dans la semaine du jour donné (limite ``max_weekdays``)"""
+        return np.maximum(max_weekdays - self.weekly[:, self.week_index[day]], 0)
+
+    def add(self, agent: int, day: int, code: int):
+        """Enregistrer une nouvelle journée affectée"""
+        self.weekly[agent, self.week_index[day]] += 1
+        self.by_position[agent, code] += 1
+
+    def remove(self, agent: int, day: int, code: int):
+        """Retirer une journée affectée"""
+        self.weekly[agent, self.week_index[day]] -= 1
+        self.by_position[agent, code] -= 1
+
+
+class HourCounters:
+    """Minutes travaillées par agent et par semaine, tenues à jour à chaque horaire affecté
+
+    ``schedule_minutes`` (agents × horaires, -1 = horaire interdit) donne la durée
+    de chaque horaire pour chaque agent et ``max_week_minutes`` (agents) la limite
+    hebdomadaire : vérifier qu'un horaire tient dans la semaine se fait en O(1).
+    ``by_schedule`` compte les journées par agent et par code d'horaire.
+    """
+
+    def __init__(self, store: AssignmentStore, schedule_minutes: np.ndarray, max_week_minutes: np.ndarray):
+        first_monday_offset = store.start_date.weekday()
+        self.week_index = (np.arange(store.n_days) + first_monday_offset) // 7
+        n_weeks = int(self.week_index[-1]) + 1
+        # Code d'horaire 0 (aucun) : durée nulle
+        self.minutes = np.concatenate([np.zeros((len(store.agents), 1), dtype=np.int32),
+                                       np.maximum(schedule_minutes, 0).astype(np.int32)], axis=1)
+        self.max_week_minutes = max_week_minutes
+
+        self.weekly = np.zeros((len(store.agents), n_weeks), dtype=np.int32)
+        self.by_schedule = np.zeros((len(store.agents), len(store.schedules) + 1), dtype=np.int32)
+        self._count_existing(store)
+
+    def _count_existing(self, store: AssignmentStore):
+        """Initialiser les compteurs à partir des horaires déjà présents"""
+        agents, days = np.nonzero(store.schedule_grid)
+        codes = store.schedule_grid[agents, days].astype(np.intp)
+        np.add.at(self.weekly, (agents, self.week_index[days]), self.minutes[agents, codes])
+        np.add.at(self.by_schedule, (agents, codes), 1)
+
+    def remaining(self, agent: int, day: int) -> int:
+        """Minutes encore disponibles pour l'agent dans la semaine du jour donné"""
+        return int(self.max_week_minutes[agent] - self.weekly[agent, self.week_index[day]])
+
+    def add(self, agent: int, day: int, code: int):
+        """Enregistrer un horaire affecté"""
+        self.weekly[agent, self.week_index[day]] += self.minutes[agent, code]
+        self.by_schedule[agent, code] += 1
+
+    def remove(self, agent: int, day: int, code: int):
+        """Retirer un horaire affecté"""
+        self.weekly[agent, self.week_index[day]] -= self.minutes[agent, code]
+        self.by_schedule[agent, code] -= 1
@@ -0,0 +1,130 @@
+# app/backend/planning/demand.py
+# Calendrier d'ouverture des postes compilé depuis la table position_frequency_config
+
+import json
+import logging
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import (
+    DEMAND_CALENDAR_CACHE_SIZE,
+    FRENCH_WEEKDAY_NAMES,
+    SHIFTS,
+    WEEK_FREQUENCIES,
+    WEEK_FREQUENCY_EPOCH,
+)
+from .repository import _get_db
+from .store import date_range
+
+logger = logging.getLogger(__name__)
+
+# Semaines ISO possibles (1 à 53)
+_ISO_WEEKS = 54
+
+# Poste sans configuration : ouvert du lundi au vendredi, matin et après-midi, toutes les semaines
+_DEFAULT_WEEKDAYS = np.zeros((7, len(SHIFTS)), dtype=bool)
+_DEFAULT_WEEKDAYS[:5, [SHIFTS.index("morning"), SHIFTS.index("afternoon")]] = True
+
+
+def parse_frequency(row: Dict) -> Tuple[np.ndarray, Optional[np.ndarray], int]:
+    """Règle d'une ligne de position_frequency_config : (jours × créneaux, semaines ISO listées, période)
+
+    La liste ``weeks`` (numéros de semaine ISO, None si absente) prime ; à défaut,
+    la fréquence "une semaine sur N" donne la période N (voir ``open_weeks``).
+    """
+    weekdays = np.zeros((7, len(SHIFTS)), dtype=bool)
+    shifts = [bool(row.get(shift)) for shift in SHIFTS]
+    for name in json.loads(row.get("weekdays") or "[]"):
+        if name.lower() in FRENCH_WEEKDAY_NAMES:
+            weekdays[FRENCH_WEEKDAY_NAMES.index(name.lower())] = shifts
+
+    weeks = None
+    listed = json.loads(row.get("weeks") or "null")
+    if listed:
+        weeks = np.zeros(_ISO_WEEKS, dtype=bool)
+        weeks[[w for w in listed if 0 < int(w) < _ISO_WEEKS]] = True
+    return weekdays, weeks, WEEK_FREQUENCIES.get(row.get("week_frequency"), 1)
+
+
+def open_weeks(weeks: Optional[np.ndarray], period: int, dates: List[date]) -> np.ndarray:
+    """Jours d'une semaine ouverte (booléens, un par date) selon une règle de fréquence
+
+    Une liste de semaines ISO s'applique au numéro de semaine de chaque date. La
+    fréquence "une semaine sur N" compte les semaines depuis le lundi
+    ``WEEK_FREQUENCY_EPOCH`` : l'alternance continue d'une année à l'autre, y
+    compris après une année de 53 semaines.
+    """
+    if weeks is not None:
+        return weeks[np.array([day.isocalendar()[1] for day in dates], dtype=np.intp)]
+    elapsed = np.array([day.toordinal() for day in dates]) - WEEK_FREQUENCY_EPOCH.toordinal()
+    return elapsed // 7 % period == 0
+
+
+class DemandCalendar:
+    """Postes ouverts par date et par créneau, compilés depuis position_frequency_config
+
+    Les règles ne sont analysées à nouveau que lorsqu'une ligne de la table change
+    (``updated_at`` ou contenu) ; les calendriers compilés (postes × période) sont
+    conservés en mémoire jusqu'au prochain changement. Les postes sans ligne de
+    configuration restent ouverts tous les jours ouvrables, matin et après-midi.
+    """
+
+    def __init__(self, db=None, cache_size: int = DEMAND_CALENDAR_CACHE_SIZE):
+        self.db = db
+        self.cache_size = cache_size
+        self._version = None
+        self._rules: Dict[str, Tuple[np.ndarray, Optional[np.ndarray], int]] = {}
+        self._compiled: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+
+    def refresh(self) -> bool:
+        """Relire les règles si la table a changé, retourne True en cas de rechargement"""
+        rows = _get_db(self.db).execute_query(
+            "SELECT id, position_id, week_frequency, weekdays, weeks, morning, afternoon, evening, updated_at "
+            "FROM position_frequency_config ORDER BY updated_at, id"
+        )
+        # updated_at est à la seconde près : le contenu des lignes complète la version
+        version = tuple(tuple(row.values()) for row in rows)
+        if version == self._version:
+            return False
+        self._rules = {row["position_id"]: parse_frequency(row) for row in rows}
+        self._compiled.clear()
+        self._version = version
+        logger.info(f"📆 {len(self._rules)} règle(s) de fréquence de postes chargée(s)")
+        return True
+
+    def compile(self, position_codes: List[str], start_date: date, end_date: date) -> np.ndarray:
+        """Postes ouverts (jours × postes × créneaux, booléens) sur une période"""
+        self.refresh()
+        key = (tuple(position_codes), start_date, end_date)
+        if key in self._compiled:
+            self._compiled.move_to_end(key)
+            return self._compiled[key]
+
+        rules = [self._rules.get(code, (_DEFAULT_WEEKDAYS, None, 1)) for code in position_codes]
+        dates = date_range(start_date, end_date)
+        weekdays = np.stack([rule[0] for rule in rules])
+        # Règles identiques (souvent toutes) calculées une seule fois, repérées par leurs semaines
+        keys = [(None if listed is None else tuple(np.flatnonzero(listed)), period) for _, listed, period in rules]
+        by_rule = {}
+        for key, (_, listed, period) in zip(keys, rules):
+            if key not in by_rule:
+                by_rule[key] = open_weeks(listed, period, dates)
+        weeks = np.stack([by_rule[key] for key in keys])
+        day_of_week = np.array([day.weekday() for day in dates], dtype=np.intp)
+        # (postes, jours, créneaux) -> (jours, postes, créneaux)
+        slots = (weekdays[:, day_of_week, :] & weeks[:, :, None]).transpose(1, 0, 2)
+
+        self._compiled[key] = slots
+        while len(self._compiled) > self.cache_size:
+            self._compiled.popitem(last=False)
+        return slots
+
+    def open_positions(self, position_codes: List[str], start_date: date, end_date: date,
+                       shifts: Optional[List[str]] = None) -> np.ndarray:
+        """Postes ouverts sur au moins un des créneaux donnés (jours × postes)"""
+        slots = self.compile(position_codes, start_date, end_date)
+        indices = [SHIFTS.index(shift) for shift in (shifts or SHIFTS)]
+        return slots[:, :, indices].any(axis=2)
@@ -0,0 +1,482 @@
+# app/backend/planning/engine.py
+# Moteur de planification automatique des postes (sans dépendance Streamlit)
+
+import logging
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .config import (
+    ALL_SECTORS,
+    ASSIGNMENT_METHODS,
+    COVERAGE_BONUS,
+    DAY_SHIFTS,
+    DEFAULT_MAX_HOURS_PER_WEEK,
+    DEFAULT_MAX_SHIFTS_PER_DAY,
+    DEFAULT_AGENT_DATABASE,
+    DEFAULT_POSITION_RULES,
+    DEFAULT_POSITIONS,
+    DEFAULT_SCHEDULES,
+    DEFAULT_TECHNICIANS,
+    FAIRNESS_WEIGHT,
+    PRIORITY_ORDER,
+    PRIORITY_WEIGHTS,
+    SHIFTS,
+    STABILITY_WEIGHT,
+    WEEKDAY_NAMES,
+)
+from .availability import AbsenceIndex
+from .cache import CachedSolver, SolutionCache
+from .demand import DemandCalendar
+from .evaluation import PlanEvaluator
+from .feasibility import CoverageReport, check_coverage
+from .halfday import HalfDaySolver
+from .holidays import holiday_mask
+from .hours import assign_schedules, schedule_minutes, weekly_day_limit
+from .ledger import FairnessLedger
+from .local_search import LocalSearch
+from .oncall import oncall_days, oncall_rotation
+from .partition import WeekPartitionSolver  # noqa: F401 (enregistre la méthode « partitioned »)
+from .portfolio import PortfolioSolver  # noqa: F401 (enregistre la méthode « portfolio »)
+from .preferences import PreferenceTensor
+from .problem import PlanningProblem
+from .repair import repair_plan
+from .roster import RosterPattern
+from .sectors import SectorSolver  # noqa: F401 (enregistre la méthode « sectors »)
+from .skills import SkillCatalog, agent_skills
+from .solvers import SOLVERS, ExactSolver, SolverResult
+from .store import AssignmentStore, position_code
+from .warm_start import WarmStartSolver, initial_plan, project_reference
+
+logger = logging.getLogger(__name__)
+
+
+class PlanningEngine:
+    """Affectation automatique des postes selon les règles des agents et des postes"""
+
+    def __init__(self, agents: Optional[Dict[str, Dict]] = None,
+                 position_rules: Optional[Dict[str, Dict]] = None,
+                 positions: Optional[List[str]] = None, schedules: Optional[List[str]] = None,
+                 demand_calendar: Optional[DemandCalendar] = None, absences: Optional[AbsenceIndex] = None,
+                 preferences: Optional[PreferenceTensor] = None, ledger: Optional[FairnessLedger] = None,
+                 holidays: bool = False):
+        self.agents = agents if agents is not None else DEFAULT_AGENT_DATABASE
+        self.position_rules = position_rules if position_rules is not None else DEFAULT_POSITION_RULES
+        self.positions = positions if positions is not None else list(
+            self.position_rules.keys() if position_rules is not None else DEFAULT_POSITIONS
+        )
+        self.schedules = schedules if schedules is not None else DEFAULT_SCHEDULES
+        # Jours d'ouverture des postes (position_frequency_config) ; sans calendrier : jours ouvrables
+        self.demand_calendar = demand_calendar
+        # Congés et absences approuvés (user_availability.json) ; sans index : jours fixes uniquement
+        self.absences = absences
+        # Préférences de jours et de créneaux (availability_preferences, « Mes disponibilités »)
+        self.preferences = preferences
+        # Journées cumulées par poste (table fairness_ledger) ; sans registre : pas de rotation annuelle
+        self.ledger = ledger
+        # Postes fermés les jours fériés (laboratoire fermé)
+        self.holidays = holidays
+
+    def generate(self, start_date: date, end_date: date,
+                 technicians: Optional[List[str]] = None, method: str = "hungarian",
+                 time_budget: Optional[float] = None, improve_budget: Optional[float] = None,
+                 improve_iterations: Optional[int] = None, seed: int = 0,
+                 cache: Optional[SolutionCache] = None, reference: Optional[AssignmentStore] = None,
+                 stability_weight: int = STABILITY_WEIGHT,
+                 problem: Optional[PlanningProblem] = None) -> AssignmentStore:
+        """Générer les affectations de postes pour une période
+
+        ``method`` : "hungarian" (affectation optimale jour par jour), "greedy"
+        (parcours des postes par priorité), "exact" (optimum sur la période),
+        "portfolio" (stratégies en parallèle, meilleur résultat à l'échéance),
+        "partitioned" (blocs de semaines résolus en parallèle, pour les longues périodes),
+        "sectors" (secteurs indépendants résolus séparément, avec cache par secteur)
+        ou "halfday" (matin, après-midi et soir affectés séparément selon la demande de
+        chaque créneau).
+        """
+        return self.solve(start_date, end_date, technicians, method, time_budget, improve_budget,
+                          improve_iterations, seed, cache, reference, stability_weight, problem).store
+
+    def solve(self, start_date: date, end_date: date, technicians: Optional[List[str]] = None,
+              method: str = "hungarian", time_budget: Optional[float] = None,
+              improve_budget: Optional[float] = None, improve_iterations: Optional[int] = None,
+              seed: int = 0, cache: Optional[SolutionCache] = None,
+              reference: Optional[AssignmentStore] = None,
+              stability_weight: int = STABILITY_WEIGHT,
+              problem: Optional[PlanningProblem] = None) -> SolverResult:
+        """Résoudre une période et retourner le planning avec son objectif et son écart
+
+        Avec ``improve_budget`` (secondes) ou ``improve_iterations``, le planning obtenu
+        passe ensuite par la recherche locale (recuit simulé de graine ``seed``). Avec
+        ``cache``, les semaines déjà résolues avec les mêmes données sont reprises.
+        Les postes-jours sans agent éligible disponible sont retirés avant résolution.
+
+        Avec ``reference`` (par exemple la semaine précédente lue dans la table planning),
+        conserver le poste de référence rapporte ``stability_weight`` par journée, et la
+        référence rendue réalisable sert de solution initiale : repli du solveur exact à
+        l'échéance et point de départ de la recherche locale si elle est meilleure.
+
+        ``problem`` : problème déjà compilé par ``build_problem`` pour ces arguments
+        (par exemple après ``check_coverage``), réutilisé au lieu d'être recompilé.
+
+        Chaque journée travaillée reçoit ensuite un horaire qui tient dans les limites
+        d'heures de l'agent (``hours.assign_schedules``).
+        """
+        if method not in ASSIGNMENT_METHODS:
+            raise ValueError(f"Méthode d'affectation inconnue : {method}")
+        if problem is None:
+            problem = self.build_problem(start_date, end_date, technicians, reference, stability_weight)
+        problem = check_coverage(problem).narrow(problem)
+        if method == HalfDaySolver.name:
+            # Objectif par créneau : ni cache, ni démarrage à chaud, ni recherche locale (journalières)
+            result = HalfDaySolver().solve(problem, time_budget)
+            assign_schedules(problem, result.store)
+            logger.info(f"✅ {len(result.store)} journées planifiées par demi-journée du {start_date} "
+                        f"au {end_date} ({result.summary()})")
+            return result
+        initial = initial_plan(problem) if reference is not None else None
+        solver = SOLVERS[method]()
+        if isinstance(solver, ExactSolver) and initial is not None:
+            solver.fallback = WarmStartSolver(initial)
+        if cache is not None:
+            solver = CachedSolver(solver, cache, method)
+        result = solver.solve(problem, time_budget)
+        if initial is not None and not result.optimal:
+            initial_objective = problem.objective(initial)
+            if initial_objective > result.objective:
+                result = SolverResult(initial, WarmStartSolver.name, initial_objective, result.bound,
+                                      False, result.elapsed)
+        if (improve_budget or improve_iterations) and not result.optimal:
+            improved = LocalSearch(problem, seed).improve(result.store, improve_budget, improve_iterations)
+            result = SolverResult(improved.store, f"{method}+local_search", improved.objective,
+                                  min(result.bound, improved.bound), False, result.elapsed + improved.elapsed)
+        assign_schedules(problem, result.store)
+        logger.info(f"✅ {len(result.store)} affectations générées du {start_date} au {end_date} "
+                    f"({result.summary()})")
+        return result
+
+    def evaluate(self, plan: AssignmentStore) -> Dict[str, float]:
+        """Indicateurs d'un planning : objectif, couverture, limites, préférences et équité"""
+        problem = self.build_problem(plan.start_date, plan.end_date, plan.agents)
+        return PlanEvaluator(problem).evaluate_store(plan)
+
+    def check_coverage(self, start_date: date, end_date: date, technicians: Optional[List[str]] = None,
+                       problem: Optional[PlanningProblem] = None) -> CoverageReport:
+        """Vérifier par flot maximal quelles places obligatoires peuvent être couvertes
+
+        ``problem`` : problème déjà compilé pour ces arguments, réutilisé tel quel.
+        """
+        if problem is None:
+            problem = self.build_problem(start_date, end_date, technicians)
+        return check_coverage(problem)
+
+    def repair(self, plan: AssignmentStore, absences: Optional[Dict[str, Iterable[date]]] = None,
+               pinned: Iterable[Tuple[str, date]] = (), days: Iterable[date] = ()) -> SolverResult:
+        """Réparer un planning après un changement de disponibilité, sans tout recalculer
+
+        ``absences`` : nouvelles absences par agent, journées entières sauf celles que
+        l'index des absences limite à une demi-journée ; ``pinned`` : cellules (agent, date)
+        à conserver (saisies manuelles) ; ``days`` : jours dont les affectations non
+        épinglées sont rouvertes. Seules les semaines concernées sont compilées ; le
+        résultat couvre ces semaines et se recopie avec ``plan.update_from``.
+        """
+        absences = {agent: [day for day in dates if plan.contains(day)]
+                    for agent, dates in (absences or {}).items() if agent in plan.agents}
+        days = [day for day in days if plan.contains(day)]
+        changed = [day for dates in absences.values() for day in dates] + days
+        if not changed:
+            start_date, end_date = plan.start_date, plan.end_date
+        else:
+            # Limites et charge hebdomadaires : la fenêtre couvre les semaines entières touchées
+            start_date = max(min(changed) - timedelta(days=min(changed).weekday()), plan.start_date)
+            end_date = min(max(changed) + timedelta(days=6 - max(changed).weekday()), plan.end_date)
+
+        problem = self.build_problem(start_date, end_date, plan.agents)
+        window = problem.new_store()
+        days_slice = slice((start_date - plan.start_date).days, (end_date - plan.start_date).days + 1)
+        window.position_grid[...] = plan.position_grid[:, days_slice]
+        window.schedule_grid[...] = plan.schedule_grid[:, days_slice]
+
+        def mask(cells: Iterable[Tuple[str, date]]) -> np.ndarray:
+            grid = np.zeros((len(plan.agents), problem.n_days), dtype=bool)
+            for agent, day in cells:
+                if agent in plan.agents and start_date <= day <= end_date:
+                    grid[plan.agent_index(agent), (day - start_date).days] = True
+            return grid
+
+        absent = mask((agent, day) for agent, dates in absences.items() for day in dates)
+        if self.absences is not None:
+            # Demi-journées approuvées : seuls les créneaux absents de l'index sont libérés
+            shifts = self.absences.mask(plan.agents, start_date, end_date)
+            indexed = absent & shifts.any(axis=2)
+            absent = np.where(indexed[:, :, None], shifts, absent[:, :, None])
+        day_indices = np.array(sorted({(day - start_date).days for day in days}), dtype=np.intp)
+        result = repair_plan(problem, window, absent, mask(pinned), day_indices)
+        assign_schedules(problem, result.store)
+        logger.info(f"✅ Planning réparé du {start_date} au {end_date} ({result.summary()})")
+        return result
+
+    def expand_roster(self, pattern: RosterPattern, start_date: date, end_date: date,
+                      technicians: Optional[List[str]] = None) -> SolverResult:
+        """Dérouler un roulement cyclique sur une période et ne résoudre que les trous
+
+        Le roulement est recopié par indexation ; ses cases impossibles ce jour-là (poste
+        fermé ou jour férié, agent indisponible, en congé ou inéligible) sont retirées.
+        Les cases restantes sont épinglées et seules les places encore libres sont
+        calculées (réparation incrémentale), puis les horaires manquants affectés.
+        """
+        problem = self.build_problem(start_date, end_date, technicians)
+        plan = pattern.expand(problem.agents, problem.positions, problem.schedules, start_date, end_date)
+
+        codes = plan.position_grid[:, :, SHIFTS.index(DAY_SHIFTS[0])].astype(np.intp)
+        agents, days = np.nonzero(codes)
+        positions = codes[agents, days] - 1
+        invalid = (problem.demand_max[days, positions] == 0) | (problem.static_scores[agents, positions] < 0) \
+            | ~problem.available[agents, days]
+        # Au-delà des places du poste ce jour-là, les cases en trop sont retirées aussi
+        order = np.lexsort((agents, invalid, positions, days))
+        cells = (days * len(problem.positions) + positions)[order]
+        first = np.searchsorted(cells, cells)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order)) - first
+        invalid |= rank >= problem.demand_max[days, positions]
+        plan.position_grid[agents[invalid], days[invalid]] = 0
+        plan.schedule_grid[~problem.available] = 0
+        plan.schedule_grid[agents[invalid], days[invalid]] = 0
+
+        kept = plan.position_grid.any(axis=2)
+        filled = np.zeros(problem.demand_max.shape, dtype=np.int32)
+        np.add.at(filled, (days[~invalid], positions[~invalid]), 1)
+        holes = np.flatnonzero((filled < problem.demand_max).any(axis=1))
+        result = repair_plan(problem, plan, pinned=kept, days=holes)
+        assign_schedules(problem, result.store)
+        logger.info(f"🔁 Roulement de {pattern.n_weeks} semaine(s) déroulé du {start_date} au {end_date} : "
+                    f"{int(kept.sum())} journée(s) reprises, {int(invalid.sum())} retirée(s), "
+                    f"{len(holes)} jour(s) complété(s)")
+        return SolverResult(result.store, "roster", result.objective, result.bound, False, result.elapsed)
+
+    def rotate_schedules(self, plan: AssignmentStore, technicians: Optional[List[str]] = None,
+                         history: Optional[np.ndarray] = None) -> AssignmentStore:
+        """Réaffecter les horaires d'un planning en équilibrant les horaires tenus par chaque agent
+
+        Les horaires des ``technicians`` (par défaut tous les agents du planning) sont
+        remplacés ; ``history`` (agents du planning × horaires, voir
+        ``repository.load_schedule_counts``) compte les journées déjà tenues avant la
+        période. Un agent sans poste sur la période reçoit un horaire sur ses jours
+        disponibles où des postes sont ouverts.
+        """
+        problem = self.build_problem(plan.start_date, plan.end_date, plan.agents)
+        rotated = plan.copy_range(plan.start_date, plan.end_date)
+        selected = np.isin(plan.agents, plan.agents if technicians is None else technicians)
+        rotated.schedule_grid[selected] = 0
+
+        worked = (rotated.position_grid > 0).any(axis=2)
+        idle = ~worked.any(axis=1)
+        worked[idle] = (problem.available & problem.demand_max.any(axis=1)[None, :])[idle]
+        worked[~selected] = False
+        count = assign_schedules(problem, rotated, worked, history)
+        logger.info(f"⏰ {count} horaires affectés du {plan.start_date} au {plan.end_date}")
+        return rotated
+
+    def rotate_oncall(self, start_date: date, end_date: date, technicians: Optional[List[str]] = None,
+                      history: Optional[np.ndarray] = None) -> Dict[date, str]:
+        """Agent d'astreinte de chaque week-end et, avec ``holidays``, de chaque jour férié
+
+        Sont exclus d'un jour les agents dont la règle ``oncall`` est fausse, ceux
+        indisponibles ce jour de la semaine (``unavailable_days``) et ceux en congé ou
+        absence approuvés. ``history`` (agents, voir ``repository.load_schedule_counts``
+        avec ``ONCALL_SCHEDULE``) compte les journées d'astreinte déjà tenues.
+        """
+        if start_date > end_date:
+            raise ValueError("La date de début doit être antérieure à la date de fin")
+        technicians = self.resolve_technicians(technicians)
+        n_days = (end_date - start_date).days + 1
+        unavailable, _, _ = self._agent_limits(technicians)
+        weekdays = (np.arange(n_days) + start_date.weekday()) % 7
+        available = ~unavailable[:, weekdays]
+        available &= np.array([self.agents.get(agent, {}).get("oncall", True) for agent in technicians],
+                              dtype=bool)[:, None]
+        if self.absences is not None:
+            available &= ~self.absences.mask(technicians, start_date, end_date).any(axis=2)
+
+        assignee = oncall_rotation(oncall_days(start_date, end_date, self.holidays), available, history)
+        days = np.flatnonzero(assignee >= 0)
+        logger.info(f"📟 {len(days)} journées d'astreinte affectées du {start_date} au {end_date}")
+        return {start_date + timedelta(days=int(d)): technicians[assignee[d]] for d in days}
+
+    def build_problem(self, start_date: date, end_date: date,
+                      technicians: Optional[List[str]] = None, reference: Optional[AssignmentStore] = None,
+                      stability_weight: int = STABILITY_WEIGHT) -> PlanningProblem:
+        """Compiler les règles des agents et des postes en matrices pour les solveurs"""
+        if start_date > end_date:
+            raise ValueError("La date de début doit être antérieure à la date de fin")
+        technicians = self.resolve_technicians(technicians)
+
+        unavailable, max_weekdays, max_daily_shifts = self._agent_limits(technicians)
+        agent_schedule_minutes, max_week_minutes = self._agent_hours(technicians)
+        static_scores = self._static_scores(technicians)
+        if self.schedules:
+            # Chaque journée travaillée consomme au moins l'horaire autorisé le plus court
+            max_weekdays = np.minimum(max_weekdays, weekly_day_limit(agent_schedule_minutes, max_week_minutes))
+        shift_demand_min, shift_demand_max = self._shift_demand(start_date, end_date)
+        # Demande journalière : la plus forte des créneaux de journée
+        day_shifts = [SHIFTS.index(shift) for shift in DAY_SHIFTS]
+        demand_min = shift_demand_min[:, :, day_shifts].max(axis=2)
+        demand_max = shift_demand_max[:, :, day_shifts].max(axis=2)
+        return PlanningProblem(
+            technicians, start_date, end_date, self.positions, self.schedules,
+            static_scores=static_scores + self._rotation_bonus(technicians, static_scores),
+            unavailable=unavailable,
+            max_weekdays=max_weekdays,
+            demand_min=demand_min,
+            demand_max=demand_max,
+            slot_bonus=self._slot_bonus(),
+            priority_order=self._priority_order(technicians),
+            preferred=None if reference is None else project_reference(
+                reference, technicians, self.positions, start_date, demand_min.shape[0]),
+            stability_weight=stability_weight if reference is not None else 0,
+            position_preferences=self._position_preferences(technicians),
+            shift_demand_min=shift_demand_min,
+            shift_demand_max=shift_demand_max,
+            max_daily_shifts=max_daily_shifts,
+            absent=None if self.absences is None else self.absences.mask(technicians, start_date, end_date),
+            shift_preferences=None if self.preferences is None else self.preferences.for_period(
+                technicians, (np.arange(demand_min.shape[0]) + start_date.weekday()) % 7),
+            schedule_minutes=agent_schedule_minutes,
+            max_week_minutes=max_week_minutes,
+        )
+
+    def resolve_technicians(self, technicians: Optional[List[str]] = None) -> List[str]:
+        """Techniciens à planifier : ceux donnés, sinon l'équipe par défaut connue des règles"""
+        if technicians is not None:
+            return technicians
+        return [tech for tech in DEFAULT_TECHNICIANS if tech in self.agents] or list(self.agents)
+
+    def _agent_limits(self, agents: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Jours d'indisponibilité (agents × jours de la semaine), limites hebdomadaire et journalière"""
+        unavailable = np.zeros((len(agents), 7), dtype=bool)
+        max_weekdays = np.zeros(len(agents), dtype=np.int32)
+        max_daily_shifts = np.zeros(len(agents), dtype=np.int32)
+        for a, agent in enumerate(agents):
+            agent_info = self.agents.get(agent, {})
+            for weekday, day_name in enumerate(WEEKDAY_NAMES):
+                unavailable[a, weekday] = day_name in agent_info.get("unavailable_days", [])
+            max_weekdays[a] = agent_info.get("max_weekdays_per_week", 5)
+            max_daily_shifts[a] = agent_info.get("max_shifts_per_day", DEFAULT_MAX_SHIFTS_PER_DAY)
+        return unavailable, max_weekdays, max_daily_shifts
+
+    def _agent_hours(self, agents: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Durée de chaque horaire par agent (minutes, -1 = interdit) et limite hebdomadaire
+
+        Règles d'agent ``max_hours_per_day``, ``max_hours_per_week``, ``work_hours`` et
+        ``break_time`` (configuration des disponibilités des utilisateurs).
+        """
+        minutes = np.zeros((len(agents), len(self.schedules)), dtype=np.int32)
+        max_week_minutes = np.zeros(len(agents), dtype=np.int32)
+        for a, agent in enumerate(agents):
+            agent_info = self.agents.get(agent, {})
+            if self.schedules:
+                minutes[a] = schedule_minutes(self.schedules, agent_info)
+            max_week_minutes[a] = 60 * agent_info.get("max_hours_per_week", DEFAULT_MAX_HOURS_PER_WEEK)
+        return minutes, max_week_minutes
+
+    def _static_scores(self, agents: List[str]) -> np.ndarray:
+        """Part fixe du score (compétence + préférence), matrice agents × postes
+
+        Un agent détenant l'une des compétences requises par le poste (``skills`` et
+        ``specialization`` de l'agent, ``required_skills`` du poste) gagne 10, un poste
+        préféré 5.
+
+        Les couples interdits par la règle ``exclusive_agent`` valent -1 : un poste
+        exclusif n'est tenu que par son agent, qui n'est affecté qu'à ce poste. Un
+        agent rattaché à un ``secteur`` n'est pas affecté aux postes d'un autre secteur
+        (pas de secteur ou "Service" : tous les secteurs).
+        """
+        # Correspondance de compétence (ET binaire des champs de compétences) et préférence de poste
+        skills = SkillCatalog().match([agent_skills(self.agents.get(agent, {})) for agent in agents],
+                                      [self.position_rules[position].get("required_skills", [])
+                                       for position in self.positions])
+        static_scores = (10 * skills + 5 * self._position_preferences(agents)).astype(np.int32)
+
+        agent_sectors = np.array([self.agents.get(agent, {}).get("secteur", ALL_SECTORS) for agent in agents])
+        position_sectors = np.array([self.position_rules[position].get("secteur", ALL_SECTORS)
+                                     for position in self.positions])
+        other_sector = (agent_sectors[:, None] != position_sectors[None, :]) \
+            & (agent_sectors != ALL_SECTORS)[:, None] & (position_sectors != ALL_SECTORS)[None, :]
+        static_scores[other_sector] = -1
+
+        agent_index = {agent: a for a, agent in enumerate(agents)}
+        for p, position in enumerate(self.positions):
+            exclusive_agent = agent_index.get(self.position_rules[position].get("exclusive_agent"))
+            if exclusive_agent is not None:
+                exclusive_score = static_scores[exclusive_agent, p]
+                static_scores[:, p] = -1
+                static_scores[exclusive_agent, :] = -1
+                static_scores[exclusive_agent, p] = exclusive_score
+        return static_scores
+
+    def _rotation_bonus(self, agents: List[str], static_scores: np.ndarray) -> np.ndarray:
+        """Gain des postes qu'un agent a tenus moins souvent que la moyenne (agents × postes)
+
+        La moyenne porte sur les agents éligibles au poste ; les couples interdits ne
+        reçoivent rien et gardent leur score de -1.
+        """
+        bonus = np.zeros((len(agents), len(self.positions)), dtype=np.int32)
+        if self.ledger is None or not agents:
+            return bonus
+        eligible = static_scores >= 0
+        held = self.ledger.positions(agents, self.positions)
+        mean = (held * eligible).sum(axis=0) / np.maximum(eligible.sum(axis=0), 1)
+        bonus[eligible & (held < mean[None, :])] = FAIRNESS_WEIGHT
+        return bonus
+
+    def _position_preferences(self, agents: List[str]) -> np.ndarray:
+        """Postes préférés des agents, matrice booléenne agents × postes"""
+        preferences = np.zeros((len(agents), len(self.positions)), dtype=bool)
+        for a, agent in enumerate(agents):
+            preferred = self.agents.get(agent, {}).get("preferred_positions", [])
+            for p, position in enumerate(self.positions):
+                preferences[a, p] = position_code(position) in preferred
+        return preferences
+
+    def _shift_demand(self, start_date: date, end_date: date) -> Tuple[np.ndarray, np.ndarray]:
+        """Places minimales et maximales par jour, poste et créneau
+
+        Avec un calendrier de demande, seuls les créneaux où le poste est ouvert
+        comptent ; sinon le matin et l'après-midi des jours ouvrables. Avec ``holidays``,
+        les jours fériés sont fermés.
+        """
+        n_days = (end_date - start_date).days + 1
+        if self.demand_calendar is not None:
+            is_open = self.demand_calendar.compile(
+                [position_code(position) for position in self.positions], start_date, end_date)
+        else:
+            is_weekday = (np.arange(n_days) + start_date.weekday()) % 7 < 5
+            is_open = is_weekday[:, None, None] & np.isin(SHIFTS, DAY_SHIFTS)[None, None, :]
+            is_open = np.broadcast_to(is_open, (n_days, len(self.positions), len(SHIFTS)))
+        minimum = np.array([self.position_rules[position].get("min_agents_per_day", 1)
+                            for position in self.positions], dtype=np.int32)
+        maximum = np.array([self.position_rules[position].get("max_agents_per_day", minimum[p])
+                            for p, position in enumerate(self.positions)], dtype=np.int32)
+        if self.holidays:
+            is_open = is_open & ~holiday_mask(start_date, end_date)[:, None, None]
+        demand_min = np.where(is_open, minimum[None, :, None], 0).astype(np.int32)
+        demand_max = np.where(is_open, np.maximum(maximum, minimum)[None, :, None], 0).astype(np.int32)
+        return demand_min, demand_max
+
+    def _slot_bonus(self) -> np.ndarray:
+        """Bonus par place obligatoire couverte, pondéré par la priorité du poste"""
+        return np.array([COVERAGE_BONUS * PRIORITY_WEIGHTS.get(self.position_rules[position].get("priority"), 1)
+                         for position in self.positions], dtype=np.int32)
+
+    def _priority_order(self, agents: List[str]) -> List[Tuple[int, Optional[int]]]:
+        """Postes triés par priorité avec l'indice de leur agent exclusif éventuel"""
+        agent_index = {agent: a for a, agent in enumerate(agents)}
+        ordered = []
+        for priority in PRIORITY_ORDER:
+            for p, position in enumerate(self.positions):
+                rules = self.position_rules[position]
+                if rules.get("priority") == priority:
+                    ordered.append((p, agent_index.get(rules.get("exclusive_agent"))))
+        return ordered
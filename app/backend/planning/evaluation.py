@@ -0,0 +1,128 @@
+# app/backend/planning/evaluation.py
+# Évaluation vectorisée de plannings : couverture, limites, préférences, équité et objectif
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from .config import DAY_SHIFTS, SHIFTS
+from .problem import PlanningProblem, load_value
+from .store import AssignmentStore
+
+_DAY_SHIFTS = [SHIFTS.index(shift) for shift in DAY_SHIFTS]
+
+
+class PlanEvaluator:
+    """Indicateurs d'un lot de plannings candidats pour un même problème
+
+    Les plannings sont des grilles de codes de postes (plannings × agents × jours,
+    0 = libre), éventuellement accompagnées des grilles d'horaires ; tous les
+    indicateurs sont calculés par comptages NumPy (``bincount``) sur le lot entier,
+    sans boucle Python par planning. L'objectif est identique à
+    ``PlanningProblem.objective``.
+    """
+
+    def __init__(self, problem: PlanningProblem):
+        self.problem = problem
+        n_agents, n_positions = problem.static_scores.shape
+        # Tables indexées par code (0 = libre) pour lire les scores par simple indexation
+        self._static = np.zeros((n_agents, n_positions + 1), dtype=np.int64)
+        self._static[:, 1:] = problem.static_scores
+        self._preferences = np.zeros((n_agents, n_positions + 1), dtype=bool)
+        self._preferences[:, 1:] = problem.position_preferences
+        self._reference = problem.preferred.astype(np.int64) + 1
+        self._n_weeks = int(problem.week_index[-1]) + 1
+
+    def evaluate(self, position_grids: np.ndarray,
+                 schedule_grids: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Indicateurs par planning (tableaux de longueur N)
+
+        ``objective`` : valeur de l'objectif ; ``uncovered`` / ``overstaffed`` : places
+        obligatoires manquantes et places au-delà de ``max_agents`` ; ``cap_violations`` :
+        journées au-delà de la limite hebdomadaire ; ``preference_rate`` : part des
+        journées sur un poste préféré ; ``load_variance`` : variance des journées
+        travaillées par agent ; ``schedule_fairness`` : écart-type moyen, entre agents,
+        de la part de chaque horaire (0 = rotation parfaitement équitable).
+        """
+        codes = np.asarray(position_grids, dtype=np.intp)
+        if codes.ndim == 2:
+            codes = codes[None]
+        n_plans, n_agents, n_days = codes.shape
+        problem = self.problem
+        n_codes = problem.static_scores.shape[1] + 1
+        agents = np.arange(n_agents)[None, :, None]
+        days = np.arange(n_days)[None, None, :]
+        plans = np.arange(n_plans)[:, None, None]
+        working = codes > 0
+
+        # Couverture : agents par plan, jour et poste
+        counts = np.bincount(((plans * n_days + days) * n_codes + codes).ravel(),
+                             minlength=n_plans * n_days * n_codes).reshape(n_plans, n_days, n_codes)[:, :, 1:]
+        uncovered = np.maximum(problem.demand_min - counts, 0).sum(axis=(1, 2))
+        overstaffed = np.maximum(counts - problem.demand_max, 0).sum(axis=(1, 2))
+
+        # Charge hebdomadaire par plan et agent
+        weekly = np.bincount(((plans * n_agents + agents) * self._n_weeks + problem.week_index[days]).ravel(),
+                             weights=working.ravel(), minlength=n_plans * n_agents * self._n_weeks)
+        weekly = weekly.reshape(n_plans, n_agents, self._n_weeks).astype(np.int64)
+        cap_violations = np.maximum(weekly - problem.max_weekdays[None, :, None], 0).sum(axis=(1, 2))
+
+        days_worked = working.sum(axis=2)
+        preferred_days = self._preferences[agents, codes].sum(axis=(1, 2))
+        preference_rate = preferred_days / np.maximum(days_worked.sum(axis=1), 1)
+
+        objective = self._static[agents, codes].sum(axis=(1, 2))
+        objective += problem.stability_weight * (working & (codes == self._reference[None])).sum(axis=(1, 2))
+        objective += (working * problem.day_preferences[None]).sum(axis=(1, 2))
+        objective += (np.minimum(counts, problem.demand_min) * problem.slot_bonus).sum(axis=(1, 2))
+        objective += load_value(weekly).sum(axis=(1, 2))
+
+        metrics = {
+            "objective": objective,
+            "uncovered": uncovered,
+            "overstaffed": overstaffed,
+            "cap_violations": cap_violations,
+            "preference_rate": preference_rate,
+            "load_variance": days_worked.var(axis=1),
+        }
+        if schedule_grids is not None:
+            metrics["schedule_fairness"] = self._schedule_fairness(np.asarray(schedule_grids, dtype=np.intp))
+        return metrics
+
+    def evaluate_store(self, store: AssignmentStore) -> Dict[str, float]:
+        """Indicateurs d'un planning (valeurs scalaires)
+
+        Les indicateurs de couverture et de charge portent sur le premier créneau de
+        journée ; l'objectif d'un planning par demi-journée est noté créneau par créneau.
+        """
+        metrics = self.evaluate(store.position_grid[None, :, :, _DAY_SHIFTS[0]], store.schedule_grid[None])
+        values = {name: values[0].item() for name, values in metrics.items()}
+        if not store.is_daily():
+            values["objective"] = self.problem.objective(store)
+        return values
+
+    def coverage(self, store: AssignmentStore) -> np.ndarray:
+        """Agents affectés par jour et par poste (jours × postes), à comparer à ``demand_min``/``demand_max``"""
+        codes = store.position_grid[:, :, _DAY_SHIFTS[0]].astype(np.intp)
+        n_codes = self.problem.static_scores.shape[1] + 1
+        days = np.broadcast_to(np.arange(codes.shape[1]), codes.shape)
+        counts = np.bincount((days * n_codes + codes).ravel(), minlength=codes.shape[1] * n_codes)
+        return counts.reshape(codes.shape[1], n_codes)[:, 1:]
+
+    def _schedule_fairness(self, schedules: np.ndarray) -> np.ndarray:
+        """Écart-type moyen entre agents de la part de chaque horaire dans leurs journées"""
+        if schedules.ndim == 2:
+            schedules = schedules[None]
+        n_plans, n_agents, _ = schedules.shape
+        n_schedules = len(self.problem.schedules) + 1
+        rows = np.arange(n_plans * n_agents).reshape(n_plans, n_agents, 1)
+        counts = np.bincount((rows * n_schedules + schedules).ravel(), minlength=n_plans * n_agents * n_schedules)
+        counts = counts.reshape(n_plans, n_agents, n_schedules)[:, :, 1:]
+        totals = counts.sum(axis=2, keepdims=True)
+        shares = counts / np.maximum(totals, 1)
+        # Seuls les agents ayant au moins un horaire comptent
+        active = totals > 0
+        n_active = np.maximum(active.sum(axis=1), 1)
+        mean = (shares * active).sum(axis=1) / n_active
+        variance = (((shares - mean[:, None, :]) ** 2) * active).sum(axis=1) / n_active
+        return np.sqrt(variance).mean(axis=1) if n_schedules > 1 else np.zeros(n_plans)
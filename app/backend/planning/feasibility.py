@@ -0,0 +1,110 @@
+# app/backend/planning/feasibility.py
+# Vérification de couverture par flot maximal, avant toute résolution
+
+import logging
+from datetime import date
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .flow import MinCostFlow
+from .problem import PlanningProblem
+
+logger = logging.getLogger(__name__)
+
+
+class CoverageReport:
+    """Couverture maximale des places obligatoires, jour par jour
+
+    ``coverable`` (jours × postes) est la couverture d'un flot maximal pondéré par
+    la priorité des postes ; ``unreachable`` marque les postes-jours ouverts sans
+    aucun agent éligible disponible. Les limites hebdomadaires sont ignorées : la
+    couverture obtenue est une borne supérieure de celle de tout planning.
+    """
+
+    def __init__(self, problem: PlanningProblem, coverable: np.ndarray, unreachable: np.ndarray):
+        self.problem = problem
+        self.coverable = coverable
+        self.unreachable = unreachable
+
+    @property
+    def missing(self) -> np.ndarray:
+        """Places obligatoires non couvrables (jours × postes)"""
+        return self.problem.demand_min - self.coverable
+
+    @property
+    def feasible(self) -> bool:
+        return not self.missing.any()
+
+    @property
+    def coverage_bound(self) -> int:
+        """Borne supérieure du total des bonus de couverture"""
+        return int((self.coverable * self.problem.slot_bonus).sum())
+
+    def shortfalls(self) -> List[Tuple[date, str, int, str]]:
+        """Places manquantes : (date, poste, nombre de places, motif), par date puis par poste"""
+        exclusive = {p: a for p, a in self.problem.priority_order if a is not None}
+        shortfalls = []
+        for d, p in zip(*np.nonzero(self.missing > 0)):
+            if not self.unreachable[d, p]:
+                reason = "agents éligibles déjà affectés à des postes prioritaires"
+            elif p in exclusive:
+                reason = f"agent exclusif {self.problem.agents[exclusive[p]]} indisponible"
+            else:
+                reason = "aucun agent éligible disponible"
+            shortfalls.append((self.problem.day(d), self.problem.positions[p], int(self.missing[d, p]), reason))
+        return shortfalls
+
+    def narrow(self, problem: PlanningProblem) -> PlanningProblem:
+        """Problème sans les postes-jours injoignables (les semaines vides ne sont plus résolues)"""
+        if not self.unreachable.any():
+            return problem
+        narrowed = problem.window(0, problem.n_days)
+        narrowed.demand_min = np.where(self.unreachable, 0, problem.demand_min)
+        narrowed.demand_max = np.where(self.unreachable, 0, problem.demand_max)
+        narrowed.shift_demand_min = np.where(self.unreachable[:, :, None], 0, problem.shift_demand_min)
+        narrowed.shift_demand_max = np.where(self.unreachable[:, :, None], 0, problem.shift_demand_max)
+        return narrowed
+
+
+def _max_coverage(problem: PlanningProblem, d: int) -> np.ndarray:
+    """Places obligatoires couvertes par poste dans un flot maximal du jour
+
+    Réseau : source → agent disponible (capacité 1) → poste éligible → puits
+    (capacité ``demand_min``, gain ``slot_bonus`` : les postes prioritaires d'abord).
+    """
+    n_agents, n_positions = problem.static_scores.shape
+    source, sink = 0, 1
+    agent_nodes = 2 + np.arange(n_agents)
+    position_nodes = 2 + n_agents + np.arange(n_positions)
+    network = MinCostFlow(2 + n_agents + n_positions)
+
+    agents = np.flatnonzero(problem.available[:, d])
+    network.add_edges(source, agent_nodes[agents], 1, 0)
+    eligible = (problem.static_scores[agents] >= 0) & (problem.demand_min[d] > 0)[None, :]
+    a, p = np.nonzero(eligible)
+    network.add_edges(agent_nodes[agents[a]], position_nodes[p], 1, 0)
+    sink_edges = network.add_edges(position_nodes, sink, problem.demand_min[d], -problem.slot_bonus)
+    network.solve(source, sink)
+    return network.edge_flow(sink_edges)
+
+
+def check_coverage(problem: PlanningProblem) -> CoverageReport:
+    """Calculer la couverture maximale de chaque jour (jours identiques calculés une fois)"""
+    eligible = (problem.static_scores >= 0).astype(np.int32)
+    reachable = problem.available.T.astype(np.int32) @ eligible > 0
+    unreachable = (problem.demand_max > 0) & ~reachable
+
+    coverable = np.zeros_like(problem.demand_min)
+    solved: Dict[bytes, np.ndarray] = {}
+    for d in np.flatnonzero(problem.demand_min.any(axis=1)):
+        key = problem.available[:, d].tobytes() + problem.demand_min[d].tobytes()
+        if key not in solved:
+            solved[key] = _max_coverage(problem, d)
+        coverable[d] = solved[key]
+
+    report = CoverageReport(problem, coverable, unreachable)
+    if not report.feasible:
+        logger.info(f"📉 {int(report.missing.sum())} place(s) obligatoire(s) non couvrable(s) "
+                    f"sur {int(report.missing.any(axis=1).sum())} jour(s)")
+    return report
@@ -0,0 +1,93 @@
+# app/backend/planning/halfday.py
+# Affectation par demi-journée (matin, après-midi, soir) avec demande par créneau
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .counters import LoadCounters
+from .problem import WEEKLY_LOAD_BASE, PlanningProblem, shift_objective
+from .solvers import SOLVERS, PlanningSolver, SolverResult, _day_slots, _match_day
+from .store import AssignmentStore
+
+
+def _shift_slots(problem: PlanningProblem, d: int, s: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Places d'un créneau : poste de chaque place et bonus (obligatoires en premier)"""
+    return _day_slots(problem, d, problem.shift_demand_min[d, :, s], problem.shift_demand_max[d, :, s])
+
+
+def _shift_static(problem: PlanningProblem, d: int) -> np.ndarray:
+    """Scores fixes par créneau du jour d (créneaux × agents × postes), préférence du créneau comprise"""
+    return np.stack([problem.day_static(d, problem.shift_preferences[:, d, s])
+                     for s in range(problem.shift_preferences.shape[2])])
+
+
+def shift_bound(problem: PlanningProblem, days: np.ndarray) -> int:
+    """Borne supérieure de l'objectif par demi-journée, sans limite journalière ni hebdomadaire
+
+    Chaque créneau est résolu seul avec le terme de charge maximal (5) : une journée
+    travaillée rapporte au plus 5 au titre de la charge, la borne est donc valide.
+    """
+    solved: Dict[bytes, int] = {}
+    total = 0
+    for d in days:
+        static = _shift_static(problem, d)
+        for s in np.flatnonzero(problem.shift_demand_max[d].any(axis=0)):
+            shift_scores = np.where(problem.shift_available[:, d, s, None] & (static[s] >= 0),
+                                    static[s] + WEEKLY_LOAD_BASE, -1)
+            key = shift_scores.tobytes() + problem.shift_demand_min[d, :, s].tobytes() \
+                + problem.shift_demand_max[d, :, s].tobytes()
+            if key not in solved:
+                solved[key] = _match_day(shift_scores, *_shift_slots(problem, d, s))[1]
+            total += solved[key]
+    return total
+
+
+class HalfDaySolver(PlanningSolver):
+    """Affectation optimale créneau par créneau (matin, après-midi puis soir)
+
+    Chaque créneau ouvert est une affectation de coût minimal sur ses propres places
+    (``shift_demand_min``/``shift_demand_max``). Les scores du jour sont calculés une
+    fois, puis masqués à chaque créneau pour les agents ayant atteint leur limite de
+    créneaux (``max_daily_shifts``) ou, s'ils ne travaillent pas encore ce jour-là,
+    leur limite hebdomadaire ; un agent peut changer de poste entre deux créneaux.
+    """
+
+    name = "halfday"
+
+    def solve(self, problem: PlanningProblem, time_budget: Optional[float] = None) -> SolverResult:
+        started = time.perf_counter()
+        store = problem.new_store()
+        counters = LoadCounters(store)
+        days = np.flatnonzero(problem.shift_demand_max.any(axis=(1, 2)))
+        self.solve_days(problem, store, counters, days)
+        return SolverResult(store, self.name, shift_objective(problem, store), shift_bound(problem, days),
+                            False, time.perf_counter() - started)
+
+    def solve_days(self, problem, store, counters, days):
+        # Créneaux identiques (mêmes scores, même demande) : solution réutilisée
+        solved: Dict[bytes, List[Tuple[int, int]]] = {}
+        for d in days:
+            # Vue sur les compteurs : les journées ouvertes dans un créneau y sont aussitôt comptées
+            weekly = counters.weekly[:, counters.week_index[d]]
+            static = _shift_static(problem, d)
+            load = WEEKLY_LOAD_BASE - weekly
+            worked = np.zeros(len(problem.agents), dtype=np.int32)
+            for s in np.flatnonzero(problem.shift_demand_max[d].any(axis=0)):
+                allowed = problem.shift_available[:, d, s] & (worked < problem.max_daily_shifts) \
+                    & ((worked > 0) | (weekly < problem.max_weekdays))
+                shift_scores = np.where(allowed[:, None] & (static[s] >= 0),
+                                        static[s] + load[:, None], -1)
+                key = shift_scores.tobytes() + problem.shift_demand_min[d, :, s].tobytes() \
+                    + problem.shift_demand_max[d, :, s].tobytes()
+                if key not in solved:
+                    solved[key] = _match_day(shift_scores, *_shift_slots(problem, d, s))[0]
+                for agent, p in solved[key]:
+                    store.position_grid[agent, d, s] = p + 1
+                    if not worked[agent]:
+                        counters.add(agent, d, p + 1)
+                    worked[agent] += 1
+
+
+SOLVERS[HalfDaySolver.name] = HalfDaySolver
@@ -0,0 +1,43 @@
+# app/backend/planning/holidays.py
+# Jours fériés belges, calculés pour toute année et convertis en masque de jours
+
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import FrozenSet
+
+import numpy as np
+
+from .config import EASTER_HOLIDAY_OFFSETS, FIXED_HOLIDAYS
+
+
+def easter_sunday(year: int) -> date:
+    """Dimanche de Pâques (calendrier grégorien, algorithme de Meeus/Jones/Butcher)"""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month = (h + l - 7 * m + 90) // 25
+    return date(year, month, (h + l - 7 * m + 33 * month + 19) % 32)
+
+
+@lru_cache(maxsize=None)
+def year_holidays(year: int) -> FrozenSet[date]:
+    """Jours fériés d'une année"""
+    easter = easter_sunday(year)
+    return frozenset([date(year, month, day) for month, day in FIXED_HOLIDAYS]
+                     + [easter + timedelta(days=offset) for offset in EASTER_HOLIDAY_OFFSETS])
+
+
+def is_holiday(day: date) -> bool:
+    """Vérifier si une date est un jour férié"""
+    return day in year_holidays(day.year)
+
+
+def holiday_mask(start_date: date, end_date: date) -> np.ndarray:
+    """Jours fériés d'une période (booléens, un par jour)"""
+    holidays = [day.toordinal() for year in range(start_date.year, end_date.year + 1)
+                for day in year_holidays(year)]
+    return np.isin(np.arange(start_date.toordinal(), end_date.toordinal() + 1), holidays)
@@ -0,0 +1,112 @@
+# app/backend/planning/hours.py
+# Durée des horaires et limites d'heures : affectation des horaires avec les postes
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import DEFAULT_BREAK_TIME, DEFAULT_MAX_HOURS_PER_DAY
+from .counters import HourCounters
+from .problem import PlanningProblem
+from .store import AssignmentStore
+
+logger = logging.getLogger(__name__)
+
+# Durée au-delà de toute journée (minutes), pour les agents sans horaire autorisé
+_NO_SCHEDULE = 24 * 60
+
+
+def clock_minutes(value: str) -> int:
+    """Minutes depuis minuit d'une heure "HH:MM" ou "8h30\""""
+    hours, _, minutes = value.strip().lower().replace("h", ":").partition(":")
+    return int(hours) * 60 + int(minutes or 0)
+
+
+def time_range(value: str) -> Tuple[int, int]:
+    """Début et fin (minutes) d'une plage "8h00-16h00" ou "12:00-13:00\""""
+    start, end = value.split("-")
+    return clock_minutes(start), clock_minutes(end)
+
+
+def schedule_minutes(schedules: List[str], agent_info: Dict) -> np.ndarray:
+    """Durée travaillée de chaque horaire pour un agent (minutes, -1 = horaire interdit)
+
+    La pause (``break_time``) est déduite de la partie qu'elle recouvre ; un horaire
+    plus long que ``max_hours_per_day`` ou qui déborde de ``work_hours`` est interdit.
+    """
+    bounds = np.array([time_range(schedule) for schedule in schedules], dtype=np.int32).reshape(-1, 2)
+    starts, ends = bounds[:, 0], bounds[:, 1]
+    break_start, break_end = time_range(agent_info.get("break_time") or DEFAULT_BREAK_TIME)
+    pause = np.clip(np.minimum(ends, break_end) - np.maximum(starts, break_start), 0, None)
+    minutes = ends - starts - pause
+
+    allowed = minutes <= 60 * agent_info.get("max_hours_per_day", DEFAULT_MAX_HOURS_PER_DAY)
+    work_hours = agent_info.get("work_hours")
+    if work_hours:
+        allowed &= (starts >= clock_minutes(work_hours["start"])) & (ends <= clock_minutes(work_hours["end"]))
+    return np.where(allowed, minutes, -1).astype(np.int32)
+
+
+def weekly_day_limit(schedule_minutes: np.ndarray, max_week_minutes: np.ndarray) -> np.ndarray:
+    """Journées par semaine au plus que permet la limite d'heures (horaire le plus court)
+
+    Tenir cette limite garantit qu'un horaire reste disponible pour chaque journée.
+    """
+    allowed = schedule_minutes >= 0
+    shortest = np.where(allowed, schedule_minutes, _NO_SCHEDULE).min(axis=1, initial=_NO_SCHEDULE)
+    return np.where(allowed.any(axis=1), max_week_minutes // np.maximum(shortest, 1), 0).astype(np.int32)
+
+
+def assign_schedules(problem: PlanningProblem, store: AssignmentStore, worked: Optional[np.ndarray] = None,
+                     history: Optional[np.ndarray] = None) -> int:
+    """Affecter un horaire à chaque journée travaillée qui n'en a pas, en un passage
+
+    Les jours sont parcourus dans l'ordre avec le total d'heures de la semaine de
+    chaque agent (``HourCounters``) : un horaire n'est retenu que s'il laisse de quoi
+    tenir, à l'horaire le plus court, les journées restant à pourvoir dans la
+    semaine. Parmi les horaires possibles, l'agent reçoit celui qu'il a le moins
+    tenu, à égalité par rotation décalée d'un agent à l'autre : les écarts entre
+    horaires d'un même agent restent d'au plus une journée. Le coût est linéaire en
+    jours × agents.
+
+    ``worked`` (agents × jours) remplace les journées à pourvoir (par défaut celles
+    qui ont un poste) ; ``history`` (agents × horaires) ajoute les journées tenues
+    avant la période, pour une rotation équitable d'une période à l'autre. Retourne
+    le nombre d'horaires affectés.
+    """
+    if not problem.schedules or not len(store.agents):
+        return 0
+    counters = HourCounters(store, problem.schedule_minutes, problem.max_week_minutes)
+    if history is not None:
+        counters.by_schedule[:, 1:] += history
+    if worked is None:
+        worked = (store.position_grid > 0).any(axis=2)
+    todo = worked & (store.schedule_grid == 0)
+    agents, days = np.nonzero(todo)
+    left = np.zeros_like(counters.weekly)
+    np.add.at(left, (agents, counters.week_index[days]), 1)
+
+    allowed = problem.schedule_minutes >= 0
+    shortest = np.where(allowed, problem.schedule_minutes, _NO_SCHEDULE).min(axis=1).astype(np.int64)
+    n_schedules = len(problem.schedules)
+    assigned = missing = 0
+    for d in np.flatnonzero(todo.any(axis=0)):
+        agents = np.flatnonzero(todo[:, d])
+        week = counters.week_index[d]
+        left[agents, week] -= 1
+        budget = problem.max_week_minutes[agents] - counters.weekly[agents, week] - left[agents, week] * shortest[agents]
+        minutes = problem.schedule_minutes[agents]
+        fits = (minutes >= 0) & (minutes <= budget[:, None])
+        rank = counters.by_schedule[agents, 1:].astype(np.int64) * n_schedules \
+            + (np.arange(n_schedules)[None, :] - agents[:, None] - d) % n_schedules
+        choice = np.argmin(np.where(fits, rank, np.iinfo(np.int64).max), axis=1)
+        ok = fits[np.arange(len(agents)), choice]
+        for agent, code in zip(agents[ok], choice[ok] + 1):
+            store.schedule_grid[agent, d] = code
+            counters.add(int(agent), int(d), int(code))
+        assigned += int(ok.sum())
+        missing += int((~ok).sum())
+    if missing:
+        logger.warning(f"⚠️ {missing} journée(s) sans horaire compatible avec les limites d'heures")
+    return assigned
@@ -0,0 +1,83 @@
+# app/backend/planning/hungarian.py
+# Affectation de coût minimal (algorithme hongrois, chemins augmentants les plus courts)
+
+from typing import Tuple
+
+import numpy as np
+
+
+def linear_sum_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Résoudre le problème d'affectation de coût minimal sur une matrice rectangulaire
+
+    Retourne (lignes, colonnes) comme ``scipy.optimize.linear_sum_assignment`` :
+    min(n_lignes, n_colonnes) couples, triés par ligne. Complexité O(n² · m),
+    la boucle interne sur les colonnes étant vectorisée.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.ndim != 2:
+        raise ValueError("La matrice de coût doit être à deux dimensions")
+    if cost.size == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+
+    # Potentiels des lignes (u) et des colonnes (v), colonne 0 fictive
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.intp)  # ligne (1..n) affectée à chaque colonne, 0 = libre
+    way = np.zeros(m + 1, dtype=np.intp)
+
+    # Potentiels initiaux réalisables (minimum de chaque ligne, v reste nul pour le cas
+    # rectangulaire) et couplage glouton sur les arêtes serrées : seules les lignes
+    # restées libres passent par la recherche de chemins augmentants
+    u[1:] = cost.min(axis=1)
+    tight = cost == u[1:, None]
+    free_rows = []
+    for i in range(1, n + 1):
+        candidates = np.flatnonzero(tight[i - 1] & (match[1:] == 0))
+        if candidates.size:
+            match[candidates[0] + 1] = i
+        else:
+            free_rows.append(i)
+
+    for i in free_rows:
+        match[0] = i
+        j0 = 0
+        min_reduced = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            improved = free & (reduced < min_reduced[1:])
+            min_reduced[1:][improved] = reduced[improved]
+            way[1:][improved] = j0
+
+            candidates = np.where(free, min_reduced[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+
+            u[match[used]] += delta
+            v[used] -= delta
+            min_reduced[1:][free] -= delta
+
+            j0 = j1
+            if match[j0] == 0:
+                break
+
+        # Remonter le chemin augmentant
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    cols = np.flatnonzero(match[1:])
+    rows = match[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
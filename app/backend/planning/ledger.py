@@ -0,0 +1,94 @@
+# app/backend/planning/ledger.py
+# Registre d'équité : journées cumulées par agent et par poste, horaire et jour de la semaine
+
+import logging
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .repository import _get_db, resolve_user_ids
+from .store import position_code
+
+logger = logging.getLogger(__name__)
+
+# Élément compté par type d'entrée du registre (expression sur une ligne de la table planning)
+_ITEMS = {
+    "position": "position_id",
+    "schedule": "schedule",
+    "weekday": "CAST((CAST(strftime('%w', date) AS INTEGER) + 6) % 7 AS TEXT)",
+}
+
+
+def user_filter(user_ids: Optional[Iterable[int]]) -> Tuple[str, tuple]:
+    """Condition SQL ``AND user_id IN (...)`` et ses paramètres (aucune condition si ``user_ids`` est None)"""
+    if user_ids is None:
+        return "", ()
+    user_ids = tuple(user_ids)
+    return f" AND user_id IN ({', '.join('?' * len(user_ids))})", user_ids
+
+
+def ledger_queries(start_date: date, end_date: date, sign: int,
+                   user_ids: Optional[Iterable[int]] = None) -> List[Tuple[str, tuple]]:
+    """Requêtes qui ajoutent (``sign`` = 1) ou retirent (-1) au registre les journées d'une période
+
+    Retirer les journées de la période avant de réécrire ses lignes de planning, puis
+    les ajouter après, dans la même transaction, applique exactement la différence.
+    ``user_ids`` limite le décompte aux agents dont les lignes sont réécrites.
+    """
+    sign = 1 if sign > 0 else -1
+    users, user_params = user_filter(user_ids)
+    return [(f"""
+        INSERT INTO fairness_ledger (user_id, kind, item, days)
+        SELECT user_id, '{kind}', {item}, {sign} * COUNT(DISTINCT date)
+        FROM planning
+        WHERE date BETWEEN ? AND ? AND status != 'cancelled' AND user_id IS NOT NULL
+              AND {item} IS NOT NULL AND {item} != ''{users}
+        GROUP BY user_id, {item}
+        ON CONFLICT (user_id, kind, item) DO UPDATE SET days = days + excluded.days
+    """, (start_date.isoformat(), end_date.isoformat(), *user_params)) for kind, item in _ITEMS.items()]
+
+
+class FairnessLedger:
+    """Journées cumulées par agent et par poste, horaire et jour de la semaine
+
+    La table fairness_ledger est tenue à jour par différences à chaque écriture du
+    planning (``repository.save_result``) : la lire ne coûte qu'une ligne par agent et
+    par élément, quelle que soit la longueur de l'historique.
+    """
+
+    def __init__(self, db=None):
+        self.db = db
+
+    def counts(self, agents: List[str], kind: str, items: List[str]) -> np.ndarray:
+        """Journées tenues par agent et par élément (agents × éléments)"""
+        db = _get_db(self.db)
+        counts = np.zeros((len(agents), len(items)), dtype=np.int32)
+        user_ids = resolve_user_ids(agents, db)
+        agent_rows = {user_ids[agent]: a for a, agent in enumerate(agents) if agent in user_ids}
+        columns = {item: i for i, item in enumerate(items)}
+        for row in db.execute_query("SELECT user_id, item, days FROM fairness_ledger WHERE kind = ?", (kind,)):
+            a, i = agent_rows.get(row["user_id"]), columns.get(row["item"])
+            if a is not None and i is not None:
+                counts[a, i] = row["days"]
+        return counts
+
+    def positions(self, agents: List[str], positions: List[str]) -> np.ndarray:
+        """Journées par agent et par poste (agents × postes)"""
+        return self.counts(agents, "position", [position_code(position) for position in positions])
+
+    def schedules(self, agents: List[str], schedules: List[str]) -> np.ndarray:
+        """Journées par agent et par horaire (agents × horaires)"""
+        return self.counts(agents, "schedule", list(schedules))
+
+    def weekdays(self, agents: List[str]) -> np.ndarray:
+        """Journées par agent et par jour de la semaine (agents × 7, lundi = 0)"""
+        return self.counts(agents, "weekday", [str(weekday) for weekday in range(7)])
+
+    def rebuild(self):
+        """Recalculer tout le registre depuis la table planning (initialisation ou réparation)"""
+        db = _get_db(self.db)
+        queries = [("DELETE FROM fairness_ledger", ())] + ledger_queries(date.min, date.max, 1)
+        if not db.execute_transaction(queries):
+            raise RuntimeError("Échec du recalcul du registre d'équité")
+        logger.info("✅ Registre d'équité recalculé depuis la table planning")
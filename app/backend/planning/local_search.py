@@ -0,0 +1,221 @@
+# app/backend/planning/local_search.py
+# Amélioration locale d'un planning (recuit simulé, évaluation incrémentale)
+
+import logging
+import math
+import random
+import time
+from typing import Optional
+
+import numpy as np
+
+from .config import DAY_SHIFTS, SHIFTS
+from .problem import WEEKLY_LOAD_BASE, PlanningProblem
+from .solvers import SolverResult, relaxed_bound
+from .store import AssignmentStore
+
+logger = logging.getLogger(__name__)
+
+_DAY_SHIFTS = [SHIFTS.index(shift) for shift in DAY_SHIFTS]
+
+
+class LocalSearch:
+    """Recuit simulé sur les affectations journalières d'un planning existant
+
+    Quatre voisinages, chacun évalué par différence (jamais de recalcul complet) :
+    changer le poste d'un agent (ou le retirer / l'ajouter), échanger les postes
+    de deux agents le même jour, transférer une affectation à un agent libre ce
+    jour-là, et déplacer la journée d'un agent vers un autre jour de la même
+    semaine (utile quand les limites hebdomadaires sont atteintes). L'objectif est
+    celui de ``PlanningProblem.objective`` ; la meilleure solution rencontrée est
+    conservée.
+    """
+
+    def __init__(self, problem: PlanningProblem, seed: int = 0,
+                 start_temperature: float = 20.0, end_temperature: float = 0.5):
+        self.problem = problem
+        self.seed = seed
+        self.start_temperature = start_temperature
+        self.end_temperature = end_temperature
+
+    def improve(self, store: AssignmentStore, time_budget: Optional[float] = None,
+                max_iterations: Optional[int] = None) -> SolverResult:
+        """Améliorer un planning sur place
+
+        À graine et nombre d'itérations fixés (sans budget de temps), le résultat est
+        reproductible ; avec un budget de temps, la température suit le temps écoulé.
+        """
+        if time_budget is None and max_iterations is None:
+            raise ValueError("Un budget de temps ou un nombre d'itérations est requis")
+        started = time.perf_counter()
+        problem = self.problem
+        rng = random.Random(self.seed)
+
+        # État courant : poste par agent et par jour (-1 = libre), occupation et charge
+        assigned = (store.position_grid[:, :, _DAY_SHIFTS[0]].astype(np.intp) - 1).tolist()
+        static = problem.static_scores.tolist()
+        available = problem.available.tolist()
+        max_weekdays = problem.max_weekdays.tolist()
+        week_index = problem.week_index.tolist()
+        demand_min = problem.demand_min.tolist()
+        demand_max = problem.demand_max.tolist()
+        bonus = problem.slot_bonus.tolist()
+        preferred = problem.preferred.tolist()
+        day_preferences = problem.day_preferences.tolist()
+        stability = problem.stability_weight
+        n_agents, n_positions = problem.static_scores.shape
+        weeks = [week.tolist() for week in problem.weeks()]
+        open_days = [d for week in weeks for d in week]
+        week_days = {week_index[week[0]]: week for week in weeks}
+        # Postes autorisés par agent (tirage parmi eux plutôt que parmi tous les postes)
+        eligible = [[p for p in range(problem.static_scores.shape[1]) if static[a][p] >= 0]
+                    for a in range(len(static))]
+        if not open_days or not n_agents:
+            objective = problem.objective(store)
+            return SolverResult(store, "local_search", objective, objective, False, 0.0)
+        bound = relaxed_bound(problem, np.array(open_days, dtype=np.intp))
+
+        count = [[0] * n_positions for _ in range(problem.n_days)]
+        weekly = [[0] * (week_index[-1] + 1) for _ in range(n_agents)]
+        for a in range(n_agents):
+            for d in range(problem.n_days):
+                p = assigned[a][d]
+                if p >= 0:
+                    count[d][p] += 1
+                    weekly[a][week_index[d]] += 1
+
+        def kept(a, d, p):
+            """Gains propres à la journée : stabilité si l'agent a tient le poste p, préférence du jour d"""
+            return (stability if preferred[a][d] == p else 0) + day_preferences[a][d]
+
+        def remove_delta(a, d, p):
+            """Variation de l'objectif si l'agent a quitte le poste p le jour d"""
+            return (-static[a][p] - kept(a, d, p) - (bonus[p] if count[d][p] <= demand_min[d][p] else 0)
+                    - (WEEKLY_LOAD_BASE - weekly[a][week_index[d]] + 1))
+
+        def add_delta(a, d, p):
+            """Variation de l'objectif si l'agent a libre prend le poste p le jour d (None si interdit)"""
+            if (static[a][p] < 0 or not available[a][d] or count[d][p] >= demand_max[d][p]
+                    or weekly[a][week_index[d]] >= max_weekdays[a]):
+                return None
+            return (static[a][p] + kept(a, d, p) + (bonus[p] if count[d][p] < demand_min[d][p] else 0)
+                    + WEEKLY_LOAD_BASE - weekly[a][week_index[d]])
+
+        def apply(a, d, old, new):
+            if old >= 0:
+                count[d][old] -= 1
+                weekly[a][week_index[d]] -= 1
+            if new >= 0:
+                count[d][new] += 1
+                weekly[a][week_index[d]] += 1
+            assigned[a][d] = new
+
+        current = problem.objective(store)
+        best = current
+        best_assigned = [row[:] for row in assigned]
+        deadline = started + time_budget if time_budget is not None else None
+        iteration = 0
+        temperature = self.start_temperature
+        cooling = None
+        if max_iterations:
+            cooling = (self.end_temperature / self.start_temperature) ** (1.0 / max_iterations)
+
+        while max_iterations is None or iteration < max_iterations:
+            if deadline is not None and iteration % 256 == 0:
+                now = time.perf_counter()
+                if now > deadline:
+                    break
+                if cooling is None:
+                    progress = (now - started) / time_budget
+                    temperature = self.start_temperature * (self.end_temperature / self.start_temperature) ** progress
+            iteration += 1
+            if cooling is not None:
+                temperature *= cooling
+
+            d = open_days[rng.randrange(len(open_days))]
+            a = rng.randrange(n_agents)
+            old = assigned[a][d]
+            move = rng.random()
+
+            if move < 0.3:
+                # Changer de poste, prendre un poste ou se libérer
+                options = eligible[a]
+                choice = rng.randrange(len(options) + 1)
+                new = options[choice] if choice < len(options) else -1
+                if new == old:
+                    continue
+                delta = 0
+                if old >= 0:
+                    delta += remove_delta(a, d, old)
+                    apply(a, d, old, -1)
+                if new >= 0:
+                    gain = add_delta(a, d, new)
+                    if gain is None:
+                        if old >= 0:
+                            apply(a, d, -1, old)
+                        continue
+                    delta += gain
+                    apply(a, d, -1, new)
+                if not self._accept(delta, temperature, rng):
+                    if new >= 0:
+                        apply(a, d, new, -1)
+                    if old >= 0:
+                        apply(a, d, -1, old)
+                    continue
+            elif move < 0.6:
+                # Déplacer la journée de l'agent vers un autre jour libre de la semaine
+                days = week_days[week_index[d]]
+                target = days[rng.randrange(len(days))]
+                if old < 0 or target == d or assigned[a][target] >= 0:
+                    continue
+                new = eligible[a][rng.randrange(len(eligible[a]))]
+                delta = remove_delta(a, d, old)
+                apply(a, d, old, -1)
+                gain = add_delta(a, target, new)
+                if gain is None or not self._accept(delta + gain, temperature, rng):
+                    apply(a, d, -1, old)
+                    continue
+                delta += gain
+                apply(a, target, -1, new)
+            elif move < 0.8:
+                # Échanger les postes de deux agents le même jour
+                b = rng.randrange(n_agents)
+                other = assigned[b][d]
+                if b == a or old < 0 or other < 0 or old == other:
+                    continue
+                if static[a][other] < 0 or static[b][old] < 0:
+                    continue
+                delta = (static[a][other] + static[b][old] - static[a][old] - static[b][other]
+                         + kept(a, d, other) + kept(b, d, old) - kept(a, d, old) - kept(b, d, other))
+                if not self._accept(delta, temperature, rng):
+                    continue
+                assigned[a][d], assigned[b][d] = other, old
+            else:
+                # Transférer l'affectation de a à un agent libre ce jour-là
+                b = rng.randrange(n_agents)
+                if b == a or old < 0 or assigned[b][d] >= 0:
+                    continue
+                delta = remove_delta(a, d, old)
+                apply(a, d, old, -1)
+                gain = add_delta(b, d, old)
+                if gain is None or not self._accept(delta + gain, temperature, rng):
+                    apply(a, d, -1, old)
+                    continue
+                delta += gain
+                apply(b, d, -1, old)
+
+            current += delta
+            if current > best:
+                best = current
+                best_assigned = [row[:] for row in assigned]
+
+        codes = np.array(best_assigned, dtype=store.position_grid.dtype) + 1
+        store.position_grid[:, :, _DAY_SHIFTS] = codes[:, :, None]
+        elapsed = time.perf_counter() - started
+        logger.info(f"🔁 Recherche locale : {iteration} itérations, objectif {best} en {elapsed:.3f}s")
+        return SolverResult(store, "local_search", best, bound, False, elapsed)
+
+    @staticmethod
+    def _accept(delta: int, temperature: float, rng: random.Random) -> bool:
+        """Critère de Metropolis : toujours accepter une amélioration"""
+        return delta >= 0 or rng.random() < math.exp(delta / temperature)
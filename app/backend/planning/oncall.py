@@ -0,0 +1,70 @@
+# app/backend/planning/oncall.py
+# Rotation des astreintes de week-end et de jours fériés, en un passage sur la période
+
+import logging
+from datetime import date
+from typing import Optional
+
+import numpy as np
+
+from .holidays import holiday_mask
+
+logger = logging.getLogger(__name__)
+
+
+def oncall_days(start_date: date, end_date: date, holidays: bool = True) -> np.ndarray:
+    """Jours d'astreinte d'une période : samedis, dimanches et, si demandé, jours fériés"""
+    weekdays = (np.arange(start_date.toordinal(), end_date.toordinal() + 1) + 6) % 7
+    covered = weekdays >= 5
+    if holidays:
+        covered |= holiday_mask(start_date, end_date)
+    return covered
+
+
+def oncall_rotation(covered: np.ndarray, available: np.ndarray, history: Optional[np.ndarray] = None) -> np.ndarray:
+    """Agent d'astreinte de chaque jour (indice d'agent, -1 = aucun ou jour sans astreinte)
+
+    Les jours d'astreinte consécutifs (un week-end, un pont férié) forment un bloc
+    confié à un seul agent, disponible (``available``, agents × jours) sur tout le
+    bloc. Chaque bloc va à l'agent qui a le moins de journées d'astreinte (``history``
+    avant la période, puis celles déjà données), à égalité à celui qui l'a tenue le
+    moins récemment, puis par rotation : un tour complet de l'équipe avant qu'un
+    agent ne reprenne. Un bloc que personne ne peut tenir entier est réparti jour par
+    jour. Un seul passage sur les blocs, chacun en O(agents).
+    """
+    n_agents, n_days = available.shape
+    assignee = np.full(n_days, -1, dtype=np.int32)
+    days = np.flatnonzero(covered)
+    if not n_agents or not len(days):
+        return assignee
+
+    # Blocs de jours consécutifs et disponibilité de chaque agent sur tout le bloc
+    starts = np.flatnonzero(np.diff(days, prepend=-2) > 1)
+    whole_block = np.logical_and.reduceat(available[:, days], starts, axis=1)
+    ends = np.append(starts[1:], len(days))
+
+    counts = np.zeros(n_agents, dtype=np.int64) if history is None else np.asarray(history, dtype=np.int64).copy()
+    last_block = np.full(n_agents, -1, dtype=np.int64)
+    order = np.arange(n_agents)
+    worst = np.iinfo(np.int64).max
+    missing = 0
+
+    def pick(eligible: np.ndarray, b: int) -> int:
+        rank = (counts * (len(starts) + 1) + last_block + 1) * n_agents + (order - b) % n_agents
+        return int(np.argmin(np.where(eligible, rank, worst)))
+
+    for b, (first, stop) in enumerate(zip(starts, ends)):
+        block = days[first:stop]
+        parts = [block] if whole_block[:, b].any() else [block[i:i + 1] for i in range(len(block))]
+        for part in parts:
+            eligible = available[:, part].all(axis=1)
+            if not eligible.any():
+                missing += len(part)
+                continue
+            agent = pick(eligible, b)
+            assignee[part] = agent
+            counts[agent] += len(part)
+            last_block[agent] = b
+    if missing:
+        logger.warning(f"⚠️ {missing} journée(s) d'astreinte sans agent disponible")
+    return assignee
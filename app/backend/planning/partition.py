@@ -0,0 +1,168 @@
+# app/backend/planning/partition.py
+# Résolution parallèle par blocs de semaines, avec rééquilibrage entre semaines
+
+import logging
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .config import DAY_SHIFTS, PARTITION_TIME_BUDGET, SHIFTS
+from .counters import LoadCounters
+from .pool import default_workers, run_tasks, worker_problem, worker_stopped
+from .problem import PlanningProblem
+from .solvers import SOLVERS, ExactSolver, PlanningSolver, SolverResult, relaxed_bound
+from .store import AssignmentStore
+
+logger = logging.getLogger(__name__)
+
+_DAY_SHIFTS = [SHIFTS.index(shift) for shift in DAY_SHIFTS]
+
+
+def _solve_block(method: str, weeks: List[np.ndarray], deadline: Optional[float],
+                 problem: Optional[PlanningProblem] = None) -> Optional[Tuple[np.ndarray, int, bool]]:
+    """Résoudre un bloc de semaines : (postes agents × jours du bloc, borne, optimal)
+
+    ``deadline`` est une heure absolue (time.time()). Appelée dans un processus du
+    pool, la fonction lit le problème partagé.
+    """
+    if problem is None:
+        if worker_stopped():
+            return None
+        problem = worker_problem()
+    days = np.concatenate(weeks)
+    store = problem.new_store()
+    counters = LoadCounters(store)
+    solver = SOLVERS[method]()
+    if isinstance(solver, ExactSolver):
+        local_deadline = None if deadline is None else time.perf_counter() + deadline - time.time()
+        bound, optimal = solver.solve_weeks(problem, store, counters, weeks, local_deadline)
+    else:
+        solver.solve_days(problem, store, counters, days)
+        bound, optimal = relaxed_bound(problem, days), False
+    return store.position_grid[:, days, _DAY_SHIFTS[0]], bound, optimal
+
+
+def reconcile_fairness(problem: PlanningProblem, store: AssignmentStore) -> int:
+    """Rééquilibrer les cumuls entre semaines sans dégrader l'objectif
+
+    Les blocs étant résolus séparément, les mêmes agents reçoivent les mêmes postes
+    chaque semaine. Ce passage parcourt les jours et applique deux mouvements de
+    variation d'objectif nulle ou positive : transférer une journée à un agent libre
+    ayant travaillé moins sur la période, et échanger les postes de deux agents du
+    jour pour réduire la concentration agent × poste. Retourne le nombre de mouvements.
+    """
+    codes = store.position_grid[:, :, _DAY_SHIFTS[0]].astype(np.intp)
+    n_agents, n_positions = problem.static_scores.shape
+    if n_agents < 2:
+        return 0
+    days_worked = np.count_nonzero(codes, axis=1)
+    by_position = np.zeros((n_agents, n_positions + 1), dtype=np.int64)
+    np.add.at(by_position, (np.repeat(np.arange(n_agents), codes.shape[1]), codes.ravel()), 1)
+    by_position[:, 0] = 0
+    weekly = np.zeros((n_agents, int(problem.week_index[-1]) + 1), dtype=np.int64)
+    agents, days = np.nonzero(codes)
+    np.add.at(weekly, (agents, problem.week_index[days]), 1)
+
+    moves = 0
+    for week in problem.weeks():
+        w = problem.week_index[week[0]]
+        for d in week:
+            static = problem.day_static(d)
+            # Transferts : une journée passe à un agent libre, éligible, ayant moins travaillé ;
+            # le terme de charge ne baisse pas si l'agent libre a moins travaillé cette semaine
+            free = (codes[:, d] == 0) & problem.available[:, d] & (weekly[:, w] < problem.max_weekdays)
+            for a in np.flatnonzero(codes[:, d]):
+                p = codes[a, d] - 1
+                candidates = free & (static[:, p] >= static[a, p]) & (weekly[:, w] < weekly[a, w]) \
+                    & (days_worked < days_worked[a] - 1)
+                if not candidates.any():
+                    continue
+                b = int(np.flatnonzero(candidates)[days_worked[candidates].argmin()])
+                codes[b, d], codes[a, d] = p + 1, 0
+                days_worked[a] -= 1
+                days_worked[b] += 1
+                weekly[a, w] -= 1
+                weekly[b, w] += 1
+                by_position[a, p + 1] -= 1
+                by_position[b, p + 1] += 1
+                free[b] = False
+                moves += 1
+
+            # Échanges : deux agents du jour permutent leurs postes à score égal
+            working = np.flatnonzero(codes[:, d])
+            if len(working) < 2:
+                continue
+            positions = codes[working, d] - 1
+            current = static[working, positions]
+            swapped = static[np.ix_(working, positions)]  # swapped[i, j] : agent i au poste de j
+            neutral = (swapped >= 0) & (swapped.T >= 0) \
+                & (swapped + swapped.T >= current[:, None] + current[None, :])
+            counts = by_position[working][:, positions + 1]  # counts[i, j] : agent i au poste de j
+            own = np.diag(counts)
+            # Variation de Σ cumul² pour l'échange (i, j) : i quitte son poste pour celui de j
+            change = 2 * (counts + counts.T - own[:, None] - own[None, :]) + 4
+            change[~neutral] = 0
+            np.fill_diagonal(change, 0)
+            i, j = np.unravel_index(change.argmin(), change.shape)
+            if change[i, j] < 0:
+                a, b = working[i], working[j]
+                p, q = positions[i], positions[j]
+                codes[a, d], codes[b, d] = q + 1, p + 1
+                by_position[a, p + 1] -= 1
+                by_position[a, q + 1] += 1
+                by_position[b, q + 1] -= 1
+                by_position[b, p + 1] += 1
+                moves += 1
+
+    store.position_grid[:, :, _DAY_SHIFTS] = codes.astype(store.position_grid.dtype)[:, :, None]
+    return moves
+
+
+class WeekPartitionSolver(PlanningSolver):
+    """Découpage de la période en blocs de semaines résolus en parallèle
+
+    Les limites et la charge hebdomadaires repartent chaque lundi : les blocs sont
+    indépendants pour l'objectif. Chaque bloc est résolu par ``block_method`` dans
+    un processus du pool (problème partagé, sérialisé une fois), puis un passage de
+    rééquilibrage répartit les cumuls entre agents sans dégrader l'objectif.
+    """
+
+    name = "partitioned"
+
+    def __init__(self, block_method: str = "exact", block_weeks: int = 4,
+                 max_workers: Optional[int] = None):
+        self.block_method = block_method
+        self.block_weeks = block_weeks
+        self.max_workers = max_workers
+
+    def solve(self, problem: PlanningProblem, time_budget: Optional[float] = None) -> SolverResult:
+        started = time.perf_counter()
+        weeks = problem.weeks()
+        blocks = [weeks[i:i + self.block_weeks] for i in range(0, len(weeks), self.block_weeks)]
+        max_workers = self.max_workers or default_workers(len(blocks))
+        time_budget = time_budget if time_budget is not None else PARTITION_TIME_BUDGET
+        deadline = time.time() + time_budget
+        store = problem.new_store()
+
+        solved = zip(blocks, run_tasks(problem, max_workers, _solve_block,
+                                       [(self.block_method, block, deadline) for block in blocks]))
+
+        bound = 0
+        optimal = True
+        for block, (codes, block_bound, block_optimal) in solved:
+            days = np.concatenate(block)
+            for shift in _DAY_SHIFTS:
+                store.position_grid[:, days, shift] = codes
+            bound += block_bound
+            optimal &= block_optimal
+
+        moves = reconcile_fairness(problem, store)
+        objective = problem.objective(store)
+        elapsed = time.perf_counter() - started
+        logger.info(f"🧱 {len(blocks)} bloc(s) sur {max_workers} processus, {moves} mouvement(s) de rééquilibrage")
+        return SolverResult(store, f"{self.name}:{self.block_method}", objective,
+                            objective if optimal else bound, optimal, elapsed)
+
+
+SOLVERS[WeekPartitionSolver.name] = WeekPartitionSolver
@@ -0,0 +1,92 @@
+# app/backend/planning/pool.py
+# Pool de processus partageant un problème sérialisé une seule fois
+
+import logging
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .config import POOL_START_METHODS
+from .problem import PlanningProblem
+
+logger = logging.getLogger(__name__)
+
+# Problème partagé par les processus du pool (désérialisé une seule fois par processus)
+_worker_problem: Optional[PlanningProblem] = None
+_worker_stop = None
+
+# Erreurs d'un pool dont les processus ne démarrent pas ou s'arrêtent (exécutable figé, ressources)
+POOL_ERRORS = (BrokenProcessPool, OSError, EOFError, pickle.PicklingError)
+
+
+def _init_worker(payload: bytes, stop_event):
+    """Initialiser un processus du pool avec le problème sérialisé"""
+    global _worker_problem, _worker_stop
+    _worker_problem = pickle.loads(payload)
+    _worker_stop = stop_event
+
+
+def worker_problem() -> PlanningProblem:
+    """Problème partagé, côté processus du pool"""
+    return _worker_problem
+
+
+def worker_stopped() -> bool:
+    """Vérifier, côté processus du pool, si le résultat n'est plus attendu"""
+    return _worker_stop.is_set()
+
+
+def default_workers(n_tasks: int) -> int:
+    """Nombre de processus : un par tâche, au plus un par cœur"""
+    return max(1, min(n_tasks, os.cpu_count() or 1))
+
+
+def pool_context():
+    """Contexte de démarrage explicite des processus (``POOL_START_METHODS``)"""
+    available = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(next(method for method in POOL_START_METHODS if method in available))
+
+
+def create_pool(problem: PlanningProblem, max_workers: int) -> Tuple[ProcessPoolExecutor, object]:
+    """Créer un pool dont chaque processus reçoit le problème à l'initialisation
+
+    Le problème est sérialisé une seule fois ; les tâches ne transportent que leurs
+    paramètres. Retourne le pool et l'événement d'arrêt partagé.
+    """
+    payload = pickle.dumps(problem, protocol=pickle.HIGHEST_PROTOCOL)
+    context = pool_context()
+    stop_event = context.Event()
+    pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                               initializer=_init_worker, initargs=(payload, stop_event))
+    return pool, stop_event
+
+
+def run_tasks(problem: PlanningProblem, max_workers: int, function: Callable,
+              tasks: Sequence[tuple]) -> List:
+    """Exécuter ``function(*task, problem=...)`` pour chaque tâche, en parallèle si possible
+
+    Les résultats suivent l'ordre des tâches. Avec un seul processus, ou si le pool
+    ne peut pas démarrer ou s'interrompt (exécutable figé sans ``freeze_support``,
+    ressources épuisées), les tâches sont calculées dans le processus courant.
+    """
+    if max_workers > 1 and len(tasks) > 1:
+        try:
+            pool, stop_event = create_pool(problem, max_workers)
+        except POOL_ERRORS as e:
+            logger.warning(f"⚠️ Pool de processus indisponible ({e}), calcul dans le processus courant")
+        else:
+            try:
+                futures = {pool.submit(function, *task): i for i, task in enumerate(tasks)}
+                results = [None] * len(tasks)
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                return results
+            except POOL_ERRORS as e:
+                logger.warning(f"⚠️ Pool de processus interrompu ({e}), calcul dans le processus courant")
+            finally:
+                stop_event.set()
+                pool.shutdown(wait=False, cancel_futures=True)
+    return [function(*task, problem=problem) for task in tasks]
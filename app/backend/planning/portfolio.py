@@ -0,0 +1,135 @@
+# app/backend/planning/portfolio.py
+# Portefeuille de stratégies exécutées en parallèle sur plusieurs processus
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import PORTFOLIO_TIME_BUDGET
+from .local_search import LocalSearch
+from .pool import POOL_ERRORS, create_pool, default_workers, worker_problem, worker_stopped
+from .problem import PlanningProblem
+from .solvers import SOLVERS, PlanningSolver, SolverResult
+
+logger = logging.getLogger(__name__)
+
+# Stratégies du portefeuille : (méthode de départ, options de recherche locale ou None),
+# les plus rapides en premier quand il y a moins de processus que de stratégies
+DEFAULT_STRATEGIES = [
+    ("hungarian", None),
+    ("exact", None),
+    ("hungarian", {"seed": 1, "start_temperature": 20.0}),
+    ("greedy", {"seed": 2, "start_temperature": 50.0}),
+    ("hungarian", {"seed": 3, "start_temperature": 5.0}),
+    ("greedy", None),
+]
+
+# Marge réservée au retour des résultats vers le processus principal (secondes)
+RESULT_MARGIN = 0.2
+
+
+def _run_strategy(method: str, options: Optional[Dict],
+                  deadline: float) -> Optional[Tuple[np.ndarray, int, int, bool]]:
+    """Exécuter une stratégie dans un processus du pool : (grille des postes, objectif, borne, optimal)
+
+    ``deadline`` est une heure absolue (time.time()) : une tâche démarrée tard ne
+    dispose que du temps restant. Rien n'est calculé si le portefeuille est arrêté.
+    """
+    if worker_stopped():
+        return None
+    problem = worker_problem()
+    result = SOLVERS[method]().solve(problem, max(deadline - time.time(), 0.0))
+    if options is not None and not result.optimal:
+        remaining = max(deadline - time.time(), 0.0)
+        improved = LocalSearch(problem, **options).improve(result.store, time_budget=remaining)
+        result = SolverResult(improved.store, result.solver, improved.objective,
+                              min(result.bound, improved.bound), False, 0.0)
+    return result.store.position_grid, result.objective, result.bound, result.optimal
+
+
+class PortfolioSolver(PlanningSolver):
+    """Plusieurs stratégies en parallèle, meilleur planning retenu à l'échéance
+
+    Le problème est sérialisé une seule fois et transmis à l'initialisation de
+    chaque processus ; les tâches ne transportent que le nom de la stratégie.
+    L'objectif commun est ``PlanningProblem.objective`` ; un optimum prouvé par
+    le solveur exact arrête le portefeuille immédiatement.
+    """
+
+    name = "portfolio"
+
+    def __init__(self, strategies: Optional[List[Tuple[str, Optional[Dict]]]] = None,
+                 max_workers: Optional[int] = None):
+        self.strategies = strategies or DEFAULT_STRATEGIES
+        self.max_workers = max_workers or default_workers(len(self.strategies))
+
+    def solve(self, problem: PlanningProblem, time_budget: Optional[float] = None) -> SolverResult:
+        started = time.perf_counter()
+        time_budget = time_budget if time_budget is not None else PORTFOLIO_TIME_BUDGET
+        deadline = started + time_budget
+        # Avec moins de processus que de stratégies, le budget est découpé en tours successifs
+        usable = max(time_budget - RESULT_MARGIN, 0.0)
+        rounds = -(-len(self.strategies) // self.max_workers)
+        now = time.time()
+
+        best = None
+        bound = None
+        try:
+            pool, stop_event = create_pool(problem, self.max_workers)
+        except POOL_ERRORS as e:
+            logger.warning(f"⚠️ Pool de processus indisponible ({e}), repli sur hungarian")
+            return SOLVERS["hungarian"]().solve(problem)
+        try:
+            futures = {}
+            for i, (method, options) in enumerate(self.strategies):
+                task_deadline = now + usable * (i // self.max_workers + 1) / rounds
+                futures[pool.submit(_run_strategy, method, options, task_deadline)] = (method, options)
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=max(deadline - time.perf_counter(), 0.0),
+                                     return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+                for future in done:
+                    method, options = futures[future]
+                    try:
+                        outcome = future.result()
+                    except POOL_ERRORS as e:
+                        logger.warning(f"⚠️ Pool de processus interrompu ({e})")
+                        pending = set()
+                        break
+                    except Exception as e:
+                        logger.warning(f"⚠️ Stratégie {method} en échec : {e}")
+                        continue
+                    if outcome is None:
+                        continue
+                    grid, objective, strategy_bound, optimal = outcome
+                    label = method if options is None else f"{method}+local_search(seed={options.get('seed', 0)})"
+                    logger.info(f"🧩 {label} : objectif {objective}")
+                    bound = strategy_bound if bound is None else min(bound, strategy_bound)
+                    if best is None or (objective, optimal) > (best[1], best[3]):
+                        best = (grid, objective, label, optimal)
+                # Optimum prouvé (ou borne atteinte) : inutile d'attendre les autres stratégies
+                if best is not None and (best[3] or best[1] >= bound):
+                    break
+        except POOL_ERRORS as e:
+            logger.warning(f"⚠️ Pool de processus interrompu ({e})")
+        finally:
+            stop_event.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if best is None:
+            logger.warning("⚠️ Aucune stratégie terminée avant l'échéance, repli sur hungarian")
+            return SOLVERS["hungarian"]().solve(problem)
+
+        grid, objective, label, optimal = best
+        store = problem.new_store()
+        store.position_grid[...] = grid
+        return SolverResult(store, f"{self.name}:{label}", objective, bound,
+                            optimal or objective >= bound, time.perf_counter() - started)
+
+
+SOLVERS[PortfolioSolver.name] = PortfolioSolver
@@ -0,0 +1,125 @@
+# app/backend/planning/preferences.py
+# Préférences de disponibilité compilées en tenseur agents × jours de la semaine × créneaux
+
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, List
+
+import numpy as np
+
+from .availability import _load_json, user_names
+from .config import (
+    AVAILABILITY_FILE,
+    FLEXIBILITY_WEIGHTS,
+    FRENCH_WEEKDAY_NAMES,
+    SHIFT_HOURS,
+    SHIFTS,
+    USERS_FILE,
+)
+from .hours import clock_minutes
+from .repository import _get_db
+
+logger = logging.getLogger(__name__)
+
+# Nombre de tenseurs compilés (listes d'agents) conservés en mémoire
+_TENSOR_CACHE_SIZE = 16
+
+
+def form_preferences(preferences: Dict) -> np.ndarray:
+    """Gains (jours de la semaine × créneaux) d'un formulaire de préférences de disponibilité
+
+    Les créneaux qui chevauchent la plage horaire préférée, les jours préférés,
+    rapportent le poids de la flexibilité déclarée.
+    """
+    gains = np.zeros((7, len(SHIFTS)), dtype=np.int32)
+    days = [FRENCH_WEEKDAY_NAMES.index(day.lower()) for day in preferences.get("preferred_days", [])
+            if day.lower() in FRENCH_WEEKDAY_NAMES]
+    start = clock_minutes(preferences.get("preferred_start_time", "00:00"))
+    end = clock_minutes(preferences.get("preferred_end_time", "23:59"))
+    shifts = [s for s, shift in enumerate(SHIFTS)
+              if clock_minutes(SHIFT_HOURS[shift][0]) < end and start < clock_minutes(SHIFT_HOURS[shift][1])]
+    gains[np.ix_(days, shifts)] = FLEXIBILITY_WEIGHTS.get(preferences.get("flexibility"), 1)
+    return gains
+
+
+class PreferenceTensor:
+    """Gains de préférence par agent, jour de la semaine et créneau
+
+    Deux sources, la plus forte l'emporte : la table availability_preferences
+    (créneaux cochés par jour, gain (priorité + 1) // 2, soit 1 à 5) et les
+    dernières préférences saisies sur la page « Mes disponibilités »
+    (user_availability.json). Les sources ne sont relues que si leur version change
+    (contenu de la table, date de modification du fichier) ; le tenseur d'une liste
+    d'agents est alors recompilé, sinon repris du cache.
+    """
+
+    def __init__(self, db=None, path: str = AVAILABILITY_FILE, users_path: str = USERS_FILE):
+        self.db = db
+        self.path = path
+        self.users_path = users_path
+        self._version = None
+        self._by_name: Dict[str, np.ndarray] = {}
+        self._compiled: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+
+    @staticmethod
+    def _file_version(path: str):
+        """Date de modification d'un fichier (None s'il n'existe pas)"""
+        return os.stat(path).st_mtime_ns if os.path.exists(path) else None
+
+    def refresh(self) -> bool:
+        """Relire les sources si elles ont changé, retourne True en cas de rechargement"""
+        rows = _get_db(self.db).execute_query("""
+            SELECT u.username, u.first_name, ap.weekday, ap.morning, ap.afternoon, ap.evening, ap.priority,
+                   ap.updated_at
+            FROM availability_preferences ap
+            JOIN users u ON u.id = ap.user_id
+            WHERE u.is_active = 1
+            ORDER BY ap.user_id, ap.weekday
+        """)
+        version = (tuple(tuple(row.values()) for row in rows),
+                   self._file_version(self.path), self._file_version(self.users_path))
+        if version == self._version:
+            return False
+
+        by_name: Dict[str, np.ndarray] = {}
+
+        def gains_for(name: str) -> np.ndarray:
+            return by_name.setdefault(name.casefold(), np.zeros((7, len(SHIFTS)), dtype=np.int32))
+
+        for row in rows:
+            gain = (int(row["priority"] or 5) + 1) // 2
+            shifts = np.array([bool(row[shift]) for shift in SHIFTS])
+            for name in {row.get("username"), row.get("first_name")} - {None, ""}:
+                gains = gains_for(name)
+                gains[row["weekday"] - 1] = np.maximum(gains[row["weekday"] - 1], gain * shifts)
+
+        users = _load_json(self.users_path)
+        for username, data in _load_json(self.path).items():
+            if data.get("availability_preferences"):
+                form = form_preferences(data["availability_preferences"][-1])
+                for name in user_names(username, users):
+                    np.maximum(gains_for(name), form, out=gains_for(name))
+
+        self._by_name = by_name
+        self._compiled.clear()
+        self._version = version
+        logger.info(f"⭐ Préférences de disponibilité chargées pour {len(by_name)} nom(s)")
+        return True
+
+    def compile(self, agents: List[str]) -> np.ndarray:
+        """Tenseur des gains (agents × jours de la semaine × créneaux)"""
+        self.refresh()
+        key = tuple(agents)
+        if key not in self._compiled:
+            zeros = np.zeros((7, len(SHIFTS)), dtype=np.int32)
+            self._compiled[key] = np.stack([self._by_name.get(agent.casefold(), zeros) for agent in agents]) \
+                if agents else np.zeros((0, 7, len(SHIFTS)), dtype=np.int32)
+            while len(self._compiled) > _TENSOR_CACHE_SIZE:
+                self._compiled.popitem(last=False)
+        self._compiled.move_to_end(key)
+        return self._compiled[key]
+
+    def for_period(self, agents: List[str], weekdays: np.ndarray) -> np.ndarray:
+        """Gains sur une période (agents × jours × créneaux) par simple indexation du tenseur"""
+        return self.compile(agents)[:, weekdays]
@@ -0,0 +1,264 @@
+# app/backend/planning/problem.py
+# Données compilées d'une période de planification, partagées par les solveurs
+
+import copy
+import hashlib
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .config import DAY_SHIFTS, SHIFTS
+from .store import AssignmentStore
+
+# Charge hebdomadaire de référence : la k-ième journée de la semaine rapporte (5 - k)
+WEEKLY_LOAD_BASE = 5
+
+
+def load_value(n_days: np.ndarray) -> np.ndarray:
+    """Terme de charge cumulé pour n journées dans la semaine : Σ_{k<n} (5 - k)"""
+    return WEEKLY_LOAD_BASE * n_days - n_days * (n_days - 1) // 2
+
+
+class PlanningProblem:
+    """Matrices NumPy d'une période : scores, disponibilités, limites et demande
+
+    ``static_scores`` (agents × postes, -1 = interdit), ``available`` (agents × jours),
+    ``max_weekdays`` (agents), ``demand_min``/``demand_max`` (jours × postes) et
+    ``slot_bonus`` (postes, bonus par place obligatoire couverte). L'objectif d'un
+    planning est la somme des scores affectés, des bonus de couverture et du terme
+    de charge hebdomadaire. ``preferred`` (agents × jours, -1 = aucun) donne le poste
+    d'un planning de référence : le conserver rapporte ``stability_weight``.
+    ``position_preferences`` (agents × postes) marque les postes préférés des agents.
+    ``shift_demand_min``/``shift_demand_max`` (jours × postes × créneaux) détaillent la
+    demande par demi-journée et ``max_daily_shifts`` (agents) limite les créneaux
+    travaillés par jour ; par défaut, la demande du jour vaut pour chaque créneau de
+    journée.
+    ``absent`` (agents × jours × créneaux) marque les congés et absences approuvés :
+    ``shift_available`` en tient compte créneau par créneau, ``available`` exclut les
+    jours où un créneau de journée manque. ``shift_preferences`` (agents × jours ×
+    créneaux, positif ou nul) est le gain de préférence d'un agent pour travailler sur
+    un créneau ; une journée rapporte la somme de ses créneaux (``day_preferences``).
+    ``schedule_minutes`` (agents × horaires, -1 = interdit) donne la durée travaillée
+    de chaque horaire et ``max_week_minutes`` (agents) la limite d'heures par semaine,
+    tenues lors de l'affectation des horaires (``hours.assign_schedules``).
+    """
+
+    def __init__(self, agents: List[str], start_date: date, end_date: date,
+                 positions: List[str], schedules: List[str],
+                 static_scores: np.ndarray, unavailable: np.ndarray, max_weekdays: np.ndarray,
+                 demand_min: np.ndarray, demand_max: np.ndarray, slot_bonus: np.ndarray,
+                 priority_order: List[Tuple[int, Optional[int]]],
+                 preferred: Optional[np.ndarray] = None, stability_weight: int = 0,
+                 position_preferences: Optional[np.ndarray] = None,
+                 shift_demand_min: Optional[np.ndarray] = None, shift_demand_max: Optional[np.ndarray] = None,
+                 max_daily_shifts: Optional[np.ndarray] = None, absent: Optional[np.ndarray] = None,
+                 shift_preferences: Optional[np.ndarray] = None, schedule_minutes: Optional[np.ndarray] = None,
+                 max_week_minutes: Optional[np.ndarray] = None):
+        self.agents = list(agents)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.positions = list(positions)
+        self.schedules = list(schedules)
+        self.static_scores = static_scores
+        self.max_weekdays = max_weekdays
+        self.demand_min = demand_min
+        self.demand_max = demand_max
+        self.slot_bonus = slot_bonus
+        self.priority_order = priority_order
+
+        n_days = (end_date - start_date).days + 1
+        days = np.arange(n_days)
+        first_weekday = start_date.weekday()
+        self.weekdays = (days + first_weekday) % 7
+        self.week_index = (days + first_weekday) // 7
+        day_shifts = np.isin(SHIFTS, DAY_SHIFTS)
+        self.shift_available = np.repeat(~unavailable[:, self.weekdays, None], len(SHIFTS), axis=2)
+        if absent is not None:
+            self.shift_available &= ~absent
+        self.available = self.shift_available[:, :, day_shifts].all(axis=2)
+        self.preferred = preferred if preferred is not None else np.full((len(self.agents), n_days), -1, dtype=np.int16)
+        self.stability_weight = stability_weight
+        self.position_preferences = position_preferences if position_preferences is not None else np.zeros(
+            static_scores.shape, dtype=bool)
+        self.shift_demand_min = shift_demand_min if shift_demand_min is not None else \
+            demand_min[:, :, None] * day_shifts
+        self.shift_demand_max = shift_demand_max if shift_demand_max is not None else \
+            demand_max[:, :, None] * day_shifts
+        self.max_daily_shifts = max_daily_shifts if max_daily_shifts is not None else np.full(
+            len(self.agents), len(DAY_SHIFTS), dtype=np.int32)
+        self.shift_preferences = shift_preferences if shift_preferences is not None else np.zeros(
+            (len(self.agents), n_days, len(SHIFTS)), dtype=np.int32)
+        self.day_preferences = self.shift_preferences[:, :, day_shifts].sum(axis=2)
+        self.schedule_minutes = schedule_minutes if schedule_minutes is not None else np.zeros(
+            (len(self.agents), len(self.schedules)), dtype=np.int32)
+        self.max_week_minutes = max_week_minutes if max_week_minutes is not None else np.full(
+            len(self.agents), 7 * 24 * 60, dtype=np.int32)
+
+    @property
+    def n_days(self) -> int:
+        return len(self.weekdays)
+
+    def day(self, d: int) -> date:
+        return self.start_date + timedelta(days=int(d))
+
+    def day_static(self, d: int, preferences: Optional[np.ndarray] = None) -> np.ndarray:
+        """Scores fixes du jour d (agents × postes), stabilité et préférence comprises
+
+        ``preferences`` (agents) remplace la préférence de la journée, par exemple
+        celle d'un seul créneau.
+        """
+        preferences = self.day_preferences[:, d] if preferences is None else preferences
+        scores = self.static_scores + np.where(self.static_scores >= 0, preferences[:, None], 0)
+        if self.stability_weight:
+            agents = np.flatnonzero(self.preferred[:, d] >= 0)
+            positions = self.preferred[agents, d].astype(np.intp)
+            scores[agents, positions] += np.where(scores[agents, positions] >= 0, self.stability_weight, 0)
+        return scores
+
+    def split_shifts(self) -> bool:
+        """Vrai si la demande diffère d'un créneau à l'autre (planification par demi-journée utile)"""
+        return bool((self.shift_demand_max != self.shift_demand_max[:, :, :1]).any())
+
+    def new_store(self) -> AssignmentStore:
+        """Stockage vide couvrant la période"""
+        return AssignmentStore(self.agents, self.start_date, self.end_date, self.positions, self.schedules)
+
+    def weeks(self) -> List[np.ndarray]:
+        """Indices des jours ouvrables à planifier, regroupés par semaine (lundi-dimanche)"""
+        open_days = np.flatnonzero(self.demand_max.any(axis=1))
+        return [open_days[self.week_index[open_days] == w] for w in np.unique(self.week_index[open_days])]
+
+    def subset(self, agent_indices: np.ndarray, position_indices: np.ndarray) -> "PlanningProblem":
+        """Sous-problème restreint à des agents et des postes (mêmes dates)"""
+        agent_indices = np.asarray(agent_indices, dtype=np.intp)
+        position_indices = np.asarray(position_indices, dtype=np.intp)
+        agent_map = {int(a): i for i, a in enumerate(agent_indices)}
+        position_map = {int(p): i for i, p in enumerate(position_indices)}
+
+        sub = copy.copy(self)
+        sub.agents = [self.agents[a] for a in agent_indices]
+        sub.positions = [self.positions[p] for p in position_indices]
+        sub.static_scores = self.static_scores[np.ix_(agent_indices, position_indices)]
+        sub.position_preferences = self.position_preferences[np.ix_(agent_indices, position_indices)]
+        sub.available = self.available[agent_indices]
+        sub.shift_available = self.shift_available[agent_indices]
+        sub.shift_preferences = self.shift_preferences[agent_indices]
+        sub.day_preferences = self.day_preferences[agent_indices]
+        # Postes de référence renumérotés ; -1 lit la dernière case, restée à -1
+        position_lookup = np.full(len(self.positions) + 1, -1, dtype=np.int16)
+        position_lookup[position_indices] = np.arange(len(position_indices))
+        sub.preferred = position_lookup[self.preferred[agent_indices]]
+        sub.max_weekdays = self.max_weekdays[agent_indices]
+        sub.demand_min = self.demand_min[:, position_indices]
+        sub.demand_max = self.demand_max[:, position_indices]
+        sub.shift_demand_min = self.shift_demand_min[:, position_indices]
+        sub.shift_demand_max = self.shift_demand_max[:, position_indices]
+        sub.max_daily_shifts = self.max_daily_shifts[agent_indices]
+        sub.schedule_minutes = self.schedule_minutes[agent_indices]
+        sub.max_week_minutes = self.max_week_minutes[agent_indices]
+        sub.slot_bonus = self.slot_bonus[position_indices]
+        sub.priority_order = [(position_map[p], agent_map.get(a) if a is not None else None)
+                              for p, a in self.priority_order if p in position_map]
+        return sub
+
+    def with_absences(self, absent: np.ndarray) -> "PlanningProblem":
+        """Copie du problème où les cellules ``absent`` sont indisponibles
+
+        ``absent`` : agents × jours (journées entières) ou agents × jours × créneaux
+        (demi-journées, comme ``AbsenceIndex.mask``).
+        """
+        changed = copy.copy(self)
+        if absent.ndim == 2:
+            absent = np.broadcast_to(absent[:, :, None], self.shift_available.shape)
+        changed.shift_available = self.shift_available & ~absent
+        changed.available = self.available & ~absent[:, :, np.isin(SHIFTS, DAY_SHIFTS)].any(axis=2)
+        return changed
+
+    def window(self, start: int, stop: int) -> "PlanningProblem":
+        """Sous-problème restreint aux jours d'indices [start, stop)"""
+        sub = copy.copy(self)
+        sub.start_date = self.day(start)
+        sub.end_date = self.day(stop - 1)
+        sub.weekdays = self.weekdays[start:stop]
+        sub.week_index = self.week_index[start:stop] - self.week_index[start]
+        sub.available = self.available[:, start:stop]
+        sub.shift_available = self.shift_available[:, start:stop]
+        sub.shift_preferences = self.shift_preferences[:, start:stop]
+        sub.day_preferences = self.day_preferences[:, start:stop]
+        sub.preferred = self.preferred[:, start:stop]
+        sub.demand_min = self.demand_min[start:stop]
+        sub.demand_max = self.demand_max[start:stop]
+        sub.shift_demand_min = self.shift_demand_min[start:stop]
+        sub.shift_demand_max = self.shift_demand_max[start:stop]
+        return sub
+
+    def fingerprint(self, days: Optional[np.ndarray] = None) -> str:
+        """Empreinte du contenu du problème (même empreinte = même solution)
+
+        Avec ``days`` (jours d'une même semaine), l'empreinte ne porte que sur ces
+        jours et ne dépend pas des dates : une semaine identique décalée dans le
+        calendrier a la même empreinte.
+        """
+        digest = hashlib.sha256()
+        if days is None:
+            calendar = (self.start_date.isoformat(), self.end_date.isoformat())
+            arrays = (self.available, self.demand_min, self.demand_max, self.preferred, self.day_preferences)
+        else:
+            calendar = tuple(int(weekday) for weekday in self.weekdays[days])
+            arrays = (self.available[:, days], self.demand_min[days], self.demand_max[days],
+                      self.preferred[:, days], self.day_preferences[:, days])
+        digest.update(repr((self.agents, self.positions, calendar, self.priority_order,
+                            WEEKLY_LOAD_BASE, self.stability_weight)).encode("utf-8"))
+        for array in (self.static_scores, self.max_weekdays, self.slot_bonus) + arrays:
+            digest.update(str(array.shape).encode("ascii"))
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()
+
+    def objective(self, store: AssignmentStore) -> int:
+        """Valeur de l'objectif d'un planning
+
+        Un planning journalier (même poste sur les créneaux de journée, voir
+        ``AssignmentStore.is_daily``) est noté par journée ; un planning par
+        demi-journée l'est créneau par créneau (``shift_objective``).
+        """
+        if not store.is_daily():
+            return shift_objective(self, store)
+        codes = store.position_grid[:, :, 0].astype(np.intp)
+        agents, days = np.nonzero(codes)
+        positions = codes[agents, days] - 1
+        total = int(self.static_scores[agents, positions].sum())
+        total += self.stability_weight * int(np.count_nonzero(self.preferred[agents, days] == positions))
+        total += int(self.day_preferences[agents, days].sum())
+
+        counts = np.zeros(self.demand_min.shape, dtype=np.int32)
+        np.add.at(counts, (days, positions), 1)
+        total += int((np.minimum(counts, self.demand_min) * self.slot_bonus).sum())
+
+        weekly = np.zeros((len(self.agents), int(self.week_index[-1]) + 1), dtype=np.int64)
+        np.add.at(weekly, (agents, self.week_index[days]), 1)
+        return total + int(load_value(weekly).sum())
+
+
+def shift_objective(problem: PlanningProblem, store: AssignmentStore) -> int:
+    """Objectif d'un planning par demi-journée
+
+    Score fixe (stabilité et préférence du créneau comprises) par créneau
+    travaillé, bonus de couverture par place obligatoire de chaque créneau, terme
+    de charge hebdomadaire sur les journées travaillées (au moins un créneau).
+    """
+    codes = store.position_grid.astype(np.intp)
+    agents, days, shifts = np.nonzero(codes)
+    positions = codes[agents, days, shifts] - 1
+    total = int(problem.static_scores[agents, positions].sum())
+    total += problem.stability_weight * int(np.count_nonzero(problem.preferred[agents, days] == positions))
+    total += int(problem.shift_preferences[agents, days, shifts].sum())
+
+    counts = np.zeros(problem.shift_demand_min.shape, dtype=np.int32)
+    np.add.at(counts, (days, positions, shifts), 1)
+    total += int((np.minimum(counts, problem.shift_demand_min) * problem.slot_bonus[None, :, None]).sum())
+
+    worked_agents, worked_days = np.nonzero(codes.any(axis=2))
+    weekly = np.zeros((len(problem.agents), int(problem.week_index[-1]) + 1), dtype=np.int64)
+    np.add.at(weekly, (worked_agents, problem.week_index[worked_days]), 1)
+    return total + int(load_value(weekly).sum())
@@ -0,0 +1,116 @@
+# app/backend/planning/repair.py
+# Réparation incrémentale d'un planning existant après un changement de disponibilité
+
+import logging
+import time
+from typing import Optional
+
+import numpy as np
+
+from .config import DAY_SHIFTS, SHIFTS
+from .counters import LoadCounters
+from .problem import WEEKLY_LOAD_BASE, PlanningProblem
+from .solvers import HungarianSolver, SolverResult, _assign, _day_slots, _match_day
+from .store import AssignmentStore
+
+logger = logging.getLogger(__name__)
+
+_DAY_SHIFTS = [SHIFTS.index(shift) for shift in DAY_SHIFTS]
+
+
+def repair_plan(problem: PlanningProblem, plan: AssignmentStore, absent: Optional[np.ndarray] = None,
+                pinned: Optional[np.ndarray] = None, days: Optional[np.ndarray] = None) -> SolverResult:
+    """Réparer un planning sans toucher aux affectations non concernées
+
+    ``plan`` couvre les agents et la période de ``problem``. Les affectations
+    devenues impossibles (``absent``, agents × jours ou agents × jours × créneaux,
+    s'ajoute aux indisponibilités du problème) sont retirées : la journée entière si
+    tous ses créneaux travaillés sont perdus, sinon ces seuls créneaux (absence d'une
+    demi-journée, l'horaire est conservé). Sur les jours ``days``, toutes les
+    affectations non épinglées (``pinned``, agents × jours) sont rouvertes. Seules
+    les places ainsi libérées sont recalculées par affectation optimale parmi les
+    agents libres, jour par jour ou créneau par créneau : le coût dépend de
+    l'ampleur du changement, pas de la période. La borne porte sur le meilleur
+    remplissage des places libérées.
+    """
+    started = time.perf_counter()
+    if absent is not None:
+        problem = problem.with_absences(absent)
+    n_agents, n_positions = problem.static_scores.shape
+    pinned = np.zeros((n_agents, problem.n_days), dtype=bool) if pinned is None else pinned
+    store = problem.new_store()
+    store.position_grid[...] = plan.position_grid
+    store.schedule_grid[...] = plan.schedule_grid
+
+    codes = store.position_grid.max(axis=2)
+    worked = store.position_grid > 0
+    lost = worked & ~problem.shift_available
+    # Journée retirée si tous ses créneaux travaillés sont perdus, sinon seulement ces créneaux
+    broken = lost.any(axis=2) & ~(worked & ~lost).any(axis=2)
+    partial = lost & ~broken[:, :, None]
+    removed = broken | partial.any(axis=2)
+    if (removed & pinned).any():
+        logger.warning(f"⚠️ {int((removed & pinned).sum())} affectation(s) épinglée(s) retirée(s) pour absence")
+    reopened = np.zeros_like(broken)
+    if days is not None and len(days):
+        reopened[:, days] = (codes[:, days] > 0) & ~pinned[:, days]
+    store.position_grid[broken] = 0
+    store.schedule_grid[broken] = 0
+    store.position_grid[partial] = 0
+    for shift in _DAY_SHIFTS:
+        store.position_grid[:, :, shift][reopened] = 0
+
+    repair_days = np.union1d(np.flatnonzero((broken | reopened).any(axis=0)),
+                             np.asarray(days if days is not None else [], dtype=np.intp))
+    counters = LoadCounters(store)
+    bound = problem.objective(store)
+    solver = HungarianSolver()
+    for d in repair_days:
+        # Une place dont un seul créneau est libéré reste pourvue ici ; elle est complétée plus bas
+        filled = np.max([np.bincount(store.position_grid[:, d, s].astype(np.intp), minlength=n_positions + 1)[1:]
+                         for s in _DAY_SHIFTS], axis=0)
+        demand_min = np.maximum(problem.demand_min[d] - filled, 0)
+        demand_max = np.maximum(problem.demand_max[d] - filled, 0)
+        if not demand_max.any():
+            continue
+        slots = _day_slots(problem, d, demand_min, demand_max)
+        busy = store.position_grid[:, d].any(axis=1)
+
+        # Borne : agents libres et disponibles avec le gain de charge maximal, sans limite hebdomadaire
+        static = problem.day_static(d)
+        best_scores = np.where(static >= 0, static + WEEKLY_LOAD_BASE, -1)
+        best_scores[busy | ~problem.available[:, d]] = -1
+        bound += _match_day(best_scores, *slots)[1]
+
+        day_scores = solver._day_scores(problem, counters, d)
+        day_scores[busy] = -1
+        for agent, p in _match_day(day_scores, *slots)[0]:
+            _assign(store, counters, agent, int(d), p)
+
+    # Demi-journées libérées : chaque créneau est complété seul, comme par la méthode « halfday »
+    for d, s in np.argwhere(partial.any(axis=0)):
+        filled = np.bincount(store.position_grid[:, d, s].astype(np.intp), minlength=n_positions + 1)[1:]
+        demand_min = np.maximum(problem.shift_demand_min[d, :, s] - filled, 0)
+        demand_max = np.maximum(problem.shift_demand_max[d, :, s] - filled, 0)
+        if not demand_max.any():
+            continue
+        slots = _day_slots(problem, d, demand_min, demand_max)
+        static = problem.day_static(d, problem.shift_preferences[:, d, s])
+        day_shifts = (store.position_grid[:, d] > 0).sum(axis=1)
+        free = problem.shift_available[:, d, s] & (store.position_grid[:, d, s] == 0)
+        bound += _match_day(np.where(free[:, None] & (static >= 0), static + WEEKLY_LOAD_BASE, -1), *slots)[1]
+
+        weekly = counters.weekly[:, counters.week_index[d]]
+        allowed = free & (day_shifts < problem.max_daily_shifts) \
+            & ((day_shifts > 0) | (weekly < problem.max_weekdays))
+        shift_scores = np.where(allowed[:, None] & (static >= 0), static + (WEEKLY_LOAD_BASE - weekly)[:, None], -1)
+        for agent, p in _match_day(shift_scores, *slots)[0]:
+            store.position_grid[agent, d, s] = p + 1
+            if not day_shifts[agent]:
+                counters.add(agent, int(d), p + 1)
+
+    objective = problem.objective(store)
+    elapsed = time.perf_counter() - started
+    logger.info(f"🩹 {int(broken.sum())} affectation(s) retirée(s), {int(partial.sum())} créneau(x) retiré(s), "
+                f"{int(reopened.sum())} rouverte(s), {len(repair_days)} jour(s) recalculé(s)")
+    return SolverResult(store, "repair", objective, bound, objective >= bound, elapsed)
@@ -0,0 +1,271 @@
+# app/backend/planning/repository.py
+# Lecture et écriture des affectations dans la table planning
+
+import logging
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .config import DAY_SHIFTS, ONCALL_SCHEDULE
+from .store import AssignmentStore, position_code
+
+logger = logging.getLogger(__name__)
+
+
+def _get_db(db=None):
+    """Obtenir le gestionnaire de base de données (import tardif pour rester sans effet de bord)"""
+    if db is not None:
+        return db
+    from app.backend.database import db as default_db
+    return default_db
+
+
+def resolve_user_ids(agent_names: Iterable[str], db=None) -> Dict[str, int]:
+    """Associer les noms d'agents aux identifiants de la table users (username ou prénom)"""
+    db = _get_db(db)
+    users = db.execute_query("SELECT id, username, first_name FROM users WHERE is_active = 1")
+
+    by_name = {}
+    for user in users:
+        for name in (user.get("username"), user.get("first_name")):
+            if name:
+                by_name.setdefault(name.casefold(), user["id"])
+
+    user_ids = {}
+    for agent in agent_names:
+        user_id = by_name.get(agent.casefold())
+        if user_id is None:
+            logger.warning(f"⚠️ Agent {agent} introuvable dans la table users, affectations ignorées")
+        else:
+            user_ids[agent] = user_id
+    return user_ids
+
+
+def attach_sectors(agents: Dict[str, Dict], position_rules: Dict[str, Dict],
+                   db=None) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+    """Compléter agents et règles de postes avec le secteur des tables users et positions
+
+    Retourne des copies ; un secteur déjà renseigné dans les règles est conservé.
+    """
+    db = _get_db(db)
+    position_sectors = {row["id"]: row["secteur"]
+                        for row in db.execute_query("SELECT id, secteur FROM positions WHERE is_active = 1")}
+    user_sectors = {}
+    for user in db.execute_query("SELECT username, first_name, secteur FROM users WHERE is_active = 1"):
+        for name in (user.get("username"), user.get("first_name")):
+            if name and user.get("secteur"):
+                user_sectors.setdefault(name.casefold(), user["secteur"])
+
+    agents = {agent: dict(info) for agent, info in agents.items()}
+    for agent, info in agents.items():
+        sector = user_sectors.get(agent.casefold())
+        if sector:
+            info.setdefault("secteur", sector)
+    position_rules = {position: dict(rules) for position, rules in position_rules.items()}
+    for position, rules in position_rules.items():
+        sector = position_sectors.get(position_code(position))
+        if sector:
+            rules.setdefault("secteur", sector)
+    return agents, position_rules
+
+
+def attach_skills(agents: Dict[str, Dict], position_rules: Dict[str, Dict],
+                  db=None) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+    """Compléter agents et règles de postes avec les tables user_skills et position_skills
+
+    Retourne des copies ; les compétences de la base s'ajoutent à ``skills`` (agents)
+    et à ``required_skills`` (postes) déjà renseignés dans les règles.
+    """
+    db = _get_db(db)
+    user_skills: Dict[str, List[str]] = {}
+    for row in db.execute_query("""
+        SELECT u.username, u.first_name, s.name
+        FROM user_skills us
+        JOIN users u ON u.id = us.user_id
+        JOIN skills s ON s.id = us.skill_id
+        WHERE u.is_active = 1
+    """):
+        for name in {row.get("username"), row.get("first_name")} - {None, ""}:
+            user_skills.setdefault(name.casefold(), []).append(row["name"])
+    position_skills: Dict[str, List[str]] = {}
+    for row in db.execute_query("""
+        SELECT ps.position_id, s.name
+        FROM position_skills ps
+        JOIN skills s ON s.id = ps.skill_id
+    """):
+        position_skills.setdefault(row["position_id"], []).append(row["name"])
+
+    agents = {agent: dict(info) for agent, info in agents.items()}
+    for agent, info in agents.items():
+        skills = user_skills.get(agent.casefold(), [])
+        info["skills"] = list(dict.fromkeys(list(info.get("skills", [])) + skills))
+    position_rules = {position: dict(rules) for position, rules in position_rules.items()}
+    for position, rules in position_rules.items():
+        skills = position_skills.get(position_code(position), [])
+        rules["required_skills"] = list(dict.fromkeys(list(rules.get("required_skills", [])) + skills))
+    return agents, position_rules
+
+
+def save_skills(agent_skills: Dict[str, Iterable[str]], position_skills: Dict[str, Iterable[str]], db=None):
+    """Enregistrer les compétences des agents et des postes (remplace leurs liens existants)"""
+    db = _get_db(db)
+    user_ids = resolve_user_ids(agent_skills, db)
+    names = {skill for skills in list(agent_skills.values()) + list(position_skills.values()) for skill in skills}
+    queries = [("INSERT OR IGNORE INTO skills (name) VALUES (?)", (name,)) for name in sorted(names)]
+    for agent, skills in agent_skills.items():
+        if agent not in user_ids:
+            continue
+        queries.append(("DELETE FROM user_skills WHERE user_id = ?", (user_ids[agent],)))
+        queries.extend(("INSERT INTO user_skills (user_id, skill_id) SELECT ?, id FROM skills WHERE name = ?",
+                        (user_ids[agent], skill)) for skill in dict.fromkeys(skills))
+    for position, skills in position_skills.items():
+        code = position_code(position)
+        queries.append(("DELETE FROM position_skills WHERE position_id = ?", (code,)))
+        queries.extend(("INSERT INTO position_skills (position_id, skill_id) SELECT ?, id FROM skills WHERE name = ?",
+                        (code, skill)) for skill in dict.fromkeys(skills))
+    if not db.execute_transaction(queries):
+        raise RuntimeError("Échec de l'écriture des compétences dans la base de données")
+    logger.info(f"✅ Compétences enregistrées : {len(user_ids)} agent(s), {len(position_skills)} poste(s)")
+
+
+def save_result(result: AssignmentStore, db=None) -> Tuple[int, int]:
+    """Remplacer les affectations planifiées des agents du résultat sur sa période
+
+    Les lignes des autres agents et les astreintes (``save_oncall``) sont conservées.
+    Le registre d'équité est mis à jour dans la même transaction : les journées de
+    ces agents sur la période en sont retirées avant la réécriture, puis ajoutées
+    de nouveau.
+
+    Les lignes conservées (confirmées, réalisées, astreintes) ne sont jamais
+    écrasées : les affectations du résultat qui tombent sur l'une d'elles sont
+    écartées avant l'écriture. Retourne les nombres de lignes écrites et écartées.
+    """
+    from .ledger import ledger_queries, user_filter
+    db = _get_db(db)
+    user_ids = resolve_user_ids(result.agents, db)
+    users, user_params = user_filter(user_ids.values())
+    period = (result.start_date.isoformat(), result.end_date.isoformat())
+    kept = {(row["date"], row["user_id"], row["shift"]) for row in db.execute_query(f"""
+        SELECT date, user_id, shift
+        FROM planning
+        WHERE date BETWEEN ? AND ? AND (status != 'planned' OR COALESCE(schedule, '') = ?){users}
+    """, (*period, ONCALL_SCHEDULE, *user_params))}
+    rows, skipped = [], []
+    for row in result.to_rows(user_ids):
+        (skipped if (row[0], row[2], row[3]) in kept else rows).append(row)
+
+    queries = ledger_queries(result.start_date, result.end_date, -1, user_ids.values())
+    queries.append((
+        "DELETE FROM planning WHERE date BETWEEN ? AND ? AND status = 'planned' "
+        f"AND COALESCE(schedule, '') != ?{users}",
+        (*period, ONCALL_SCHEDULE, *user_params)
+    ))
+    queries.extend(
+        ("INSERT INTO planning (date, position_id, user_id, shift, schedule, status) "
+         "VALUES (?, ?, ?, ?, ?, 'planned')", row)
+        for row in rows
+    )
+    queries.extend(ledger_queries(result.start_date, result.end_date, 1, user_ids.values()))
+
+    if not db.execute_transaction(queries):
+        raise RuntimeError("Échec de l'écriture du planning dans la base de données")
+
+    if skipped:
+        logger.warning(f"⚠️ {len(skipped)} affectation(s) écartée(s) : créneau déjà confirmé ou d'astreinte")
+    logger.info(f"✅ {len(rows)} lignes de planning écrites du {result.start_date} au {result.end_date}")
+    return len(rows), len(skipped)
+
+
+def save_oncall(assignments: Dict[date, str], start_date: date, end_date: date, db=None) -> int:
+    """Remplacer les astreintes planifiées de la période (``PlanningEngine.rotate_oncall``)
+
+    Une ligne par créneau de journée et par jour d'astreinte, sans poste, avec
+    l'horaire ``ONCALL_SCHEDULE`` ; un poste déjà planifié sur ces créneaux est
+    retiré. Écriture et registre d'équité en une transaction.
+    """
+    from .ledger import ledger_queries
+    db = _get_db(db)
+    user_ids = resolve_user_ids(set(assignments.values()), db)
+    rows = [(day.isoformat(), user_ids[agent], shift, ONCALL_SCHEDULE)
+            for day, agent in sorted(assignments.items()) if agent in user_ids for shift in DAY_SHIFTS]
+
+    queries = ledger_queries(start_date, end_date, -1)
+    queries.append((
+        "DELETE FROM planning WHERE date BETWEEN ? AND ? AND status = 'planned' AND schedule = ?",
+        (start_date.isoformat(), end_date.isoformat(), ONCALL_SCHEDULE)
+    ))
+    queries.extend(
+        ("INSERT INTO planning (date, user_id, shift, schedule, status) VALUES (?, ?, ?, ?, 'planned') "
+         "ON CONFLICT (date, user_id, shift) DO UPDATE SET schedule = excluded.schedule, position_id = NULL, "
+         "updated_at = CURRENT_TIMESTAMP", row)
+        for row in rows
+    )
+    queries.extend(ledger_queries(start_date, end_date, 1))
+
+    if not db.execute_transaction(queries):
+        raise RuntimeError("Échec de l'écriture des astreintes dans la base de données")
+
+    logger.info(f"✅ {len(rows)} lignes d'astreinte écrites du {start_date} au {end_date}")
+    return len(rows)
+
+
+def load_oncall(agents: List[str], start_date: date, end_date: date, db=None) -> Dict[date, str]:
+    """Agent d'astreinte de chaque jour de la période (table planning)"""
+    db = _get_db(db)
+    agent_by_user = {user_id: agent for agent, user_id in resolve_user_ids(agents, db).items()}
+    rows = db.execute_query("""
+        SELECT DISTINCT date, user_id
+        FROM planning
+        WHERE date BETWEEN ? AND ? AND status != 'cancelled' AND schedule = ?
+    """, (start_date.isoformat(), end_date.isoformat(), ONCALL_SCHEDULE))
+    return {date.fromisoformat(str(row["date"])[:10]): agent_by_user[row["user_id"]]
+            for row in rows if row["user_id"] in agent_by_user}
+
+
+def load_store(agents: List[str], start_date: date, end_date: date, db=None,
+               positions: Optional[List[str]] = None,
+               schedules: Optional[List[str]] = None) -> AssignmentStore:
+    """Charger les affectations d'une période depuis la table planning"""
+    db = _get_db(db)
+    store = AssignmentStore(agents, start_date, end_date, positions, schedules)
+    user_ids = resolve_user_ids(agents, db)
+    rows = db.execute_query("""
+        SELECT date, position_id, user_id, shift, schedule
+        FROM planning
+        WHERE date BETWEEN ? AND ? AND status != 'cancelled'
+    """, (start_date.isoformat(), end_date.isoformat()))
+    store.load_rows(rows, {user_id: agent for agent, user_id in user_ids.items()})
+    return store
+
+
+def load_schedule_counts(agents: List[str], schedules: List[str], before: date, db=None) -> np.ndarray:
+    """Journées tenues par agent et par horaire avant une date (agents × horaires)
+
+    Lecture du registre d'équité, dont on retire les seules journées enregistrées à
+    partir de ``before`` : l'historique n'est jamais relu.
+    """
+    from .ledger import FairnessLedger
+    db = _get_db(db)
+    counts = FairnessLedger(db).schedules(agents, schedules)
+    user_ids = resolve_user_ids(agents, db)
+    agent_rows = {user_ids[agent]: a for a, agent in enumerate(agents) if agent in user_ids}
+    columns = {schedule: k for k, schedule in enumerate(schedules)}
+    for row in db.execute_query("""
+        SELECT user_id, schedule, COUNT(DISTINCT date) AS days
+        FROM planning
+        WHERE date >= ? AND status != 'cancelled' AND schedule IS NOT NULL
+        GROUP BY user_id, schedule
+    """, (before.isoformat(),)):
+        a, k = agent_rows.get(row["user_id"]), columns.get(row["schedule"])
+        if a is not None and k is not None:
+            counts[a, k] -= row["days"]
+    return counts
+
+
+def load_reference(agents: List[str], start_date: date, db=None, weeks: int = 1,
+                   positions: Optional[List[str]] = None,
+                   schedules: Optional[List[str]] = None) -> AssignmentStore:
+    """Charger les semaines précédant une période (planning de référence du démarrage à chaud)"""
+    return load_store(agents, start_date - timedelta(days=7 * weeks), start_date - timedelta(days=1), db,
+                      positions, schedules)
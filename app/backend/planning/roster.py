@@ -0,0 +1,70 @@
+# app/backend/planning/roster.py
+# Roulement cyclique de N semaines, déroulé sur toute période par indexation NumPy
+
+from datetime import date, timedelta
+from typing import List
+
+import numpy as np
+
+from .config import DAY_SHIFTS, SHIFTS
+from .store import AssignmentStore, position_code
+
+_DAY_SHIFTS = [SHIFTS.index(shift) for shift in DAY_SHIFTS]
+
+
+class RosterPattern:
+    """Roulement fixe : poste et horaire par agent, semaine du cycle et jour de la semaine
+
+    ``position_codes`` et ``schedule_codes`` (agents × semaines du cycle × 7) portent
+    les codes 1..N de ``positions`` et ``schedules`` (0 = rien). La semaine 0 du cycle
+    commence le lundi ``anchor`` ; le cycle se répète ensuite dans les deux sens.
+    """
+
+    def __init__(self, agents: List[str], positions: List[str], schedules: List[str],
+                 position_codes: np.ndarray, schedule_codes: np.ndarray, anchor: date):
+        self.agents = list(agents)
+        self.positions = list(positions)
+        self.schedules = list(schedules)
+        self.position_codes = np.asarray(position_codes, dtype=np.int16)
+        self.schedule_codes = np.asarray(schedule_codes, dtype=np.int16)
+        self.anchor = anchor - timedelta(days=anchor.weekday())
+
+    @property
+    def n_weeks(self) -> int:
+        return self.position_codes.shape[1]
+
+    @classmethod
+    def from_store(cls, store: AssignmentStore, start_date: date, weeks: int) -> "RosterPattern":
+        """Roulement repris de ``weeks`` semaines d'un planning, à partir du lundi de ``start_date``"""
+        monday = start_date - timedelta(days=start_date.weekday())
+        cycle = store.copy_range(monday, monday + timedelta(days=7 * weeks - 1))
+        shape = (len(store.agents), weeks, 7)
+        return cls(store.agents, store.positions, store.schedules,
+                   cycle.position_grid[:, :, _DAY_SHIFTS[0]].reshape(shape), cycle.schedule_grid.reshape(shape),
+                   monday)
+
+    def expand(self, agents: List[str], positions: List[str], schedules: List[str],
+               start_date: date, end_date: date) -> AssignmentStore:
+        """Planning du roulement sur une période, sans aucune contrainte appliquée
+
+        Chaque jour lit sa case du cycle ((jour - ancre) modulo la longueur du cycle) :
+        une seule indexation des tableaux aplatis, quelle que soit la période.
+        """
+        store = AssignmentStore(agents, start_date, end_date, positions, schedules)
+        offsets = (np.arange(store.n_days) + (start_date - self.anchor).days) % (7 * self.n_weeks)
+        rows = np.array([a for a, agent in enumerate(agents) if agent in self.agents], dtype=np.intp)
+        source = np.array([self.agents.index(agents[a]) for a in rows], dtype=np.intp)
+
+        # Codes du roulement renumérotés dans les listes cibles (0 si le poste ou l'horaire n'y figure pas)
+        position_index = {position_code(position): p + 1 for p, position in enumerate(positions)}
+        position_lookup = np.array([0] + [position_index.get(position_code(position), 0)
+                                          for position in self.positions], dtype=np.int16)
+        schedule_index = {schedule: k + 1 for k, schedule in enumerate(schedules)}
+        schedule_lookup = np.array([0] + [schedule_index.get(schedule, 0) for schedule in self.schedules],
+                                   dtype=np.int16)
+
+        days = position_lookup[self.position_codes.reshape(len(self.agents), -1)[source][:, offsets]]
+        for shift in _DAY_SHIFTS:
+            store.position_grid[rows, :, shift] = days
+        store.schedule_grid[rows] = schedule_lookup[self.schedule_codes.reshape(len(self.agents), -1)[source][:, offsets]]
+        return store
@@ -0,0 +1,157 @@
+# app/backend/planning/sectors.py
+# Résolution séparée des secteurs indépendants, avec cache des sous-plannings par secteur
+
+import logging
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .config import SECTOR_CACHE_SIZE
+from .pool import default_workers, run_tasks, worker_problem, worker_stopped
+from .problem import PlanningProblem
+from .solvers import SOLVERS, PlanningSolver, SolverResult
+
+logger = logging.getLogger(__name__)
+
+
+def sector_components(problem: PlanningProblem) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Composantes connexes du graphe agents × postes éligibles : [(agents, postes)]
+
+    Deux composantes ne partagent ni agent ni poste : l'objectif est la somme des
+    objectifs des composantes. Les agents jamais disponibles et les postes sans
+    demande sont écartés (ils ne rapportent rien).
+    """
+    eligible = (problem.static_scores >= 0) \
+        & problem.available.any(axis=1)[:, None] & problem.demand_max.any(axis=0)[None, :]
+    seen_agents = np.zeros(eligible.shape[0], dtype=bool)
+    seen_positions = np.zeros(eligible.shape[1], dtype=bool)
+
+    components = []
+    for start in np.flatnonzero(eligible.any(axis=0)):
+        if seen_positions[start]:
+            continue
+        positions = np.zeros_like(seen_positions)
+        positions[start] = True
+        agents = np.zeros_like(seen_agents)
+        # Parcours en largeur alterné : postes -> agents éligibles -> postes éligibles
+        while True:
+            new_agents = eligible[:, positions].any(axis=1) & ~agents
+            if not new_agents.any():
+                break
+            agents |= new_agents
+            positions |= eligible[new_agents].any(axis=0)
+        seen_agents |= agents
+        seen_positions |= positions
+        components.append((np.flatnonzero(agents), np.flatnonzero(positions)))
+    return components
+
+
+class SectorCache:
+    """Sous-plannings récents par empreinte de composante (moins récemment utilisé évincé)"""
+
+    def __init__(self, max_size: int = SECTOR_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, int, int, bool]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, int, int, bool]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: Tuple[np.ndarray, int, int, bool]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Cache partagé par les résolutions successives du processus (page Streamlit, CLI)
+SECTOR_CACHE = SectorCache()
+
+
+def _solve_component(method: str, agents: np.ndarray, positions: np.ndarray, deadline: Optional[float],
+                     problem: Optional[PlanningProblem] = None) -> Optional[Tuple[np.ndarray, int, int, bool]]:
+    """Résoudre une composante : (grille des postes locale, objectif, borne, optimal)
+
+    ``deadline`` est une heure absolue (time.time()). Appelée dans un processus du
+    pool, la fonction lit le problème partagé.
+    """
+    if problem is None:
+        if worker_stopped():
+            return None
+        problem = worker_problem()
+    time_budget = None if deadline is None else max(deadline - time.time(), 0.0)
+    result = SOLVERS[method]().solve(problem.subset(agents, positions), time_budget)
+    return result.store.position_grid, result.objective, result.bound, result.optimal
+
+
+class SectorSolver(PlanningSolver):
+    """Secteurs indépendants résolus séparément, en parallèle, avec cache par secteur
+
+    Les secteurs (Biologie moléculaire, Sérologie infectieuse, Bactériologie) ne
+    partagent presque pas d'agents : chaque composante connexe agents × postes est
+    un sous-problème résolu par ``method`` dans un processus du pool. Le résultat de
+    chaque composante est mis en cache sous l'empreinte de son sous-problème :
+    replanifier un secteur ne recalcule pas les autres. Le budget de temps n'entre
+    pas dans la clé.
+    """
+
+    name = "sectors"
+
+    def __init__(self, method: str = "exact", max_workers: Optional[int] = None,
+                 cache: Optional[SectorCache] = None):
+        self.method = method
+        self.max_workers = max_workers
+        self.cache = cache if cache is not None else SECTOR_CACHE
+
+    def solve(self, problem: PlanningProblem, time_budget: Optional[float] = None) -> SolverResult:
+        started = time.perf_counter()
+        deadline = None if time_budget is None else time.time() + time_budget
+        components = sector_components(problem)
+
+        solved = {}
+        pending = []
+        for i, (agents, positions) in enumerate(components):
+            key = f"{self.method}:{problem.subset(agents, positions).fingerprint()}"
+            entry = self.cache.get(key)
+            if entry is None:
+                pending.append((i, key))
+            else:
+                solved[i] = entry
+
+        max_workers = self.max_workers or default_workers(len(pending))
+        entries = run_tasks(problem, max_workers, _solve_component,
+                            [(self.method, *components[i], deadline) for i, _ in pending])
+        for (i, key), entry in zip(pending, entries):
+            self.cache.put(key, entry)
+            solved[i] = entry
+
+        store = problem.new_store()
+        bound = 0
+        optimal = True
+        for i, (agents, positions) in enumerate(components):
+            grid, _, component_bound, component_optimal = solved[i]
+            # Codes locaux (1..postes de la composante) -> codes globaux
+            codes = np.concatenate(([0], positions + 1)).astype(store.position_grid.dtype)
+            store.position_grid[agents] = codes[grid]
+            bound += component_bound
+            optimal &= component_optimal
+
+        objective = problem.objective(store)
+        elapsed = time.perf_counter() - started
+        logger.info(f"🗂️ {len(components)} secteur(s) indépendant(s), "
+                    f"{len(components) - len(pending)} repris du cache")
+        return SolverResult(store, f"{self.name}:{self.method}", objective,
+                            objective if optimal else bound, optimal, elapsed)
+
+
+SOLVERS[SectorSolver.name] = SectorSolver
@@ -0,0 +1,66 @@
+# app/backend/planning/skills.py
+# Compétences compilées en champs de bits : correspondance agents × postes par ET binaire
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+# Bits par mot des champs de compétences
+_WORD_BITS = 64
+
+
+def agent_skills(agent_info: Dict) -> List[str]:
+    """Compétences d'un agent : liste ``skills`` et ancienne ``specialization`` unique"""
+    skills = list(agent_info.get("skills", []))
+    if agent_info.get("specialization"):
+        skills.append(agent_info["specialization"])
+    return skills
+
+
+class SkillCatalog:
+    """Catalogue des compétences : un bit par compétence, mots de 64 bits
+
+    Un ensemble de compétences devient une ligne de ``n_words`` entiers non signés ;
+    un agent convient à un poste s'il détient au moins une des compétences requises,
+    c'est-à-dire si le ET de leurs champs de bits est non nul.
+    """
+
+    def __init__(self, skills: Iterable[str] = ()):
+        self.skills: List[str] = []
+        self._bits: Dict[str, int] = {}
+        for skill in skills:
+            self.add(skill)
+
+    def add(self, skill: str) -> int:
+        """Numéro de bit d'une compétence (ajoutée au catalogue si nouvelle)"""
+        if skill not in self._bits:
+            self._bits[skill] = len(self.skills)
+            self.skills.append(skill)
+        return self._bits[skill]
+
+    @property
+    def n_words(self) -> int:
+        return max(1, -(-len(self.skills) // _WORD_BITS))
+
+    def compile(self, skill_sets: List[Iterable[str]]) -> np.ndarray:
+        """Champs de bits (ensembles × mots, uint64) ; les compétences inconnues sont ajoutées"""
+        rows, bits = [], []
+        for i, skills in enumerate(skill_sets):
+            for skill in skills:
+                rows.append(i)
+                bits.append(self.add(skill))
+        rows, bits = np.array(rows, dtype=np.intp), np.array(bits, dtype=np.uint64)
+        words = np.zeros((len(skill_sets), self.n_words), dtype=np.uint64)
+        np.bitwise_or.at(words, (rows, (bits // np.uint64(_WORD_BITS)).astype(np.intp)),
+                         np.left_shift(np.uint64(1), bits % np.uint64(_WORD_BITS)))
+        return words
+
+    def match(self, agent_sets: List[Iterable[str]], position_sets: List[Iterable[str]]) -> np.ndarray:
+        """Agents détenant une compétence requise par chaque poste (agents × postes, booléens)"""
+        agent_sets, position_sets = [list(skills) for skills in agent_sets], [list(skills) for skills in position_sets]
+        # Catalogue complété d'abord : les deux compilations ont le même nombre de mots
+        for skills in agent_sets + position_sets:
+            for skill in skills:
+                self.add(skill)
+        agents, positions = self.compile(agent_sets), self.compile(position_sets)
+        return (agents[:, None, :] & positions[None, :, :]).any(axis=2)
@@ -0,0 +1,279 @@
+# app/backend/planning/solvers.py
+# Solveurs interchangeables du moteur de planification
+
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import DAY_SHIFTS, SHIFTS
+from .counters import LoadCounters
+from .flow import MinCostFlow
+from .hungarian import linear_sum_assignment
+from .problem import WEEKLY_LOAD_BASE, PlanningProblem
+from .store import AssignmentStore
+
+logger = logging.getLogger(__name__)
+
+_DAY_SHIFTS = [SHIFTS.index(shift) for shift in DAY_SHIFTS]
+
+
+class SolverResult:
+    """Planning obtenu par un solveur, avec sa valeur, une borne supérieure et l'écart"""
+
+    def __init__(self, store: AssignmentStore, solver: str, objective: int, bound: int,
+                 optimal: bool, elapsed: float):
+        self.store = store
+        self.solver = solver
+        self.objective = objective
+        self.bound = max(bound, objective)
+        self.optimal = optimal
+        self.elapsed = elapsed
+
+    @property
+    def gap(self) -> float:
+        """Écart relatif entre la borne et la valeur obtenue (0 = optimum prouvé)"""
+        if self.optimal:
+            return 0.0
+        return (self.bound - self.objective) / max(abs(self.bound), 1)
+
+    def summary(self) -> str:
+        status = "optimal" if self.optimal else f"écart {self.gap:.2%}"
+        return (f"{self.solver} : objectif {self.objective} (borne {self.bound}, {status}) "
+                f"en {self.elapsed:.3f}s")
+
+
+def _assign(store: AssignmentStore, counters: LoadCounters, agent: int, day: int, p: int):
+    """Affecter un poste (indice p) sur les créneaux de journée et mettre à jour les compteurs"""
+    store.position_grid[agent, day, _DAY_SHIFTS] = p + 1
+    counters.add(agent, day, p + 1)
+
+
+def _day_slots(problem: PlanningProblem, d: int, demand_min: Optional[np.ndarray] = None,
+               demand_max: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Places du jour : poste de chaque place et bonus (obligatoires en premier)
+
+    ``demand_min``/``demand_max`` remplacent la demande du jour (places restantes).
+    """
+    demand_min = problem.demand_min[d] if demand_min is None else demand_min
+    demand_max = problem.demand_max[d] if demand_max is None else demand_max
+    slot_positions = np.repeat(np.arange(len(demand_max)), demand_max)
+    rank = np.arange(len(slot_positions)) - np.repeat(np.cumsum(demand_max) - demand_max, demand_max)
+    slot_bonus = np.where(rank < demand_min[slot_positions], problem.slot_bonus[slot_positions], 0)
+    return slot_positions, slot_bonus
+
+
+def _match_day(day_scores: np.ndarray, slot_positions: np.ndarray,
+               slot_bonus: np.ndarray) -> Tuple[List[Tuple[int, int]], int]:
+    """Couples (agent, poste) maximisant couverture pondérée + score, et leur valeur"""
+    agents = np.flatnonzero((day_scores > 0).any(axis=1))
+    if agents.size == 0 or slot_positions.size == 0:
+        return [], 0
+    scores = day_scores[agents][:, slot_positions]
+    value = np.where(scores > 0, scores + slot_bonus, 0)
+
+    rows, cols = linear_sum_assignment(-value)
+    keep = value[rows, cols] > 0
+    pairs = [(int(agents[r]), int(slot_positions[c])) for r, c in zip(rows[keep], cols[keep])]
+    return pairs, int(value[rows[keep], cols[keep]].sum())
+
+
+def relaxed_bound(problem: PlanningProblem, days: np.ndarray) -> int:
+    """Borne supérieure de l'objectif sur des jours, sans limite hebdomadaire
+
+    Chaque journée est résolue seule avec le terme de charge maximal (5) : le terme
+    cumulé Σ (5 - k) ne dépasse jamais 5 par journée, la borne est donc valide.
+    """
+    solved: Dict[bytes, int] = {}
+    total = 0
+    for d in days:
+        static = problem.day_static(d)
+        day_scores = np.where(static >= 0, static + WEEKLY_LOAD_BASE, -1)
+        day_scores[~problem.available[:, d]] = -1
+        key = day_scores.tobytes() + problem.demand_min[d].tobytes() + problem.demand_max[d].tobytes()
+        if key not in solved:
+            solved[key] = _match_day(day_scores, *_day_slots(problem, d))[1]
+        total += solved[key]
+    return total
+
+
+class PlanningSolver:
+    """Interface commune : résoudre un problème compilé dans un budget de temps"""
+
+    name = ""
+
+    def solve(self, problem: PlanningProblem, time_budget: Optional[float] = None) -> SolverResult:
+        started = time.perf_counter()
+        store = problem.new_store()
+        counters = LoadCounters(store)
+        weeks = problem.weeks()
+        days = np.concatenate(weeks) if weeks else np.zeros(0, dtype=np.intp)
+        self.solve_days(problem, store, counters, days)
+        return SolverResult(store, self.name, problem.objective(store), relaxed_bound(problem, days),
+                            False, time.perf_counter() - started)
+
+    def solve_days(self, problem: PlanningProblem, store: AssignmentStore, counters: LoadCounters,
+                   days: np.ndarray):
+        """Compléter les jours donnés, dans l'ordre chronologique"""
+        raise NotImplementedError
+
+
+class DailySolver(PlanningSolver):
+    """Solveur heuristique traitant les jours un par un avec la charge de la semaine en cours"""
+
+    def _day_scores(self, problem: PlanningProblem, counters: LoadCounters, d: int) -> np.ndarray:
+        """Matrice de compatibilité agents × postes du jour (-1 = affectation impossible)"""
+        weekly = counters.weekly[:, counters.week_index[d]]
+
+        # Agents disponibles ce jour et sous leur limite hebdomadaire
+        available = problem.available[:, d] & (counters.capacity(problem.max_weekdays, d) > 0)
+
+        # Privilégier les agents ayant le moins d'affectations dans la semaine ; la charge
+        # ne change pas dans la journée, le score complet se calcule donc une fois par jour
+        static = problem.day_static(d)
+        day_scores = np.where(static >= 0, static + (WEEKLY_LOAD_BASE - weekly)[:, None], -1)
+        day_scores[~available] = -1
+        return day_scores
+
+
+class GreedySolver(DailySolver):
+    """Parcours des postes par priorité, meilleur agent restant pour chaque place"""
+
+    name = "greedy"
+
+    def solve_days(self, problem, store, counters, days):
+        for d in days:
+            day_scores = self._day_scores(problem, counters, d)
+            for p, exclusive_agent in problem.priority_order:
+                places = min(max(problem.demand_min[d, p], 1), problem.demand_max[d, p])
+                for _ in range(places):
+                    # Les agents exclusifs sont affectés en premier
+                    if exclusive_agent is not None and day_scores[exclusive_agent, p] > 0:
+                        best_agent = exclusive_agent
+                    else:
+                        best_agent = int(day_scores[:, p].argmax())  # premier meilleur score
+                        if day_scores[best_agent, p] <= 0:
+                            break
+
+                    _assign(store, counters, best_agent, d, p)
+                    day_scores[best_agent] = -1
+
+
+class HungarianSolver(DailySolver):
+    """Affectation de coût minimal jour par jour (optimum de chaque journée)"""
+
+    name = "hungarian"
+
+    def solve_days(self, problem, store, counters, days):
+        # La solution ne dépend que de la matrice et de la demande du jour : les journées
+        # identiques (même jour de semaine, même charge) réutilisent la solution en cache
+        solved: Dict[bytes, List[Tuple[int, int]]] = {}
+        for d in days:
+            day_scores = self._day_scores(problem, counters, d)
+            key = day_scores.tobytes() + problem.demand_min[d].tobytes() + problem.demand_max[d].tobytes()
+            if key not in solved:
+                solved[key] = _match_day(day_scores, *_day_slots(problem, d))[0]
+            for agent, p in solved[key]:
+                _assign(store, counters, agent, d, p)
+
+
+class ExactSolver(PlanningSolver):
+    """Optimum exact semaine par semaine, modélisé en flot de coût minimal
+
+    Réseau : source → agent-semaine (une unité par journée, gain 5 - k pour la k-ième,
+    au plus max_weekdays_per_week) → agent-jour (capacité 1) → poste-jour (gain
+    compétence + préférence + stabilité) → puits (places obligatoires avec bonus de
+    couverture, puis places facultatives). La matrice de contraintes est totalement
+    unimodulaire : le flot entier de coût minimal est la solution optimale du
+    programme en nombres entiers. Les semaines sont indépendantes (limites et charge hebdomadaires) et
+    résolues dans l'ordre ; à l'échéance, la semaine en cours garde son meilleur
+    flot et les suivantes passent au solveur de repli.
+    """
+
+    name = "exact"
+
+    def __init__(self, fallback: Optional[PlanningSolver] = None):
+        self.fallback = fallback or HungarianSolver()
+
+    def solve(self, problem: PlanningProblem, time_budget: Optional[float] = None) -> SolverResult:
+        started = time.perf_counter()
+        deadline = started + time_budget if time_budget is not None else None
+        store = problem.new_store()
+        counters = LoadCounters(store)
+        bound, optimal = self.solve_weeks(problem, store, counters, problem.weeks(), deadline)
+        objective = problem.objective(store)
+        return SolverResult(store, self.name, objective, bound if not optimal else objective,
+                            optimal, time.perf_counter() - started)
+
+    def solve_weeks(self, problem: PlanningProblem, store: AssignmentStore, counters: LoadCounters,
+                    weeks: List[np.ndarray], deadline: Optional[float] = None) -> Tuple[int, bool]:
+        """Résoudre des semaines dans l'ordre, retourne (borne supérieure, optimalité prouvée)"""
+        bound = 0
+        optimal = True
+        for i, days in enumerate(weeks):
+            if deadline is not None and time.perf_counter() > deadline:
+                remaining = np.concatenate(weeks[i:])
+                logger.warning(f"⚠️ Échéance atteinte : {len(weeks) - i} semaine(s) "
+                               f"complétée(s) par le solveur {self.fallback.name}")
+                self.fallback.solve_days(problem, store, counters, remaining)
+                return bound + relaxed_bound(problem, remaining), False
+            week_bound, week_optimal = self._solve_week(problem, store, counters, days, deadline)
+            bound += week_bound
+            optimal &= week_optimal
+        return bound, optimal
+
+    def solve_days(self, problem, store, counters, days):
+        for w in np.unique(counters.week_index[days]):
+            self._solve_week(problem, store, counters, days[counters.week_index[days] == w], None)
+
+    def _solve_week(self, problem: PlanningProblem, store: AssignmentStore, counters: LoadCounters,
+                    days: np.ndarray, deadline: Optional[float]) -> Tuple[int, bool]:
+        """Résoudre une semaine, retourne (borne supérieure de sa valeur, optimalité prouvée)"""
+        n_agents, n_positions = problem.static_scores.shape
+        n_days = len(days)
+        source, sink = 0, 1
+        agent_week = 2 + np.arange(n_agents)
+        agent_day = 2 + n_agents + np.arange(n_agents * n_days).reshape(n_agents, n_days)
+        position_day = 2 + n_agents * (1 + n_days) + np.arange(n_days * n_positions).reshape(n_days, n_positions)
+        network = MinCostFlow(2 + n_agents * (1 + n_days) + n_days * n_positions)
+
+        # Source → agent-semaine : une unité par journée travaillée, gain décroissant à partir
+        # des journées déjà comptées dans la semaine ; même capacité que les solveurs journaliers
+        available = problem.available[:, days]
+        capacity = np.minimum(counters.capacity(problem.max_weekdays, days[0]), available.sum(axis=1))
+        agents = np.repeat(np.arange(n_agents), capacity)
+        rank = np.arange(len(agents)) - np.repeat(np.cumsum(capacity) - capacity, capacity)
+        load = counters.weekly[agents, counters.week_index[days[0]]]
+        network.add_edges(source, agent_week[agents], 1, -(WEEKLY_LOAD_BASE - load - rank))
+
+        # Agent-semaine → agent-jour
+        a, k = np.nonzero(available)
+        network.add_edges(agent_week[a], agent_day[a, k], 1, 0)
+
+        # Agent-jour → poste-jour : agents éligibles sur les postes ouverts ce jour
+        eligible = available[:, :, None] & (problem.static_scores >= 0)[:, None, :] \
+            & (problem.demand_max[days] > 0)[None, :, :]
+        a, k, p = np.nonzero(eligible)
+        gains = problem.static_scores[a, p] + problem.stability_weight * (problem.preferred[a, days[k]] == p) \
+            + problem.day_preferences[a, days[k]]
+        assignment_edges = network.add_edges(agent_day[a, k], position_day[k, p], 1, -gains)
+
+        # Poste-jour → puits : places obligatoires (bonus de couverture) puis facultatives
+        demand_min = problem.demand_min[days]
+        optional = problem.demand_max[days] - demand_min
+        network.add_edges(position_day.ravel(), sink, demand_min.ravel(),
+                          -np.broadcast_to(problem.slot_bonus, demand_min.shape).ravel())
+        network.add_edges(position_day.ravel(), sink, optional.ravel(), 0)
+
+        cost, lower_bound, optimal = network.solve(source, sink, deadline)
+        for edge in np.flatnonzero(network.edge_flow(assignment_edges) > 0):
+            _assign(store, counters, int(a[edge]), int(days[k[edge]]), int(p[edge]))
+        return -lower_bound, optimal
+
+
+SOLVERS = {
+    HungarianSolver.name: HungarianSolver,
+    GreedySolver.name: GreedySolver,
+    ExactSolver.name: ExactSolver,
+}
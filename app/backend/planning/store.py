@@ -0,0 +1,276 @@
+# app/backend/planning/store.py
+# Stockage dense des affectations : tableaux NumPy agent × jour × créneau
+
+import hashlib
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .config import DAY_SHIFTS, DEFAULT_POSITIONS, DEFAULT_SCHEDULES, SHIFTS
+
+
+def position_code(position: str) -> str:
+    """Extraire le code court d'un poste ("P1 : Tri & urgences" -> "P1")"""
+    return position.split(":")[0].strip()
+
+
+def date_range(start_date: date, end_date: date) -> List[date]:
+    """Lister toutes les dates entre deux bornes incluses"""
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+
+class AssignmentStore:
+    """Affectations postes/horaires indexées par agent, jour et créneau
+
+    Les postes sont codés 1..N (0 = pas d'affectation) dans ``position_grid``
+    de forme (agents, jours, créneaux) ; les horaires sont codés de la même
+    façon dans ``schedule_grid`` de forme (agents, jours). La mémoire dépend
+    uniquement du nombre d'agents et de la longueur de la période.
+    """
+
+    def __init__(self, agents: Iterable[str], start_date: date, end_date: date,
+                 positions: Optional[List[str]] = None, schedules: Optional[List[str]] = None):
+        if start_date > end_date:
+            raise ValueError("La date de début doit être antérieure à la date de fin")
+        self.agents = list(agents)
+        self.positions = list(positions if positions is not None else DEFAULT_POSITIONS)
+        self.schedules = list(schedules if schedules is not None else DEFAULT_SCHEDULES)
+        self.start_date = start_date
+        self.end_date = end_date
+
+        n_days = (end_date - start_date).days + 1
+        self.position_grid = np.zeros((len(self.agents), n_days, len(SHIFTS)), dtype=np.int16)
+        self.schedule_grid = np.zeros((len(self.agents), n_days), dtype=np.int16)
+        self._build_indexes()
+
+    def _build_indexes(self):
+        """Construire les tables de correspondance libellé <-> code"""
+        self._agent_index = {agent: i for i, agent in enumerate(self.agents)}
+        self._position_codes = {}
+        for i, position in enumerate(self.positions):
+            self._position_codes[position] = i + 1
+            self._position_codes.setdefault(position_code(position), i + 1)
+        self._schedule_codes = {schedule: i + 1 for i, schedule in enumerate(self.schedules)}
+        self._position_labels = np.array([""] + self.positions, dtype=object)
+        self._position_short = np.array([""] + [position_code(p) for p in self.positions], dtype=object)
+        self._schedule_labels = np.array([""] + self.schedules, dtype=object)
+
+    # Indexation
+    @property
+    def n_days(self) -> int:
+        return self.position_grid.shape[1]
+
+    @property
+    def dates(self) -> List[date]:
+        return date_range(self.start_date, self.end_date)
+
+    def agent_index(self, agent: str) -> int:
+        """Indice d'un agent (KeyError si inconnu)"""
+        return self._agent_index[agent]
+
+    def day_index(self, day: date) -> int:
+        """Indice d'une date dans la période (KeyError si hors période)"""
+        index = (day - self.start_date).days
+        if index < 0 or index >= self.n_days:
+            raise KeyError(day)
+        return index
+
+    def contains(self, day: date) -> bool:
+        """Vérifier si une date appartient à la période"""
+        return self.start_date <= day <= self.end_date
+
+    def position_to_code(self, position: Optional[str]) -> int:
+        """Code d'un poste à partir de son libellé complet ou court (0 si vide)"""
+        if not position:
+            return 0
+        return self._position_codes[position]
+
+    def schedule_to_code(self, schedule: Optional[str]) -> int:
+        """Code d'un horaire (0 si vide)"""
+        if not schedule:
+            return 0
+        return self._schedule_codes[schedule]
+
+    def _agent_rows(self, agents: Optional[Iterable[str]]) -> np.ndarray:
+        if agents is None:
+            return np.arange(len(self.agents))
+        return np.array([self._agent_index[agent] for agent in agents], dtype=np.intp)
+
+    def _day_slice(self, start_date: Optional[date], end_date: Optional[date]) -> slice:
+        start = 0 if start_date is None else max((start_date - self.start_date).days, 0)
+        stop = self.n_days if end_date is None else min((end_date - self.start_date).days + 1, self.n_days)
+        return slice(start, max(start, stop))
+
+    # Lecture / écriture cellule par cellule
+    def set_position(self, agent: str, day: date, position: Optional[str],
+                     shifts: Optional[Iterable[str]] = None):
+        """Affecter un poste (ou vider avec None) sur un ou plusieurs créneaux"""
+        a, d = self._agent_index[agent], self.day_index(day)
+        code = self.position_to_code(position)
+        for shift in (shifts or DAY_SHIFTS):
+            self.position_grid[a, d, SHIFTS.index(shift)] = code
+
+    def get_position(self, agent: str, day: date, shift: str = "morning") -> str:
+        """Poste affecté à un agent pour un créneau ("" si aucun)"""
+        code = self.position_grid[self._agent_index[agent], self.day_index(day), SHIFTS.index(shift)]
+        return self._position_labels[code]
+
+    def set_schedule(self, agent: str, day: date, schedule: Optional[str]):
+        """Affecter un horaire (ou vider avec None) à un agent pour un jour"""
+        self.schedule_grid[self._agent_index[agent], self.day_index(day)] = self.schedule_to_code(schedule)
+
+    def get_schedule(self, agent: str, day: date) -> str:
+        """Horaire affecté à un agent pour un jour ("" si aucun)"""
+        return self._schedule_labels[self.schedule_grid[self._agent_index[agent], self.day_index(day)]]
+
+    def clear_positions(self, agents: Optional[Iterable[str]] = None,
+                        start_date: Optional[date] = None, end_date: Optional[date] = None):
+        """Effacer les postes des agents sur une période"""
+        self.position_grid[self._agent_rows(agents), self._day_slice(start_date, end_date)] = 0
+
+    def clear_schedules(self, agents: Optional[Iterable[str]] = None,
+                        start_date: Optional[date] = None, end_date: Optional[date] = None):
+        """Effacer les horaires des agents sur une période"""
+        self.schedule_grid[self._agent_rows(agents), self._day_slice(start_date, end_date)] = 0
+
+    # Lectures vectorisées pour les onglets Horaire / Postes AM / Postes PM
+    def position_labels(self, shift: str = "morning", agents: Optional[Iterable[str]] = None,
+                        start_date: Optional[date] = None, end_date: Optional[date] = None,
+                        short: bool = False) -> np.ndarray:
+        """Matrice agents × jours des libellés de postes pour un créneau"""
+        codes = self.position_grid[self._agent_rows(agents), self._day_slice(start_date, end_date), SHIFTS.index(shift)]
+        return (self._position_short if short else self._position_labels)[codes]
+
+    def schedule_labels(self, agents: Optional[Iterable[str]] = None,
+                        start_date: Optional[date] = None, end_date: Optional[date] = None) -> np.ndarray:
+        """Matrice agents × jours des libellés d'horaires"""
+        codes = self.schedule_grid[self._agent_rows(agents), self._day_slice(start_date, end_date)]
+        return self._schedule_labels[codes]
+
+    def items(self, shift: str = "morning") -> Iterator[Tuple[str, date, str]]:
+        """Parcourir les affectations d'un créneau triées par date puis par agent"""
+        grid = self.position_grid[:, :, SHIFTS.index(shift)]
+        order = sorted(zip(*np.nonzero(grid)), key=lambda cell: (cell[1], self.agents[cell[0]]))
+        for a, d in order:
+            yield self.agents[a], self.start_date + timedelta(days=int(d)), self._position_labels[grid[a, d]]
+
+    def __len__(self):
+        """Nombre de journées agent comportant au moins une affectation"""
+        return int(np.count_nonzero(self.position_grid.any(axis=2)))
+
+    # Redimensionnement (mémoire bornée par agents × jours)
+    def ensure_range(self, start_date: date, end_date: date):
+        """Étendre la période couverte en conservant les affectations existantes"""
+        new_start = min(start_date, self.start_date)
+        new_end = max(end_date, self.end_date)
+        if new_start == self.start_date and new_end == self.end_date:
+            return
+        offset = (self.start_date - new_start).days
+        n_days = (new_end - new_start).days + 1
+
+        position_grid = np.zeros((len(self.agents), n_days, len(SHIFTS)), dtype=self.position_grid.dtype)
+        position_grid[:, offset:offset + self.n_days] = self.position_grid
+        schedule_grid = np.zeros((len(self.agents), n_days), dtype=self.schedule_grid.dtype)
+        schedule_grid[:, offset:offset + self.n_days] = self.schedule_grid
+
+        self.position_grid, self.schedule_grid = position_grid, schedule_grid
+        self.start_date, self.end_date = new_start, new_end
+
+    def update_from(self, other: "AssignmentStore", positions: bool = True, schedules: bool = True):
+        """Recopier les affectations d'un autre stockage (mêmes postes et horaires) sur sa période"""
+        self.ensure_agents(other.agents)
+        self.ensure_range(other.start_date, other.end_date)
+        rows = self._agent_rows(other.agents)
+        days = self._day_slice(other.start_date, other.end_date)
+        if positions:
+            self.position_grid[rows, days] = other.position_grid
+        if schedules:
+            self.schedule_grid[rows, days] = other.schedule_grid
+
+    def with_schedules(self, schedules: List[str]) -> "AssignmentStore":
+        """Copie avec une autre liste d'horaires (horaires absents de la liste effacés)"""
+        copy = AssignmentStore(self.agents, self.start_date, self.end_date, self.positions, schedules)
+        copy.position_grid = self.position_grid.copy()
+        lookup = np.array([0] + [copy._schedule_codes.get(schedule, 0) for schedule in self.schedules],
+                          dtype=self.schedule_grid.dtype)
+        copy.schedule_grid = lookup[self.schedule_grid]
+        return copy
+
+    def copy_range(self, start_date: date, end_date: date,
+                   agents: Optional[Iterable[str]] = None) -> "AssignmentStore":
+        """Copie des affectations sur une autre période (jours hors période laissés vides)
+
+        ``agents`` restreint la copie à une partie des agents (tous par défaut).
+        """
+        agents = self.agents if agents is None else [agent for agent in agents if agent in self._agent_index]
+        rows = self._agent_rows(agents)
+        copy = AssignmentStore(agents, start_date, end_date, self.positions, self.schedules)
+        first, last = max(start_date, self.start_date), min(end_date, self.end_date)
+        if first <= last:
+            source = self._day_slice(first, last)
+            target = copy._day_slice(first, last)
+            copy.position_grid[:, target] = self.position_grid[rows, source]
+            copy.schedule_grid[:, target] = self.schedule_grid[rows, source]
+        return copy
+
+    def is_daily(self) -> bool:
+        """Vrai si chaque journée garde un seul poste sur les créneaux de journée, sans soirée"""
+        day_shifts = [SHIFTS.index(shift) for shift in DAY_SHIFTS]
+        other_shifts = [s for s in range(len(SHIFTS)) if s not in day_shifts]
+        day_codes = self.position_grid[:, :, day_shifts]
+        return bool((day_codes == day_codes[:, :, :1]).all() and not self.position_grid[:, :, other_shifts].any())
+
+    def fingerprint(self) -> str:
+        """Empreinte du contenu (agents, période, libellés et grilles) : change à chaque modification"""
+        digest = hashlib.sha256()
+        digest.update(repr((self.agents, self.start_date.isoformat(), self.end_date.isoformat(),
+                            self.positions, self.schedules)).encode("utf-8"))
+        for grid in (self.position_grid, self.schedule_grid):
+            digest.update(np.ascontiguousarray(grid).tobytes())
+        return digest.hexdigest()
+
+    def ensure_agents(self, agents: Iterable[str]):
+        """Ajouter les agents manquants (lignes vides)"""
+        missing = [agent for agent in agents if agent not in self._agent_index]
+        if not missing:
+            return
+        self.agents.extend(missing)
+        self.position_grid = np.concatenate(
+            [self.position_grid, np.zeros((len(missing),) + self.position_grid.shape[1:], dtype=self.position_grid.dtype)])
+        self.schedule_grid = np.concatenate(
+            [self.schedule_grid, np.zeros((len(missing), self.n_days), dtype=self.schedule_grid.dtype)])
+        self._build_indexes()
+
+    # Sérialisation vers / depuis la table planning
+    def to_rows(self, user_ids: Dict[str, int]) -> List[Tuple[str, Optional[str], int, str, Optional[str]]]:
+        """Lignes (date, position_id, user_id, shift, schedule) pour la table planning"""
+        rows = []
+        filled = (self.position_grid != 0) | (self.schedule_grid[:, :, None] != 0)
+        filled[:, :, SHIFTS.index("evening")] &= self.position_grid[:, :, SHIFTS.index("evening")] != 0
+        for a, d, s in zip(*np.nonzero(filled)):
+            agent = self.agents[a]
+            if agent not in user_ids:
+                continue
+            code = self.position_grid[a, d, s]
+            rows.append((
+                (self.start_date + timedelta(days=int(d))).isoformat(),
+                self._position_short[code] if code else None,
+                user_ids[agent],
+                SHIFTS[s],
+                self._schedule_labels[self.schedule_grid[a, d]] or None
+            ))
+        return rows
+
+    def load_rows(self, rows: Iterable[Dict], agent_by_user: Dict[int, str]):
+        """Charger des lignes de la table planning (clés date, position_id, user_id, shift, schedule)"""
+        for row in rows:
+            agent = agent_by_user.get(row.get("user_id"))
+            day = date.fromisoformat(str(row["date"])[:10])
+            if agent not in self._agent_index or not self.contains(day):
+                continue
+            a, d = self._agent_index[agent], self.day_index(day)
+            if row.get("position_id") in self._position_codes and row.get("shift") in SHIFTS:
+                self.position_grid[a, d, SHIFTS.index(row["shift"])] = self._position_codes[row["position_id"]]
+            if row.get("schedule") in self._schedule_codes:
+                self.schedule_grid[a, d] = self._schedule_codes[row["schedule"]]
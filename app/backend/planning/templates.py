@@ -0,0 +1,173 @@
+# app/backend/planning/templates.py
+# Modèles d'horaires (tables schedules et schedule_templates) compilés en catalogue de créneaux
+
+import logging
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import DAY_SHIFTS, ONCALL_SCHEDULE
+from .holidays import holiday_mask
+from .hours import clock_minutes
+from .repository import _get_db, resolve_user_ids
+from .store import date_range
+
+logger = logging.getLogger(__name__)
+
+# Heures d'un jour de modèle : début, fin, début et fin de pause ("HH:MM", pause facultative)
+DayTimes = Tuple[str, str, Optional[str], Optional[str]]
+
+
+def shift_label(start_minutes: int, end_minutes: int) -> str:
+    """Libellé d'un créneau au format des horaires du planning ("8h00-16h00")"""
+    return f"{start_minutes // 60}h{start_minutes % 60:02d}-{end_minutes // 60}h{end_minutes % 60:02d}"
+
+
+class ShiftCatalog:
+    """Catalogue des horaires définis par les modèles de la base
+
+    Chaque modèle actif (table schedules) porte ses heures par jour de la semaine
+    (table schedule_templates, 1 = lundi). Le catalogue les compile en tableaux
+    modèles × 7 (``labels`` : libellé du créneau, "" = jour non travaillé ;
+    ``minutes`` : durée travaillée, pause déduite, -1 = jour non travaillé) et en
+    liste des créneaux distincts (``shifts``), au format des horaires du planning.
+    Il n'est recompilé que si sa version change : dates ``updated_at`` des modèles
+    et identifiants de leurs jours (réécrits à chaque enregistrement).
+    """
+
+    def __init__(self, db=None):
+        self.db = db
+        self._version = None
+        self.schedules: List[Dict] = []
+        self.labels = np.zeros((0, 7), dtype=object)
+        self.minutes = np.zeros((0, 7), dtype=np.int32)
+        self.shifts: List[str] = []
+        self.shift_minutes: Dict[str, int] = {}
+
+    def refresh(self) -> bool:
+        """Recompiler le catalogue si les modèles ont changé, retourne True en cas de rechargement"""
+        db = _get_db(self.db)
+        schedules = db.execute_query("""
+            SELECT id, name, description, updated_at
+            FROM schedules
+            WHERE is_active = 1
+            ORDER BY name, id
+        """)
+        stamp = db.execute_query("SELECT COUNT(*) AS n, MAX(id) AS last FROM schedule_templates")
+        version = (tuple(tuple(row.values()) for row in schedules), tuple(stamp[0].values()) if stamp else None)
+        if version == self._version:
+            return False
+
+        rows = db.execute_query("""
+            SELECT st.schedule_id, st.weekday, st.start_time, st.end_time, st.break_start, st.break_end
+            FROM schedule_templates st
+            JOIN schedules s ON s.id = st.schedule_id
+            WHERE s.is_active = 1
+        """)
+        index = {schedule["id"]: k for k, schedule in enumerate(schedules)}
+        labels = np.full((len(schedules), 7), "", dtype=object)
+        minutes = np.full((len(schedules), 7), -1, dtype=np.int32)
+        days: List[Dict[int, DayTimes]] = [{} for _ in schedules]
+        for row in rows:
+            k, weekday = index[row["schedule_id"]], row["weekday"] - 1
+            if not row["start_time"] or not row["end_time"]:
+                continue
+            start, end = clock_minutes(row["start_time"]), clock_minutes(row["end_time"])
+            pause = 0
+            if row["break_start"] and row["break_end"]:
+                break_start, break_end = clock_minutes(row["break_start"]), clock_minutes(row["break_end"])
+                pause = max(0, min(end, break_end) - max(start, break_start))
+            labels[k, weekday] = shift_label(start, end)
+            minutes[k, weekday] = end - start - pause
+            days[k][weekday] = (row["start_time"], row["end_time"], row["break_start"], row["break_end"])
+
+        self.schedules = [dict(schedule, days=days[k]) for k, schedule in enumerate(schedules)]
+        self.labels, self.minutes = labels, minutes
+        shift_minutes = {}
+        for label, duration in zip(labels[minutes >= 0], minutes[minutes >= 0]):
+            shift_minutes[label] = max(shift_minutes.get(label, 0), int(duration))
+        self.shifts = sorted(shift_minutes, key=lambda label: (clock_minutes(label.split("-")[0]), label))
+        self.shift_minutes = shift_minutes
+        self._version = version
+        logger.info(f"✅ Catalogue des horaires compilé : {len(schedules)} modèle(s), {len(self.shifts)} créneau(x)")
+        return True
+
+    def schedule_index(self, schedule_id: int) -> int:
+        """Rang d'un modèle actif dans le catalogue"""
+        self.refresh()
+        for k, schedule in enumerate(self.schedules):
+            if schedule["id"] == schedule_id:
+                return k
+        raise KeyError(f"Modèle d'horaire inconnu ou inactif : {schedule_id}")
+
+    def save_schedule(self, name: str, days: Dict[int, DayTimes], description: str = "",
+                      schedule_id: Optional[int] = None, created_by: Optional[int] = None) -> int:
+        """Créer ou remplacer un modèle et ses heures par jour (0 = lundi), en une transaction"""
+        db = _get_db(self.db)
+        queries = []
+        if schedule_id is None:
+            # Nouveau modèle : ses jours reprennent l'identifiant créé dans la même transaction
+            queries.append(("INSERT INTO schedules (name, description, created_by) VALUES (?, ?, ?)",
+                            (name, description, created_by)))
+            target, target_params = "(SELECT MAX(id) FROM schedules)", ()
+        else:
+            queries.append(("UPDATE schedules SET name = ?, description = ? WHERE id = ?",
+                            (name, description, schedule_id)))
+            target, target_params = "?", (schedule_id,)
+        queries.append((f"DELETE FROM schedule_templates WHERE schedule_id = {target}", target_params))
+        queries.extend(
+            ("INSERT INTO schedule_templates (schedule_id, weekday, start_time, end_time, break_start, break_end) "
+             f"VALUES ({target}, ?, ?, ?, ?, ?)", (*target_params, weekday + 1, *times))
+            for weekday, times in sorted(days.items())
+        )
+        if not db.execute_transaction(queries):
+            raise RuntimeError(f"Échec de l'enregistrement du modèle d'horaire {name}")
+        if schedule_id is None:
+            schedule_id = db.execute_query("SELECT MAX(id) AS id FROM schedules")[0]["id"]
+        logger.info(f"✅ Modèle d'horaire {name} enregistré ({len(days)} jour(s))")
+        return schedule_id
+
+    def deactivate_schedule(self, schedule_id: int):
+        """Retirer un modèle du catalogue (les plannings déjà écrits sont conservés)"""
+        _get_db(self.db).execute_query("UPDATE schedules SET is_active = 0 WHERE id = ?", (schedule_id,),
+                                       fetch=False)
+
+    def apply_template(self, schedule_id: int, agents: List[str], start_date: date, end_date: date,
+                       skip_holidays: bool = True) -> int:
+        """Écrire les horaires d'un modèle sur une période pour des agents, en une transaction
+
+        Chaque jour travaillé du modèle reçoit son créneau sur les lignes de journée
+        (matin et après-midi) de la table planning : les lignes existantes gardent
+        leur poste, les autres sont créées sans poste, les astreintes ne sont pas
+        remplacées. Le registre d'équité est mis à jour dans la même transaction.
+        Retourne le nombre de lignes écrites.
+        """
+        k = self.schedule_index(schedule_id)
+        labels = self.labels[k]
+        days = date_range(start_date, end_date)
+        worked = labels[[day.weekday() for day in days]] != ""
+        if skip_holidays:
+            worked &= ~holiday_mask(start_date, end_date)
+
+        from .ledger import ledger_queries
+        db = _get_db(self.db)
+        user_ids = resolve_user_ids(agents, db)
+        oncall = {(row["date"], row["user_id"], row["shift"]) for row in db.execute_query(
+            "SELECT date, user_id, shift FROM planning WHERE schedule = ? AND date BETWEEN ? AND ?",
+            (ONCALL_SCHEDULE, start_date.isoformat(), end_date.isoformat()))}
+        rows = [(days[d].isoformat(), user_id, shift, labels[days[d].weekday()], ONCALL_SCHEDULE)
+                for user_id in user_ids.values() for d in np.flatnonzero(worked) for shift in DAY_SHIFTS
+                if (days[d].isoformat(), user_id, shift) not in oncall]
+        queries = ledger_queries(start_date, end_date, -1)
+        queries.extend(
+            ("INSERT INTO planning (date, user_id, shift, schedule, status) VALUES (?, ?, ?, ?, 'planned') "
+             "ON CONFLICT (date, user_id, shift) DO UPDATE SET schedule = excluded.schedule, "
+             "updated_at = CURRENT_TIMESTAMP WHERE planning.schedule IS NOT ?", row)
+            for row in rows
+        )
+        queries.extend(ledger_queries(start_date, end_date, 1))
+        if not db.execute_transaction(queries):
+            raise RuntimeError("Échec de l'application du modèle d'horaire au planning")
+        logger.info(f"✅ Modèle d'horaire appliqué du {start_date} au {end_date} : {len(rows)} ligne(s)")
+        return len(rows)
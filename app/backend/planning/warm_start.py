@@ -0,0 +1,82 @@
+# app/backend/planning/warm_start.py
+# Démarrage à chaud : planning de référence projeté sur la période et rendu réalisable
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+from .config import DAY_SHIFTS, SHIFTS
+from .counters import LoadCounters
+from .problem import PlanningProblem
+from .repair import repair_plan
+from .solvers import PlanningSolver, _assign
+from .store import AssignmentStore, position_code
+
+logger = logging.getLogger(__name__)
+
+_DAY_SHIFTS = [SHIFTS.index(shift) for shift in DAY_SHIFTS]
+
+
+def project_reference(reference: AssignmentStore, agents, positions, start_date, n_days: int) -> np.ndarray:
+    """Poste de référence (indice dans ``positions``, -1 = aucun) par agent et par jour
+
+    Un jour couvert par la référence reprend son poste ; un jour postérieur reprend
+    le même jour de la semaine dans la dernière semaine de la référence (par exemple
+    la semaine précédente tirée de la table planning).
+    """
+    preferred = np.full((len(agents), n_days), -1, dtype=np.int16)
+    index = {position_code(position): p for p, position in enumerate(positions)}
+    lookup = np.array([-1] + [index.get(position_code(position), -1) for position in reference.positions],
+                      dtype=np.int16)
+
+    offsets = np.arange(n_days) + (start_date - reference.start_date).days
+    late = offsets >= reference.n_days
+    offsets[late] -= 7 * -(-(offsets[late] - reference.n_days + 1) // 7)
+    days = np.flatnonzero(offsets >= 0)
+    for a, agent in enumerate(agents):
+        if agent in reference.agents:
+            codes = reference.position_grid[reference.agent_index(agent), offsets[days], _DAY_SHIFTS[0]]
+            preferred[a, days] = lookup[codes]
+    return preferred
+
+
+def initial_plan(problem: PlanningProblem) -> AssignmentStore:
+    """Planning initial : postes de référence encore possibles, puis places libres complétées
+
+    Les cellules de ``problem.preferred`` sont conservées dans l'ordre chronologique
+    tant que l'agent est disponible et éligible, que le poste est ouvert et que les
+    limites (places du poste, limite hebdomadaire) le permettent ; la réparation
+    incrémentale remplit ensuite les places restantes.
+    """
+    store = problem.new_store()
+    counters = LoadCounters(store)
+    kept = np.zeros((len(problem.agents), problem.n_days), dtype=bool)
+    filled = np.zeros(problem.demand_max.shape, dtype=np.int32)
+    for d, a in sorted(zip(*np.nonzero(problem.preferred.T >= 0))):
+        p = int(problem.preferred[a, d])
+        if (problem.available[a, d] and problem.static_scores[a, p] >= 0
+                and filled[d, p] < problem.demand_max[d, p]
+                and counters.weekly_load(a, d) < problem.max_weekdays[a]):
+            _assign(store, counters, int(a), int(d), p)
+            filled[d, p] += 1
+            kept[a, d] = True
+
+    open_days = np.flatnonzero(problem.demand_max.any(axis=1))
+    result = repair_plan(problem, store, pinned=kept, days=open_days)
+    logger.info(f"♨️ Démarrage à chaud : {int(kept.sum())} affectation(s) reprise(s) de la référence")
+    return result.store
+
+
+class WarmStartSolver(PlanningSolver):
+    """Recopie d'un planning initial sur les jours demandés (repli du solveur exact à l'échéance)"""
+
+    name = "warm_start"
+
+    def __init__(self, initial: Optional[AssignmentStore] = None):
+        self.initial = initial
+
+    def solve_days(self, problem, store, counters, days):
+        for d in days:
+            for a in np.flatnonzero(self.initial.position_grid[:, d, _DAY_SHIFTS[0]]):
+                _assign(store, counters, int(a), int(d), int(self.initial.position_grid[a, d, _DAY_SHIFTS[0]]) - 1)
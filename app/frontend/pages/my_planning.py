@@ -4,6 +4,7 @@
 import streamlit as st
 from datetime import date, timedelta
 import pandas as pd
+from app.backend.planning.holidays import is_holiday as is_belgian_holiday
 
 def run():
     """Main function to run the my planning page"""
@@ -350,52 +351,8 @@ def display_planning_table(planning_data):
 
 def is_holiday(date_obj):
     """Vérifier si une date est un jour férié belge"""
-    year = date_obj.year
-    
-    # Jours fériés fixes belges
-    fixed_holidays = [
-        (1, 1),    # 1er janvier - Nouvel An
-        (5, 1),    # 1er mai - Fête du travail
-        (7, 21),   # 21 juillet - Fête nationale belge
-        (8, 15),   # 15 août - Assomption
-        (11, 1),   # 1er novembre - Toussaint
-        (11, 11),  # 11 novembre - Armistice 1918
-        (12, 25),  # 25 décembre - Noël
-    ]
-    
-    # Jours fériés variables (calculés)
-    # Pâques (dimanche après la première pleine lune du printemps)
-    # Simplification : utiliser des dates approximatives pour les années courantes
-    easter_dates = {
-        2024: (3, 31),  # 31 mars 2024
-        2025: (4, 20),  # 20 avril 2025
-        2026: (4, 5),   # 5 avril 2026
-        2027: (3, 28),  # 28 mars 2027
-        2028: (4, 16),  # 16 avril 2028
-        2029: (4, 1),   # 1er avril 2029
-        2030: (4, 21),  # 21 avril 2030
-    }
-    
-    # Vérifier les jours fériés fixes
-    if (date_obj.month, date_obj.day) in fixed_holidays:
-        return True
-    
-    # Vérifier Pâques et les jours associés
-    if year in easter_dates:
-        easter_month, easter_day = easter_dates[year]
-        easter_date = date(year, easter_month, easter_day)
-        
-        # Lundi de Pâques (jour suivant Pâques)
-        easter_monday = easter_date + timedelta(days=1)
-        # Jeudi de l'Ascension (39 jours après Pâques)
-        ascension = easter_date + timedelta(days=39)
-        # Lundi de Pentecôte (50 jours après Pâques)
-        pentecote = easter_date + timedelta(days=50)
-        
-        if date_obj in [easter_monday, ascension, pentecote]:
-            return True
-    
-    return False
+    # Calendrier partagé avec le moteur de planification (Pâques calculé pour toute année)
+    return is_belgian_holiday(date_obj)
 
 def create_sample_planning(username, start_date, end_date):
     """Créer un planning fictif pour l'exemple (à remplacer par les vraies données)"""
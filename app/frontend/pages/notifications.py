@@ -2,9 +2,12 @@
 # Centre de notifications pour les demandes et signalements
 
 import streamlit as st
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import json
 import os
+from app.backend.planning import match_agent
+from app.backend.planning.config import DEFAULT_POSITIONS, DEFAULT_TECHNICIANS
+from app.frontend.utils import get_planning_engine, get_planning_store, get_schedules, save_planning
 
 def load_availability_data():
     """Charger les données de disponibilité depuis le fichier JSON"""
@@ -38,6 +41,38 @@ def get_user_role_and_sector(username):
         return user_info.get("role"), user_info.get("secteur")
     return None, None
 
+def repair_planning_after_approval(item):
+    """Réparer le planning après l'approbation d'un congé ou d'une absence, puis l'enregistrer
+
+    Seuls les jours de l'absence sont recalculés ; les saisies manuelles sont conservées.
+    Les semaines réparées sont écrites dans la table planning (registre d'équité compris).
+    """
+    request = item['data']
+    if item['type'] == "Demande de congé":
+        start_date = date.fromisoformat(request['start_date'])
+        end_date = date.fromisoformat(request['end_date'])
+        absent_days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    else:
+        absent_days = [date.fromisoformat(request['date'])]
+    
+    # Plan de la session, complété depuis la table planning sur les semaines de l'absence
+    first_day = absent_days[0] - timedelta(days=absent_days[0].weekday())
+    last_day = absent_days[-1] + timedelta(days=6 - absent_days[-1].weekday())
+    store = get_planning_store(DEFAULT_TECHNICIANS, first_day, last_day, DEFAULT_POSITIONS, get_schedules())
+    
+    # Agent du planning correspondant au demandeur (identifiant ou prénom)
+    agent = match_agent(item['username'], store.agents, load_users_database())
+    if agent is None:
+        return None
+    
+    # Même moteur que la page planning : congés approuvés, calendrier des postes, limites
+    # d'heures, jours fériés, préférences et registre d'équité
+    engine = get_planning_engine(store.positions, store.schedules)
+    result = engine.repair(store, {agent: absent_days}, pinned=st.session_state.get("planning_pinned", ()))
+    store.update_from(result.store)
+    save_planning(store, store.agents, result.store.start_date, result.store.end_date)
+    return result
+
 def run():
     """Main function to run the notifications page"""
     # Vérifier l'authentification
@@ -67,6 +102,11 @@ def run():
         </div>
         """, unsafe_allow_html=True)
     
+    # Résumé de la dernière réparation du planning, conservé pendant le rerun
+    repair_summary = st.session_state.pop("repair_summary", None)
+    if repair_summary:
+        st.info(repair_summary)
+    
     st.info(f"👤 **Utilisateur :** {current_username} | **Rôle :** {current_user_role.title()} | **Secteur :** {current_user_secteur}", icon="ℹ️")
     
     # Charger les données de disponibilité
@@ -169,6 +209,11 @@ def run():
                                             with open("data/user_availability.json", "w", encoding="utf-8") as f:
                                                 json.dump(availability_data, f, ensure_ascii=False, indent=2)
                                             st.success("✅ Demande approuvée !")
+                                            repaired = repair_planning_after_approval(item)
+                                            if repaired is not None:
+                                                # Affiché après le rerun, en haut de la page
+                                                st.session_state.repair_summary = (
+                                                    f"🩹 Planning réparé et enregistré : {repaired.summary()}")
                                             st.rerun()
                                         except Exception as e:
                                             st.error(f"❌ Erreur lors de la sauvegarde : {e}")
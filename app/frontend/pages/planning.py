@@ -2,10 +2,17 @@
 # Planning page for micPlan
 
 import streamlit as st
-from app.frontend.utils import show_footer, add_bottom_spacing
+from app.frontend.utils import (show_footer, add_bottom_spacing, get_planning_engine, get_planning_store,
+                                get_plan_metrics, get_ledger_counts, get_schedules, get_shift_catalog,
+                                save_planning)
 import pandas as pd
 import datetime
 from datetime import date, timedelta
+from app.backend.planning import (RosterPattern, SolutionCache, load_oncall, load_schedule_counts, load_store,
+                                  position_code, save_oncall)
+from app.backend.planning.config import (
+    DEFAULT_TECHNICIANS, DEFAULT_POSITIONS, ONCALL_SCHEDULE, PARTITION_MIN_WEEKS
+)
 
 def run():
     show_footer()
@@ -156,150 +163,12 @@ def run():
         dates.append(current_date)
         current_date += timedelta(days=1)
     
-    # Real technicians from the team
-    technician_options = [
-        "Melissa",
-        "Laetitia", 
-        "Michaël",
-        "Olivier",
-        "Patrick",
-        "Caroline",
-        "Fabrice",
-        "Giuseppina"
-    ]
-    
-    # Define the 9 possible positions
-    positions = [
-        "P1 : Tri & urgences",
-        "P2 : Extraction", 
-        "P3 : PCR & détection",
-        "P4 : Génotypage HCV",
-        "P5 : NGS HIV",
-        "P6 : Alinity",
-        "P7 : C6800",
-        "P8 : QC & maintenances",
-        "P9 : Mycoses"
-    ]
-    
-    # Define the 5 possible schedules
-    schedules = [
-        "8h00-16h00",
-        "8h30-16h30", 
-        "9h00-17h00",
-        "9h30-17h30",
-        "10h00-18h00"
-    ]
-    
-    # Agent database with rules and constraints
-    agent_database = {
-        "Melissa": {
-            "unavailable_days": ["Monday"],  # Never available on Monday
-            "preferred_positions": ["P1", "P2", "P3"],  # Prefers front-end positions
-            "max_weekdays_per_week": 4,  # Maximum 4 weekdays per week
-            "specialization": "Front-end processing"
-        },
-        "Laetitia": {
-            "unavailable_days": [],
-            "preferred_positions": ["P4", "P5", "P6"],  # Prefers molecular biology
-            "max_weekdays_per_week": 5,
-            "specialization": "Molecular biology"
-        },
-        "Michaël": {
-            "unavailable_days": [],
-            "preferred_positions": ["P7", "P8"],  # Prefers equipment and QC
-            "max_weekdays_per_week": 5,
-            "specialization": "Equipment and QC"
-        },
-        "Olivier": {
-            "unavailable_days": [],
-            "preferred_positions": ["P1", "P2", "P8"],  # Flexible, can do multiple types
-            "max_weekdays_per_week": 5,
-            "specialization": "Generalist"
-        },
-        "Patrick": {
-            "unavailable_days": [],
-            "preferred_positions": ["P3", "P4", "P5"],  # Prefers molecular biology
-            "max_weekdays_per_week": 5,
-            "specialization": "Molecular biology"
-        },
-        "Caroline": {
-            "unavailable_days": [],
-            "preferred_positions": ["P9"],  # ONLY position 9 (Mycoses)
-            "max_weekdays_per_week": 5,
-            "specialization": "Mycoses specialist"
-        },
-        "Fabrice": {
-            "unavailable_days": ["Friday"],  # Never available on Friday
-            "preferred_positions": ["P6", "P7"],  # Prefers equipment positions
-            "max_weekdays_per_week": 4,
-            "specialization": "Equipment specialist"
-        },
-        "Giuseppina": {
-            "unavailable_days": [],
-            "preferred_positions": ["P1", "P2", "P3"],  # Prefers front-end
-            "max_weekdays_per_week": 5,
-            "specialization": "Front-end processing"
-        }
-    }
-    
-    # Position constraints and rules
-    position_rules = {
-        "P1 : Tri & urgences": {
-            "min_agents_per_day": 1,
-            "max_agents_per_day": 1,
-            "priority": "High",  # Critical position
-            "required_skills": ["Front-end processing"]
-        },
-        "P2 : Extraction": {
-            "min_agents_per_day": 1,
-            "max_agents_per_day": 2,
-            "priority": "High",
-            "required_skills": ["Front-end processing"]
-        },
-        "P3 : PCR & détection": {
-            "min_agents_per_day": 1,
-            "max_agents_per_day": 1,
-            "priority": "High",
-            "required_skills": ["Molecular biology"]
-        },
-        "P4 : Génotypage HCV": {
-            "min_agents_per_day": 1,
-            "max_agents_per_day": 1,
-            "priority": "Medium",
-            "required_skills": ["Molecular biology"]
-        },
-        "P5 : NGS HIV": {
-            "min_agents_per_day": 1,
-            "max_agents_per_day": 1,
-            "priority": "Medium",
-            "required_skills": ["Molecular biology"]
-        },
-        "P6 : Alinity": {
-            "min_agents_per_day": 1,
-            "max_agents_per_day": 1,
-            "priority": "Medium",
-            "required_skills": ["Equipment specialist"]
-        },
-        "P7 : C6800": {
-            "min_agents_per_day": 1,
-            "max_agents_per_day": 1,
-            "priority": "Medium",
-            "required_skills": ["Equipment specialist"]
-        },
-        "P8 : QC & maintenances": {
-            "min_agents_per_day": 1,
-            "max_agents_per_day": 1,
-            "priority": "Low",
-            "required_skills": ["Equipment and QC", "Generalist"]
-        },
-        "P9 : Mycoses": {
-            "min_agents_per_day": 1,
-            "max_agents_per_day": 1,
-            "priority": "Low",
-            "required_skills": ["Mycoses specialist"],  # Only Caroline
-            "exclusive_agent": "Caroline"  # This position is exclusive to Caroline
-        }
-    }
+    # Real technicians, positions, schedules and rules from the planning engine
+    technician_options = list(DEFAULT_TECHNICIANS)
+    positions = list(DEFAULT_POSITIONS)
+    # Schedules come from the templates of the settings page (compiled catalogue), defaults otherwise
+    shift_catalog = get_shift_catalog()
+    schedules = get_schedules()
     
     # Create multi-level column headers
     columns = [("Technicien", "")]
@@ -379,122 +248,64 @@ def run():
     # Extract technician names from selected options (now they are just names)
     filtered_technicians = selected_technicians.copy()
     
+    # Dense assignment store (agents × days × shifts) kept in the session, read from the planning table
+    store = get_planning_store(technician_options, start_date, end_date, positions, schedules)
+    # Manually edited cells (agent, date), kept when the plan is repaired after a leave approval
+    if "planning_pinned" not in st.session_state:
+        st.session_state.planning_pinned = set()
+    pinned = st.session_state.planning_pinned
+    
+    # Every change is written to the planning table at once, so the fairness ledger and the
+    # rotations count what is planned on this page
+    def save_plan(technicians, start_date, end_date):
+        """Save the displayed plan of these technicians, the outcome shown after the rerun"""
+        try:
+            written, skipped = save_planning(store, technicians, start_date, end_date)
+            if skipped:
+                st.session_state.planning_notice = (f"⚠️ {skipped} affectation(s) non enregistrée(s) : "
+                                                    f"créneau déjà confirmé ou d'astreinte")
+        except Exception as e:
+            st.session_state.planning_notice = f"❌ Erreur lors de l'enregistrement du planning: {e}"
+    
+    notice = st.session_state.pop("planning_notice", None)
+    if notice:
+        st.warning(notice)
+    
+    def unpin_range(technicians, start_date, end_date):
+        """Forget manual edits overwritten by a full re-run or a clear"""
+        pinned.difference_update({(tech, day) for tech, day in pinned
+                                  if tech in technicians and start_date <= day <= end_date})
+    
     # Function to automatically assign positions based on rules
     def auto_assign_positions(start_date, end_date, selected_technicians):
-        """Automatically assign positions based on agent rules and constraints"""
-        from datetime import timedelta
-        
-        # Clear existing assignments for the period
-        current_date = start_date
-        while current_date <= end_date:
-            for tech in selected_technicians:
-                day_key = f"{tech}_{current_date.strftime('%Y-%m-%d')}"
-                if day_key in st.session_state:
-                    del st.session_state[day_key]
-            current_date += timedelta(days=1)
-        
-        # Reset to start date
-        current_date = start_date
-        
-        while current_date <= end_date:
-            if current_date.weekday() < 5:  # Weekdays only
-                day_name = current_date.strftime("%A")
-                
-                # Get available agents for this day
-                available_agents = []
-                for tech in selected_technicians:
-                    agent_info = agent_database.get(tech, {})
-                    unavailable_days = agent_info.get("unavailable_days", [])
-                    
-                    # Check if agent is available on this day
-                    if day_name not in unavailable_days:
-                        # Check if agent hasn't exceeded weekly limit
-                        week_start = current_date - timedelta(days=current_date.weekday())
-                        week_end = week_start + timedelta(days=4)
-                        
-                        weekly_assignments = 0
-                        check_date = week_start
-                        while check_date <= week_end:
-                            check_key = f"{tech}_{check_date.strftime('%Y-%m-%d')}"
-                            if check_key in st.session_state and st.session_state[check_key]:
-                                weekly_assignments += 1
-                            check_date += timedelta(days=1)
-                        
-                        max_weekdays = agent_info.get("max_weekdays_per_week", 5)
-                        if weekly_assignments < max_weekdays:
-                            available_agents.append(tech)
-                
-                # Assign positions by priority
-                priority_order = ["High", "Medium", "Low"]
-                
-                for priority in priority_order:
-                    for position in positions:
-                        if position_rules[position]["priority"] == priority:
-                            # Check if position needs assignment
-                            position_assigned = False
-                            
-                            # Check for exclusive agents first
-                            if "exclusive_agent" in position_rules[position]:
-                                exclusive_agent = position_rules[position]["exclusive_agent"]
-                                if exclusive_agent in available_agents:
-                                    # Assign exclusive agent to this position
-                                    day_key = f"{exclusive_agent}_{current_date.strftime('%Y-%m-%d')}"
-                                    st.session_state[day_key] = position
-                                    available_agents.remove(exclusive_agent)
-                                    position_assigned = True
-                                    continue
-                            
-                            # Regular assignment based on skills and preferences
-                            if not position_assigned:
-                                required_skills = position_rules[position]["required_skills"]
-                                
-                                # Find best matching agent
-                                best_agent = None
-                                best_score = -1
-                                
-                                for agent in available_agents:
-                                    agent_info = agent_database.get(agent, {})
-                                    agent_specialization = agent_info.get("specialization", "")
-                                    preferred_positions = agent_info.get("preferred_positions", [])
-                                    
-                                    # Calculate compatibility score
-                                    score = 0
-                                    
-                                    # Skill match
-                                    if agent_specialization in required_skills:
-                                        score += 10
-                                    
-                                    # Position preference
-                                    position_code = position.split(":")[0]
-                                    if position_code in preferred_positions:
-                                        score += 5
-                                    
-                                    # Availability (lower weekly count = higher priority)
-                                    week_start = current_date - timedelta(days=current_date.weekday())
-                                    week_end = week_start + timedelta(days=4)
-                                    
-                                    weekly_assignments = 0
-                                    check_date = week_start
-                                    while check_date <= week_end:
-                                        check_key = f"{agent}_{check_date.strftime('%Y-%m-%d')}"
-                                        if check_key in st.session_state and st.session_state[check_key]:
-                                            weekly_assignments += 1
-                                        check_date += timedelta(days=1)
-                                    
-                                    # Prefer agents with fewer weekly assignments
-                                    score += (5 - weekly_assignments)
-                                    
-                                    if score > best_score:
-                                        best_score = score
-                                        best_agent = agent
-                                
-                                # Assign position to best agent
-                                if best_agent and best_score > 0:
-                                    day_key = f"{best_agent}_{current_date.strftime('%Y-%m-%d')}"
-                                    st.session_state[day_key] = position
-                                    available_agents.remove(best_agent)
-            
-            current_date += timedelta(days=1)
+        """Automatically assign positions with the headless planning engine"""
+        # Positions held less often than the team average over the saved history are favoured
+        engine = get_planning_engine(positions, schedules)
+        # Strategy portfolio on the idle CPU cores, best plan kept at the deadline;
+        # long ranges are split into week blocks solved in parallel instead.
+        # Weeks already solved with the same inputs are read back from the solution cache
+        long_range = (end_date - start_date).days + 1 > PARTITION_MIN_WEEKS * 7
+        # Warm start from the previous week already planned in the session (week-to-week stability)
+        previous_week = store.copy_range(start_date - timedelta(days=7), start_date - timedelta(days=1))
+        reference = previous_week if previous_week.position_grid.any() else None
+        # The problem is compiled once and shared by the coverage check, the method choice and the solve
+        problem = engine.build_problem(start_date, end_date, selected_technicians, reference)
+        # Max-flow pre-check: mandatory slots no plan can cover (e.g. exclusive agent absent),
+        # kept in the session so the warning survives the rerun
+        st.session_state.coverage_shortfalls = engine.check_coverage(
+            start_date, end_date, selected_technicians, problem=problem).shortfalls()
+        # Positions open on only part of the day (AM/PM/evening) are planned per half-day
+        if problem.split_shifts():
+            method = "halfday"
+        else:
+            method = "partitioned" if long_range else "portfolio"
+        with st.spinner("🧠 Recherche du meilleur planning..."):
+            result = engine.generate(start_date, end_date, selected_technicians, method=method,
+                                     cache=SolutionCache(), reference=reference, problem=problem)
+        # Schedules are co-assigned with the positions, within each agent's hour limits
+        store.update_from(result)
+        unpin_range(selected_technicians, start_date, end_date)
+        save_plan(selected_technicians, start_date, end_date)
         
         return True
     
@@ -513,16 +324,57 @@ def run():
     with col_auto2:
         if st.button("🗑️ Effacer toutes les affectations", use_container_width=True, key="clear_all"):
             # Clear all assignments for the period
-            current_date = start_date
-            while current_date <= end_date:
-                for tech in filtered_technicians:
-                    day_key = f"{tech}_{current_date.strftime('%Y-%m-%d')}"
-                    if day_key in st.session_state:
-                        del st.session_state[day_key]
-                current_date += timedelta(days=1)
+            store.clear_positions(filtered_technicians, start_date, end_date)
+            unpin_range(filtered_technicians, start_date, end_date)
+            save_plan(filtered_technicians, start_date, end_date)
             st.success("🗑️ Toutes les affectations ont été effacées !")
             st.rerun()
     
+    # Fixed N-week rotation: the N weeks before the period are repeated over it, holidays and
+    # approved leave removed, and only the remaining open places are solved
+    col_roster1, col_roster2 = st.columns(2)
+    with col_roster1:
+        roster_weeks = st.number_input("Cycle du roulement (semaines)", min_value=1, max_value=12, value=2,
+                                       key="roster_weeks")
+    with col_roster2:
+        if st.button("🔁 Dérouler le roulement", use_container_width=True, key="expand_roster"):
+            cycle_start = start_date - timedelta(days=start_date.weekday() + 7 * int(roster_weeks))
+            pattern = RosterPattern.from_store(store, cycle_start, int(roster_weeks))
+            if not pattern.position_codes.any():
+                st.warning("⚠️ Aucune affectation dans les semaines précédant la période à répéter")
+            else:
+                engine = get_planning_engine(positions, schedules)
+                result = engine.expand_roster(pattern, start_date, end_date, filtered_technicians)
+                store.update_from(result.store)
+                unpin_range(filtered_technicians, start_date, end_date)
+                save_plan(filtered_technicians, start_date, end_date)
+                st.success("🔁 Roulement déroulé sur la période !")
+                st.rerun()
+    
+    shortfalls = st.session_state.get("coverage_shortfalls")
+    if shortfalls:
+        st.warning(f"⚠️ {sum(missing for _, _, missing, _ in shortfalls)} place(s) obligatoire(s) "
+                   f"impossible(s) à couvrir")
+        with st.expander("📉 Détail des places non couvrables"):
+            st.dataframe(pd.DataFrame(shortfalls, columns=["Date", "Poste", "Places", "Motif"]),
+                         use_container_width=True, hide_index=True)
+    
+    # Plan quality indicators for the displayed period, re-evaluated only when the plan changes
+    metrics = get_plan_metrics(store, start_date, end_date, positions, schedules)
+    col_m1, col_m2, col_m3, col_m4, col_m5 = st.columns(5)
+    col_m1.metric("🎯 Objectif", f"{metrics['objective']:.0f}")
+    col_m2.metric("❌ Places manquantes", f"{metrics['uncovered']:.0f}")
+    col_m3.metric("⚠️ Dépassements hebdo", f"{metrics['cap_violations']:.0f}")
+    col_m4.metric("⭐ Postes préférés", f"{metrics['preference_rate']:.0%}")
+    col_m5.metric("⚖️ Variance de charge", f"{metrics['load_variance']:.2f}")
+    
+    # Long-horizon fairness: cumulative days per position, read from the ledger (one row per agent and item)
+    with st.expander("📒 Registre d'équité (journées cumulées par poste)"):
+        ledger_counts = get_ledger_counts(store, filtered_technicians, positions)
+        st.dataframe(pd.DataFrame(ledger_counts, index=filtered_technicians,
+                                  columns=[position_code(position) for position in positions]),
+                     use_container_width=True)
+    
     # Add auto-assignment for schedules
     st.markdown("### ⏰ Affectation automatique des horaires")
     
@@ -530,27 +382,13 @@ def run():
     
     with col_schedule1:
         if st.button("⏰ Affectation horaires automatique", use_container_width=True, key="auto_schedule"):
-            # Simple auto-assignment of schedules
-            current_date = start_date
-            while current_date <= end_date:
-                if current_date.weekday() < 5:  # Weekdays only
-                    # Assign schedules in rotation to available agents
-                    available_agents = []
-                    for tech in filtered_technicians:
-                        agent_info = agent_database.get(tech, {})
-                        unavailable_days = agent_info.get("unavailable_days", [])
-                        day_name = current_date.strftime("%A")
-                        
-                        if day_name not in unavailable_days:
-                            available_agents.append(tech)
-                    
-                    # Assign schedules in rotation
-                    for i, tech in enumerate(available_agents):
-                        schedule_index = i % len(schedules)
-                        day_key = f"{tech}_{current_date.strftime('%Y-%m-%d')}_schedule"
-                        st.session_state[day_key] = schedules[schedule_index]
-                
-                current_date += timedelta(days=1)
+            # Fairness-aware rotation: each agent gets the schedule it has held least, counting
+            # the days saved in the planning table before this period, rotations of this page included
+            engine = get_planning_engine(positions, schedules)
+            history = load_schedule_counts(store.agents, schedules, start_date)
+            rotated = engine.rotate_schedules(store.copy_range(start_date, end_date), filtered_technicians, history)
+            store.update_from(rotated, positions=False)
+            save_plan(filtered_technicians, start_date, end_date)
             
             st.success("⏰ Affectation des horaires terminée !")
             st.rerun()
@@ -558,16 +396,51 @@ def run():
     with col_schedule2:
         if st.button("🗑️ Effacer tous les horaires", use_container_width=True, key="clear_schedules"):
             # Clear all schedule assignments for the period
-            current_date = start_date
-            while current_date <= end_date:
-                for tech in filtered_technicians:
-                    day_key = f"{tech}_{current_date.strftime('%Y-%m-%d')}_schedule"
-                    if day_key in st.session_state:
-                        del st.session_state[day_key]
-                current_date += timedelta(days=1)
+            store.clear_schedules(filtered_technicians, start_date, end_date)
+            save_plan(filtered_technicians, start_date, end_date)
             st.success("🗑️ Tous les horaires ont été effacés !")
             st.rerun()
     
+    # Apply a schedule template (settings page) to the period, written to the planning table at once
+    if shift_catalog.schedules:
+        col_template1, col_template2 = st.columns(2)
+        with col_template1:
+            template = st.selectbox("Modèle d'horaire", options=shift_catalog.schedules,
+                                    format_func=lambda schedule: schedule["name"], key="schedule_template")
+        with col_template2:
+            st.markdown("<br>", unsafe_allow_html=True)
+            if st.button("📋 Appliquer le modèle à la période", use_container_width=True, key="apply_template"):
+                try:
+                    rows = shift_catalog.apply_template(template["id"], filtered_technicians, start_date, end_date)
+                    saved = load_store(filtered_technicians, start_date, end_date, positions=positions,
+                                       schedules=schedules)
+                    store.update_from(saved, positions=False)
+                    st.success(f"📋 Modèle {template['name']} appliqué : {rows} lignes écrites")
+                except Exception as e:
+                    st.error(f"❌ Erreur lors de l'application du modèle: {e}")
+                st.rerun()
+    
+    # On-call rotation for weekends and public holidays, fair over the saved history
+    st.markdown("### 📟 Astreintes des week-ends et jours fériés")
+    oncall = load_oncall(technician_options, start_date, end_date)
+    col_oncall1, col_oncall2 = st.columns(2)
+    with col_oncall1:
+        if st.button("📟 Générer les astreintes", use_container_width=True, key="generate_oncall"):
+            engine = get_planning_engine(positions, schedules)
+            history = load_schedule_counts(filtered_technicians, [ONCALL_SCHEDULE], start_date)[:, 0]
+            try:
+                assignments = engine.rotate_oncall(start_date, end_date, filtered_technicians, history)
+                save_oncall(assignments, start_date, end_date)
+                st.success(f"📟 {len(assignments)} journées d'astreinte enregistrées !")
+            except Exception as e:
+                st.error(f"❌ Erreur lors de l'enregistrement des astreintes: {e}")
+            st.rerun()
+    with col_oncall2:
+        if oncall:
+            on_duty = pd.Series(list(oncall.values())).value_counts()
+            st.caption("Journées d'astreinte sur la période : " +
+                       ", ".join(f"{agent} {days}" for agent, days in on_duty.items()))
+    
     st.markdown("---")
     
     # Create tabs for the planning dataframe
@@ -583,8 +456,11 @@ def run():
         # Add technician names as first column
         planning_data["Agents"] = filtered_technicians
         
+        # Vectorized read of the schedules (agents × days)
+        schedule_matrix = store.schedule_labels(filtered_technicians, start_date, end_date)
+        
         # Add columns for each day
-        for day_date in dates:
+        for day_index, day_date in enumerate(dates):
             french_days = {
                 'Mon': 'Lundi', 'Tue': 'Mardi', 'Wed': 'Mercredi', 'Thu': 'Jeudi',
                 'Fri': 'Vendredi', 'Sat': 'Samedi', 'Sun': 'Dimanche'
@@ -601,21 +477,12 @@ def run():
                 day_name_fr = french_days.get(day_name_en, day_name_en)
                 column_name = f"{day_name_fr} {date_str}"
             
-            # Initialize activities for each technician
-            activities = []
-            
-            for tech in filtered_technicians:
-                if day_date.weekday() < 5:  # Weekdays
-                    # Get assigned schedule for this technician for this specific day
-                    day_key = f"{tech}_{day_date.strftime('%Y-%m-%d')}_schedule"
-                    assigned_schedule = st.session_state.get(day_key, "")
-                    
-                    if assigned_schedule:
-                        activities.append(assigned_schedule)
-                    else:
-                        activities.append("")  # No schedule assigned yet
-                else:  # Weekends
-                    activities.append("🏖️")  # Weekend indicator
+            # Activities for each technician (empty when no schedule assigned yet)
+            if day_date.weekday() < 5:  # Weekdays
+                activities = list(schedule_matrix[:, day_index])
+            else:  # Weekends (the on-call technician is shown instead of the weekend indicator)
+                activities = ["📟 Astreinte" if oncall.get(day_date) == tech else "🏖️"
+                              for tech in filtered_technicians]
             
             planning_data[column_name] = activities
         
@@ -714,15 +581,15 @@ def run():
                     if day_date.weekday() < 5:  # Weekdays only
                         new_value = row.get(column_name, "")
                         if pd.notna(new_value) and new_value != "":
-                            day_key = f"{tech_name}_{day_date.strftime('%Y-%m-%d')}_schedule"
-                            old_value = st.session_state.get(day_key, "")
+                            old_value = store.get_schedule(tech_name, day_date)
                             
                             if new_value != old_value:
-                                st.session_state[day_key] = new_value
+                                store.set_schedule(tech_name, day_date, new_value)
                                 changes_made = True
             
             # Rerun if changes were made
             if changes_made:
+                save_plan(filtered_technicians, start_date, end_date)
                 st.rerun()
     
     # Tab 2
@@ -731,7 +598,11 @@ def run():
         planning_data2 = {}
         planning_data2["Technicien"] = filtered_technicians
         
-        for day_date in dates:
+        # Vectorized read of the morning positions (agents × days)
+        position_matrix = store.position_labels("morning", filtered_technicians, start_date, end_date,
+                                                short=period_days > 7)
+        
+        for day_index, day_date in enumerate(dates):
             french_days = {
                 'Mon': 'Lundi', 'Tue': 'Mardi', 'Wed': 'Mercredi', 'Thu': 'Jeudi',
                 'Fri': 'Vendredi', 'Sat': 'Samedi', 'Sun': 'Dimanche'
@@ -747,22 +618,10 @@ def run():
                 day_name_fr = french_days.get(day_name_en, day_name_en)
                 column_name = f"{day_name_fr} {date_str}"
             
-            activities = []
-            for tech in filtered_technicians:
-                if day_date.weekday() < 5:
-                    day_key = f"{tech}_{day_date.strftime('%Y-%m-%d')}"
-                    assigned_position = st.session_state.get(day_key, "")
-                    
-                    if assigned_position:
-                        if period_days > 7:
-                            position_num = assigned_position.split(":")[0]
-                            activities.append(position_num)
-                        else:
-                            activities.append(assigned_position)
-                    else:
-                        activities.append("")
-                else:
-                    activities.append("🏖️")
+            if day_date.weekday() < 5:
+                activities = list(position_matrix[:, day_index])
+            else:
+                activities = ["🏖️"] * len(filtered_technicians)
             
             planning_data2[column_name] = activities
         
@@ -848,14 +707,15 @@ def run():
                     if day_date.weekday() < 5:
                         new_value = row.get(column_name, "")
                         if pd.notna(new_value) and new_value != "":
-                            day_key = f"{tech_name}_{day_date.strftime('%Y-%m-%d')}"
-                            old_value = st.session_state.get(day_key, "")
+                            old_code = store.position_to_code(store.get_position(tech_name, day_date, "morning"))
                             
-                            if new_value != old_value:
-                                st.session_state[day_key] = new_value
+                            if store.position_to_code(new_value) != old_code:
+                                store.set_position(tech_name, day_date, new_value, ["morning"])
+                                pinned.add((tech_name, day_date))
                                 changes_made = True
             
             if changes_made:
+                save_plan(filtered_technicians, start_date, end_date)
                 st.rerun()
     
     # Tab 3
@@ -864,7 +724,11 @@ def run():
         planning_data3 = {}
         planning_data3["Technicien"] = filtered_technicians
         
-        for day_date in dates:
+        # Vectorized read of the afternoon positions (agents × days)
+        position_matrix = store.position_labels("afternoon", filtered_technicians, start_date, end_date,
+                                                short=period_days > 7)
+        
+        for day_index, day_date in enumerate(dates):
             french_days = {
                 'Mon': 'Lundi', 'Tue': 'Mardi', 'Wed': 'Mercredi', 'Thu': 'Jeudi',
                 'Fri': 'Vendredi', 'Sat': 'Samedi', 'Sun': 'Dimanche'
@@ -880,22 +744,10 @@ def run():
                 day_name_fr = french_days.get(day_name_en, day_name_en)
                 column_name = f"{day_name_fr} {date_str}"
             
-            activities = []
-            for tech in filtered_technicians:
-                if day_date.weekday() < 5:
-                    day_key = f"{tech}_{day_date.strftime('%Y-%m-%d')}"
-                    assigned_position = st.session_state.get(day_key, "")
-                    
-                    if assigned_position:
-                        if period_days > 7:
-                            position_num = assigned_position.split(":")[0]
-                            activities.append(position_num)
-                        else:
-                            activities.append(assigned_position)
-                    else:
-                        activities.append("")
-                else:
-                    activities.append("🏖️")
+            if day_date.weekday() < 5:
+                activities = list(position_matrix[:, day_index])
+            else:
+                activities = ["🏖️"] * len(filtered_technicians)
             
             planning_data3[column_name] = activities
         
@@ -981,14 +833,15 @@ def run():
                     if day_date.weekday() < 5:
                         new_value = row.get(column_name, "")
                         if pd.notna(new_value) and new_value != "":
-                            day_key = f"{tech_name}_{day_date.strftime('%Y-%m-%d')}"
-                            old_value = st.session_state.get(day_key, "")
+                            old_code = store.position_to_code(store.get_position(tech_name, day_date, "afternoon"))
                             
-                            if new_value != old_value:
-                                st.session_state[day_key] = new_value
+                            if store.position_to_code(new_value) != old_code:
+                                store.set_position(tech_name, day_date, new_value, ["afternoon"])
+                                pinned.add((tech_name, day_date))
                                 changes_made = True
             
             if changes_made:
+                save_plan(filtered_technicians, start_date, end_date)
                 st.rerun()
     
     st.markdown("---")
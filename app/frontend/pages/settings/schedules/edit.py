@@ -0,0 +1,106 @@
+# app/frontend/pages/settings/schedules/edit.py
+# Création et modification d'un modèle d'horaire (heures par jour de la semaine)
+
+import streamlit as st
+from datetime import time
+from app.backend.planning import resolve_user_ids
+from .list import WEEKDAY_LABELS, get_shift_catalog
+
+def show_schedule_form():
+    """Formulaire de création ou de modification d'un modèle d'horaire"""
+    catalog = get_shift_catalog()
+    schedule_id = st.session_state.get("schedule_to_edit")
+    is_new = schedule_id == "new"
+    schedule = {"name": "", "description": "", "days": {}}
+    if not is_new:
+        schedule = next((item for item in catalog.schedules if item["id"] == schedule_id), None)
+        if schedule is None:
+            st.error("❌ Modèle d'horaire introuvable.")
+            if st.button("⬅️ Retour à la liste", key="back_to_schedules_list"):
+                st.session_state["schedule_to_edit"] = None
+                st.rerun()
+            return
+
+    title = "➕ Nouveau modèle d'horaire" if is_new else f"✏️ Modification du modèle {schedule['name']}"
+    st.markdown(f"""
+        <div style='
+            background: linear-gradient(90deg, #e0effd 0%, #fff5e8 100%);
+            padding: 0rem 2rem;
+            border-radius: 0rem;
+            border-left: 5px solid #2994f2;
+            border-right: 5px solid #fbbf5d;
+            margin-bottom: 2rem;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+        '>
+            <h2 style='margin: 0; font-weight: bold;'>{title}</h2>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with st.form("schedule_form"):
+        name = st.text_input("Nom du modèle *", value=schedule["name"])
+        description = st.text_area("Description", value=schedule["description"] or "")
+
+        st.markdown("### 📅 Heures par jour")
+        days = {}
+        for weekday, label in enumerate(WEEKDAY_LABELS):
+            start, end, break_start, break_end = schedule["days"].get(
+                weekday, ("08:00", "16:00", "12:00", "13:00") if weekday < 5 else (None, None, None, None))
+            col_day, col_start, col_end, col_break_start, col_break_end = st.columns([2, 2, 2, 2, 2])
+            with col_day:
+                worked = st.checkbox(label, value=bool(start), key=f"schedule_day_{schedule_id}_{weekday}")
+            with col_start:
+                start = st.time_input("Début", value=_parse_time(start, "08:00"), key=f"schedule_start_{schedule_id}_{weekday}")
+            with col_end:
+                end = st.time_input("Fin", value=_parse_time(end, "16:00"), key=f"schedule_end_{schedule_id}_{weekday}")
+            with col_break_start:
+                break_start = st.time_input("Début pause", value=_parse_time(break_start, "12:00"),
+                                            key=f"schedule_break_start_{schedule_id}_{weekday}")
+            with col_break_end:
+                break_end = st.time_input("Fin pause", value=_parse_time(break_end, "13:00"),
+                                          key=f"schedule_break_end_{schedule_id}_{weekday}")
+            if worked:
+                days[weekday] = (start.strftime("%H:%M"), end.strftime("%H:%M"),
+                                 break_start.strftime("%H:%M"), break_end.strftime("%H:%M"))
+
+        col_save, col_cancel = st.columns(2)
+        with col_save:
+            submitted = st.form_submit_button("💾 Enregistrer", type="primary", use_container_width=True)
+        with col_cancel:
+            cancelled = st.form_submit_button("❌ Annuler", use_container_width=True)
+
+    if cancelled:
+        st.session_state["schedule_to_edit"] = None
+        st.rerun()
+
+    if submitted:
+        # Validation des heures saisies
+        errors = []
+        if not name.strip():
+            errors.append("Le nom du modèle est obligatoire")
+        for weekday, (start, end, break_start, break_end) in days.items():
+            if end <= start:
+                errors.append(f"{WEEKDAY_LABELS[weekday]} : la fin doit être après le début")
+            if break_end < break_start:
+                errors.append(f"{WEEKDAY_LABELS[weekday]} : la fin de pause doit être après son début")
+        if errors:
+            for error in errors:
+                st.error(f"❌ {error}")
+            return
+
+        try:
+            username = st.session_state.get("username", "")
+            catalog.save_schedule(name.strip(), days, description.strip(),
+                                  schedule_id=None if is_new else schedule_id,
+                                  created_by=resolve_user_ids([username]).get(username) if username else None)
+            st.success(f"✅ Modèle {name.strip()} enregistré avec succès !")
+            st.session_state["schedule_to_edit"] = None
+            st.rerun()
+        except Exception as e:
+            st.error(f"❌ Erreur lors de l'enregistrement: {e}")
+
+def _parse_time(value, default):
+    """Heure "HH:MM" de la base vers datetime.time"""
+    hours, minutes = (value or default).split(":")[:2]
+    return time(int(hours), int(minutes))
@@ -0,0 +1,107 @@
+# app/frontend/pages/settings/schedules/list.py
+# Liste des modèles d'horaires compilés depuis la base SQLite
+
+import streamlit as st
+import pandas as pd
+from app.backend.database import db
+from app.frontend.utils import get_shift_catalog
+
+WEEKDAY_LABELS = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
+
+def show_schedules_list():
+    """Afficher la liste des modèles d'horaires"""
+
+    # Initialiser la base de données si nécessaire
+    try:
+        if not hasattr(db, 'is_initialized') or not db.is_initialized:
+            db.initialize()
+            st.success("✅ Base de données initialisée avec succès")
+    except Exception as e:
+        st.error(f"❌ Erreur d'initialisation de la base de données: {e}")
+        return
+
+    # Header de la page
+    st.markdown("""
+        <div style='
+            background: linear-gradient(90deg, #e0effd 0%, #fff5e8 100%);
+            padding: 0rem 2rem;
+            border-radius: 0rem;
+            border-left: 5px solid #2994f2;
+            border-right: 5px solid #fbbf5d;
+            margin-bottom: 2rem;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+        '>
+            <h2 style='margin: 0; font-weight: bold;'>🕐 Configuration des horaires</h2>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.info("Configurez les horaires de travail et les plannings du laboratoire.", icon="ℹ️")
+
+    try:
+        catalog = get_shift_catalog()
+    except Exception as e:
+        st.error(f"❌ Erreur lors de la récupération des horaires: {e}")
+        return
+
+    # Bouton pour créer un nouveau modèle
+    col1, col2 = st.columns([3, 1])
+    with col2:
+        if st.button("➕ Nouveau modèle", type="primary", use_container_width=True):
+            st.session_state["schedule_to_edit"] = "new"
+            st.rerun()
+
+    if not catalog.schedules:
+        st.warning("⚠️ Aucun modèle d'horaire configuré : le planning utilise les horaires par défaut.")
+    else:
+        # Un modèle par ligne, un créneau par jour de la semaine
+        st.markdown("### Liste des modèles configurés")
+        df_data = []
+        for k, schedule in enumerate(catalog.schedules):
+            row = {"Nom": schedule["name"]}
+            for weekday, label in enumerate(WEEKDAY_LABELS):
+                row[label] = catalog.labels[k, weekday] or "🏖️"
+            worked = catalog.minutes[k][catalog.minutes[k] >= 0]
+            row["Heures / semaine"] = f"{worked.sum() / 60:g}h"
+            row["Description"] = schedule["description"] or ""
+            df_data.append(row)
+        st.dataframe(pd.DataFrame(df_data), use_container_width=True, hide_index=True)
+
+        # Créneaux proposés dans le planning, avec leur durée travaillée
+        st.markdown("### ⏰ Créneaux du planning")
+        st.dataframe(pd.DataFrame([
+            {"Créneau": shift, "Durée": f"{catalog.shift_minutes[shift] // 60}h{catalog.shift_minutes[shift] % 60:02d}"}
+            for shift in catalog.shifts
+        ]), use_container_width=True, hide_index=True)
+
+        # Sélection d'un modèle pour modification
+        st.markdown("---")
+        st.markdown("### 🔧 Modifier un modèle")
+        selected = st.selectbox(
+            "Sélectionner un modèle à modifier",
+            options=catalog.schedules,
+            format_func=lambda schedule: schedule["name"]
+        )
+        col_modify, col_delete = st.columns([1, 1])
+        with col_modify:
+            if st.button("✏️ Modifier", key=f"modify_schedule_{selected['id']}", use_container_width=True):
+                st.session_state["schedule_to_edit"] = selected["id"]
+                st.rerun()
+        with col_delete:
+            if st.button("🗑️ Supprimer", key=f"delete_schedule_{selected['id']}", use_container_width=True,
+                         type="secondary"):
+                try:
+                    catalog.deactivate_schedule(selected["id"])
+                    st.success(f"✅ Modèle {selected['name']} supprimé avec succès !")
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"❌ Erreur lors de la suppression: {e}")
+
+    # Bouton retour
+    st.divider()
+    col_back, col_mid, col_right = st.columns([1, 4, 1])
+    with col_back:
+        if st.button("⬅️ Back", key="back_to_main_config", use_container_width=True):
+            st.session_state["current_config_page"] = None
+            st.rerun()
@@ -2,5 +2,10 @@
 # Frontend utilities module initialization
 
 from .utils import show_footer, add_bottom_spacing
+from .planning import (get_shift_catalog, get_schedules, get_demand_calendar, get_preference_tensor,
+                       get_planning_engine, get_planning_store, get_plan_metrics, get_ledger_counts,
+                       save_planning)
 
-__all__ = ['show_footer', 'add_bottom_spacing']
+__all__ = ['show_footer', 'add_bottom_spacing', 'get_shift_catalog', 'get_schedules', 'get_demand_calendar',
+           'get_preference_tensor', 'get_planning_engine', 'get_planning_store',
+           'get_plan_metrics', 'get_ledger_counts', 'save_planning']
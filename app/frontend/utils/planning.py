@@ -0,0 +1,99 @@
+# app/frontend/utils/planning.py
+# Planning engine, plan and schedule catalogue shared by the planning, notifications and settings pages
+
+import streamlit as st
+from app.backend.planning import (AbsenceIndex, DemandCalendar, FairnessLedger, PlanningEngine, PreferenceTensor,
+                                  ShiftCatalog, attach_hours, load_store, save_result)
+from app.backend.planning.config import DEFAULT_AGENT_DATABASE, DEFAULT_POSITION_RULES, DEFAULT_SCHEDULES
+
+def get_shift_catalog():
+    """Schedule catalogue shared by the session (recompiled only when the templates change)"""
+    if "shift_catalog" not in st.session_state:
+        st.session_state.shift_catalog = ShiftCatalog()
+    catalog = st.session_state.shift_catalog
+    catalog.refresh()
+    return catalog
+
+def get_schedules():
+    """Schedules of the templates from the settings page, defaults when none is configured"""
+    return list(get_shift_catalog().shifts or DEFAULT_SCHEDULES)
+
+def get_demand_calendar():
+    """Position opening days compiled from position_frequency_config, recompiled only when the table changes"""
+    if "demand_calendar" not in st.session_state:
+        st.session_state.demand_calendar = DemandCalendar()
+    return st.session_state.demand_calendar
+
+def get_preference_tensor():
+    """Day/shift preferences, recompiled only when the table or the availability file changes"""
+    if "preference_tensor" not in st.session_state:
+        st.session_state.preference_tensor = PreferenceTensor()
+    return st.session_state.preference_tensor
+
+def get_planning_engine(positions, schedules):
+    """Planning engine with every input of the page, so a repair sees the same rules as a full run
+
+    Hour limits, approved leave and absences are read at each call, so a fresh approval is never
+    missed; positions are closed on public holidays and rotated over the fairness ledger.
+    """
+    return PlanningEngine(attach_hours(DEFAULT_AGENT_DATABASE), DEFAULT_POSITION_RULES, positions, schedules,
+                          get_demand_calendar(), AbsenceIndex.load(), get_preference_tensor(), FairnessLedger(),
+                          holidays=True)
+
+def get_planning_store(agents, start_date, end_date, positions, schedules):
+    """Plan kept in the session (agents × days × shifts), read from the planning table
+
+    Days the session does not cover yet are loaded before being shown, so saving the session plan
+    never overwrites saved rows with empty cells.
+    """
+    store = st.session_state.get("planning_store")
+    if store is None:
+        store = load_store(list(agents), start_date, end_date, positions=positions, schedules=schedules)
+    else:
+        if store.schedules != schedules:
+            # Templates changed: keep positions and the schedules still in the catalogue
+            store = store.with_schedules(schedules)
+        missing = [agent for agent in agents if agent not in store.agents]
+        if missing or not (store.contains(start_date) and store.contains(end_date)):
+            # Whole new span read back, then the session cells laid over it
+            saved = load_store(store.agents + missing, min(start_date, store.start_date),
+                               max(end_date, store.end_date), positions=store.positions, schedules=store.schedules)
+            saved.update_from(store)
+            store = saved
+    st.session_state.planning_store = store
+    return store
+
+def save_planning(store, agents, start_date, end_date):
+    """Write the session plan of these agents over the period to the planning table
+
+    The fairness ledger is updated in the same transaction, so rotations and the ledger shown on
+    the page count what was planned here. Returns the numbers of written and skipped rows.
+    """
+    return save_result(store.copy_range(start_date, end_date, agents))
+
+def get_plan_metrics(store, start_date, end_date, positions, schedules):
+    """Quality indicators of the displayed plan, re-evaluated only when the plan itself changes
+
+    Cached in the session under the fingerprint of the displayed cells, so a rerender that does
+    not touch the plan neither recompiles the problem nor re-runs the evaluation.
+    """
+    plan = store.copy_range(start_date, end_date)
+    key = plan.fingerprint()
+    cached = st.session_state.get("planning_metrics")
+    if cached is None or cached[0] != key:
+        cached = (key, get_planning_engine(positions, schedules).evaluate(plan))
+        st.session_state.planning_metrics = cached
+    return cached[1]
+
+def get_ledger_counts(store, agents, positions):
+    """Cumulative days per position from the fairness ledger, re-read only after the plan changed
+
+    Every change of the session plan is saved with its ledger update, so the fingerprint of the
+    whole session plan is enough to know when the table has to be read again.
+    """
+    key = (store.fingerprint(), tuple(agents), tuple(positions))
+    cached = st.session_state.get("planning_ledger_counts")
+    if cached is None or cached[0] != key:
+        cached = (key, FairnessLedger().positions(list(agents), positions))
+        st.session_state.planning_ledger_counts = cached
+    return cached[1]
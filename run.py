@@ -2,6 +2,7 @@
 # run.py
 # Simple launcher for micPlan
 
+import multiprocessing
 import subprocess
 import sys
 import os
@@ -53,4 +54,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Packaged executable: planning worker processes start through this entry point
+    multiprocessing.freeze_support()
     main()
@@ -23,6 +23,9 @@ def test_imports():
         import app.backend.logging.logger
         print("✅ Logging module imported")
         
+        import app.backend.planning
+        print("✅ Planning engine module imported")
+        
         import app.frontend.utils.utils
         print("✅ Utils module imported")
         
@@ -49,6 +52,248 @@ def test_config():
         print(f"❌ Configuration error: {e}")
         return False
 
+def test_week_frequency_across_years():
+    """Test that "une semaine sur N" keeps alternating across a year boundary"""
+    from datetime import date, timedelta
+    import numpy as np
+    from app.backend.planning.demand import open_weeks
+
+    print("\n📆 Testing week frequencies across years...")
+    # 2026 has 53 ISO weeks: week 53 (28/12/2026) and week 1 of 2027 must alternate
+    mondays = [date(2026, 11, 30) + timedelta(weeks=w) for w in range(12)]
+    for period in (2, 3, 4):
+        opened = open_weeks(None, period, mondays)
+        gaps = set(np.diff(np.flatnonzero(opened)))
+        assert gaps == {period}, f"période {period} : écarts {gaps}"
+        # Every day of a week follows its Monday
+        week = [mondays[4] + timedelta(days=d) for d in range(7)]
+        assert len(set(open_weeks(None, period, week))) == 1
+    print("✅ Week frequencies alternate across 2026/2027")
+    return True
+
+def _temp_database(names=("Melissa", "Laetitia", "Michaël")):
+    """Fresh SQLite database in a temporary directory, with one user per name"""
+    import os
+    import tempfile
+    from app.backend.database import DatabaseManager
+
+    manager = DatabaseManager()
+    manager.db_path = os.path.join(tempfile.mkdtemp(), "micplan_test.db")
+    manager.initialize()
+    assert manager.execute_transaction([
+        ("INSERT INTO users (username, password_hash, first_name, secteur) "
+         "VALUES (?, 'x', ?, 'Biologie moléculaire')", (name.lower(), name)) for name in names
+    ])
+    return manager
+
+def test_save_result_keeps_other_agents():
+    """Test that saving a plan for some agents leaves the other agents' rows in place"""
+    from datetime import date
+    from app.backend.planning import AssignmentStore, save_result
+
+    print("\n💾 Testing save_result on a subset of agents...")
+    db = _temp_database()
+    start, end = date(2025, 3, 3), date(2025, 3, 7)
+    team = AssignmentStore(["Melissa", "Laetitia", "Michaël"], start, end)
+    for agent, position in zip(team.agents, team.positions):
+        for day in team.dates:
+            team.set_position(agent, day, position)
+            team.set_schedule(agent, day, team.schedules[0])
+    save_result(team, db)
+
+    subset = AssignmentStore(["Melissa", "Laetitia"], start, end)
+    subset.set_position("Melissa", start, subset.positions[2])
+    written, skipped = save_result(subset, db)
+    assert (written, skipped) == (2, 0)
+
+    rows = db.execute_query("""
+        SELECT u.first_name, COUNT(*) AS n FROM planning p JOIN users u ON u.id = p.user_id GROUP BY u.first_name
+    """)
+    counts = {row["first_name"]: row["n"] for row in rows}
+    assert counts == {"Melissa": 2, "Michaël": 10}, counts
+    print("✅ Rows of agents outside the saved plan are kept")
+    return True
+
+def test_exact_beats_greedy():
+    """Test that the exact solver proves an optimum at least as good as the daily solvers"""
+    from datetime import date
+    from app.backend.planning import SOLVERS, PlanEvaluator, PlanningEngine
+
+    print("\n🎯 Testing exact and greedy objectives on a small problem...")
+    problem = PlanningEngine().build_problem(date(2025, 3, 3), date(2025, 3, 16),
+                                             ["Melissa", "Laetitia", "Michaël", "Olivier", "Patrick"])
+    results = {method: SOLVERS[method]().solve(problem) for method in ("greedy", "hungarian", "exact")}
+    exact = results["exact"]
+    assert exact.optimal and exact.bound == exact.objective
+    for method, result in results.items():
+        assert result.objective == problem.objective(result.store), method
+        assert result.objective <= exact.objective <= result.bound, method
+        # Same weekly capacity for every solver: no plan exceeds max_weekdays_per_week
+        assert PlanEvaluator(problem).evaluate_store(result.store)["cap_violations"] == 0, method
+    assert results["greedy"].objective < exact.objective
+    print(f"✅ Exact {exact.objective} ≥ hungarian {results['hungarian'].objective} "
+          f"> greedy {results['greedy'].objective}")
+    return True
+
+def test_save_result_ledger_matches_rebuild():
+    """Test that the ledger deltas written by save_result equal a full recount of the planning table"""
+    from datetime import date, timedelta
+    import numpy as np
+    from app.backend.planning import AssignmentStore, FairnessLedger, save_result
+
+    print("\n📒 Testing fairness ledger deltas against a rebuild...")
+    db = _temp_database()
+    agents = ["Melissa", "Laetitia", "Michaël"]
+    start, end = date(2025, 3, 3), date(2025, 3, 14)
+    plan = AssignmentStore(agents, start, end)
+    for i, agent in enumerate(agents):
+        for d, day in enumerate(plan.dates):
+            if day.weekday() < 5:
+                plan.set_position(agent, day, plan.positions[(i + d) % len(plan.positions)])
+                plan.set_schedule(agent, day, plan.schedules[d % len(plan.schedules)])
+    save_result(plan, db)
+
+    # Second save over part of the period and of the team: changed, cleared and new days
+    update = plan.copy_range(start + timedelta(days=7), end + timedelta(days=3), ["Melissa", "Laetitia"])
+    update.clear_positions(["Laetitia"], start + timedelta(days=7), start + timedelta(days=8))
+    update.set_position("Melissa", start + timedelta(days=9), plan.positions[0])
+    update.set_position("Melissa", end + timedelta(days=3), plan.positions[1])
+    save_result(update, db)
+
+    ledger = FairnessLedger(db)
+    saved = (ledger.positions(agents, plan.positions), ledger.schedules(agents, plan.schedules),
+             ledger.weekdays(agents))
+    ledger.rebuild()
+    rebuilt = (ledger.positions(agents, plan.positions), ledger.schedules(agents, plan.schedules),
+               ledger.weekdays(agents))
+    for kind, (delta, full) in zip(("positions", "schedules", "weekdays"), zip(saved, rebuilt)):
+        assert np.array_equal(delta, full), f"{kind} : {delta} != {full}"
+    assert rebuilt[0].sum() == 29, rebuilt[0]
+    print("✅ Ledger kept by save_result equals the recount")
+    return True
+
+def test_repair_frees_only_absent_half_day():
+    """Test that a half-day absence frees that shift only, and a full-day absence the whole day"""
+    from datetime import date
+    import numpy as np
+    from app.backend.planning import SOLVERS, PlanningEngine, repair_plan
+    from app.backend.planning.config import SHIFTS
+
+    print("\n🩹 Testing the repair of a half-day absence...")
+    problem = PlanningEngine().build_problem(date(2025, 3, 3), date(2025, 3, 9),
+                                             ["Melissa", "Laetitia", "Michaël", "Olivier", "Patrick"])
+    plan = SOLVERS["hungarian"]().solve(problem).store
+    for agent in range(len(plan.agents)):
+        for day in range(plan.n_days):
+            plan.schedule_grid[agent, day] = 1 if plan.position_grid[agent, day].any() else 0
+    morning, afternoon = SHIFTS.index("morning"), SHIFTS.index("afternoon")
+    assert plan.position_grid[0, 1, morning] and plan.position_grid[1, 2, morning]
+
+    absent = np.zeros(problem.shift_available.shape, dtype=bool)
+    absent[0, 1, afternoon] = True  # Melissa, Tuesday afternoon
+    absent[1, 2] = True  # Laetitia, all of Wednesday
+    repaired = repair_plan(problem, plan, absent).store
+
+    assert repaired.position_grid[0, 1, morning] == plan.position_grid[0, 1, morning]
+    assert repaired.position_grid[0, 1, afternoon] == 0
+    assert repaired.schedule_grid[0, 1] == plan.schedule_grid[0, 1]
+    assert not repaired.position_grid[1, 2].any() and repaired.schedule_grid[1, 2] == 0
+    # The whole team works every weekday, so no free agent takes the freed places: nothing else moves
+    touched = np.zeros(plan.position_grid.shape, dtype=bool)
+    touched[0, 1, afternoon] = touched[1, 2] = True
+    assert np.array_equal(repaired.position_grid[~touched], plan.position_grid[~touched])
+    print("✅ Only the absent half-day is freed, the morning and its schedule are kept")
+    return True
+
+def test_solution_cache_hits_and_misses():
+    """Test that cached weeks are reused and only the weeks whose data changed are solved again"""
+    from datetime import date
+    import numpy as np
+    from app.backend.planning import CachedSolver, PlanningEngine, SolutionCache
+    from app.backend.planning.solvers import ExactSolver
+
+    print("\n🗄️ Testing the weekly solution cache...")
+    solved_days = []
+
+    class CountingSolver(ExactSolver):
+        def solve(self, problem, time_budget=None):
+            solved_days.append(problem.n_days)
+            return super().solve(problem, time_budget)
+
+    cache = SolutionCache(_temp_database())
+    problem = PlanningEngine().build_problem(date(2025, 3, 3), date(2025, 3, 16),
+                                             ["Melissa", "Laetitia", "Michaël", "Olivier", "Patrick"])
+    solver = CachedSolver(CountingSolver(), cache, "exact")
+
+    # Solved windows run from the first to the last open day of the missing weeks
+    first = solver.solve(problem)
+    assert solved_days == [12] and first.solver == "exact"
+    second = solver.solve(problem)
+    assert solved_days == [12], "second run should be read from the cache"
+    assert second.solver == "cache:exact" and second.optimal
+    assert np.array_equal(second.store.position_grid, first.store.position_grid)
+    assert second.objective == first.objective
+
+    # An absence in the second week changes its fingerprint only: the first week is still a hit
+    absent = np.zeros(problem.available.shape, dtype=bool)
+    absent[0, 9] = True
+    changed = solver.solve(problem.with_absences(absent))
+    assert solved_days == [12, 5], solved_days
+    assert np.array_equal(changed.store.position_grid[:, :7], first.store.position_grid[:, :7])
+    assert not changed.store.position_grid[0, 9].any()
+    print("✅ Unchanged weeks come from the cache, changed weeks are solved again")
+    return True
+
+def test_planning_schema_rebuild():
+    """Test that a planning table from an earlier schema is upgraded and deduplicated per agent"""
+    import os
+    import sqlite3
+    import tempfile
+    from app.backend.database import DatabaseManager
+
+    print("\n🗄️ Testing the planning schema upgrade...")
+    db_path = os.path.join(tempfile.mkdtemp(), "micplan_old.db")
+    conn = sqlite3.connect(db_path)
+    # Baseline table: one agent per position and shift, no schedule column
+    conn.executescript("""
+        CREATE TABLE planning (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date DATE NOT NULL,
+            position_id TEXT,
+            user_id INTEGER,
+            shift TEXT NOT NULL,
+            status TEXT DEFAULT 'planned',
+            notes TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(date, position_id, shift)
+        );
+        INSERT INTO planning (date, position_id, user_id, shift) VALUES
+            ('2025-03-03', 'P1', 1, 'morning'),
+            ('2025-03-03', 'P2', 1, 'morning'),
+            ('2025-03-03', 'P3', 2, 'morning'),
+            ('2025-03-03', 'P1', 1, 'afternoon');
+    """)
+    conn.close()
+
+    manager = DatabaseManager()
+    manager.db_path = db_path
+    manager.initialize()
+    columns = {column["name"] for column in manager.execute_query("PRAGMA table_info(planning)")}
+    assert "schedule" in columns, columns
+    table_sql = manager.execute_query("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'planning'")
+    assert "UNIQUE(date, user_id, shift)" in table_sql[0]["sql"]
+    rows = manager.execute_query("SELECT position_id, user_id, shift FROM planning ORDER BY user_id, shift")
+    # The duplicate (date, user_id, shift) row is dropped, the first one kept
+    assert [tuple(row.values()) for row in rows] == [("P1", 1, "afternoon"), ("P1", 1, "morning"),
+                                                     ("P3", 2, "morning")], rows
+    # Two agents may now share a position on the same shift
+    assert manager.execute_transaction([
+        ("INSERT INTO planning (date, position_id, user_id, shift) VALUES ('2025-03-03', 'P3', 3, 'morning')", ())
+    ])
+    print("✅ Schedule column added, table rebuilt and duplicate agent rows removed")
+    return True
+
 def main():
     """Run all tests"""
     print("🧬 micPlan Test Suite")
@@ -63,6 +308,27 @@ def main():
     if not test_config():
         success = False
     
+    if not test_week_frequency_across_years():
+        success = False
+    
+    if not test_save_result_keeps_other_agents():
+        success = False
+    
+    if not test_save_result_ledger_matches_rebuild():
+        success = False
+    
+    if not test_exact_beats_greedy():
+        success = False
+    
+    if not test_repair_frees_only_absent_half_day():
+        success = False
+    
+    if not test_solution_cache_hits_and_misses():
+        success = False
+    
+    if not test_planning_schema_rebuild():
+        success = False
+    
     # Summary
     print("\n" + "=" * 40)
     if success: